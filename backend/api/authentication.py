@@ -0,0 +1,73 @@
+"""
+API 인증
+
+CachedTokenAuthentication: 토큰 → 사용자 → 중복 로그인(UserSession) 확인을
+select_related 쿼리 한 번으로 처리하고, 공유 캐시가 있으면 결과를 토큰별로 짧게 캐시합니다.
+캐시 삭제(core.utils.TokenAuthCache.invalidate)는 로그인/로그아웃/강제 로그아웃/사용자 변경에서 호출됩니다.
+"""
+
+import logging
+
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core.utils import TokenAuthCache
+
+logger = logging.getLogger("api.auth")
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    토큰 인증 + 중복 로그인 확인 (공유 캐시 적중 시 DB 조회 없음)
+
+    UserSession에 저장된 토큰과 요청 토큰이 다르면 다른 곳에서 다시 로그인한 것으로 보고
+    SingleSessionMiddleware와 같은 session_expired 응답으로 거부합니다.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = TokenAuthCache.get(key)
+        if cached is None:
+            cached = self._load(key)
+            TokenAuthCache.set(key, cached)
+
+        user, token, stored_token_key = cached
+        if user is None:
+            raise exceptions.AuthenticationFailed("Invalid token.")
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("User inactive or deleted.")
+
+        # 다른 기기에서 다시 로그인해 저장된 토큰이 바뀐 경우
+        if stored_token_key and stored_token_key != key:
+            logger.warning(
+                f"🚨 토큰 키 불일치 감지: {user.username} | "
+                f"현재: {key[:10]}... | 저장된: {stored_token_key[:10]}..."
+            )
+            raise exceptions.AuthenticationFailed(
+                {
+                    "error": "session_expired",
+                    "message": "다른 곳에서 로그인하여 자동으로 로그아웃되었습니다.",
+                    "reason": "duplicate_login",
+                    "redirect": "/login",
+                }
+            )
+
+        return user, token
+
+    def _load(self, key):
+        """토큰/사용자/세션을 한 번에 조회 → (user, token, 저장된 토큰 키)"""
+        model = self.get_model()
+        try:
+            token = model.objects.select_related("user", "user__current_session").get(
+                key=key
+            )
+        except model.DoesNotExist:
+            # 잘못된 토큰도 캐시해 반복 요청이 DB까지 가지 않도록 함
+            return None, None, None
+
+        try:
+            stored_token_key = token.user.current_session.token_key
+        except ObjectDoesNotExist:
+            stored_token_key = None
+        return token.user, token, stored_token_key
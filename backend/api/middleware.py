@@ -1,19 +1,82 @@
 from django.http import HttpResponseRedirect, JsonResponse
-from django.urls import resolve, reverse
+from django.urls import resolve, reverse, Resolver404
 from django.contrib.auth import logout
 from django.contrib import messages
-from django.utils import timezone
 from django.conf import settings
 import re
+import hashlib
 import logging
 
 from core.models import UserSession
 from core.signals import force_logout_user
-from core.utils import ClientInfoExtractor
+from core.utils import (
+    ClientInfoExtractor,
+    RateLimiter,
+    SessionActivityTracker,
+    rate_limited_response,
+)
 
 logger = logging.getLogger("api.auth")
 
 
+class RateLimitMiddleware:
+    """
+    URL별 요청 제한 미들웨어
+
+    settings.RATE_LIMIT["ROUTES"]에 등록된 url_name만 제한하며 (limit, window 초),
+    인증/세션 조회 전에 실행되어 재시도 폭주가 뷰와 ORM까지 도달하지 않도록 합니다.
+
+    요청자 식별 순서 (DB 조회 없음):
+    1. Authorization 토큰 (해시)
+    2. 세션 쿠키 (해시)
+    3. 클라이언트 IP
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, "RATE_LIMIT", {})
+        self.enabled = config.get("ENABLED", True)
+        self.routes = config.get("ROUTES", {})
+
+    def __call__(self, request):
+        if self.enabled and self.routes:
+            budget = self._get_budget(request)
+            if budget is not None:
+                url_name, (limit, window) = budget
+                limited, remaining, retry_after = RateLimiter.hit(
+                    self._get_identity(request), url_name, limit, window
+                )
+                if limited:
+                    return rate_limited_response(remaining, window, retry_after)
+
+        return self.get_response(request)
+
+    def _get_budget(self, request):
+        """요청 URL에 해당하는 (url_name, (limit, window)) 반환 (없으면 None)"""
+        try:
+            url_name = resolve(request.path_info).url_name
+        except Resolver404:
+            return None
+
+        if url_name not in self.routes:
+            return None
+        return url_name, self.routes[url_name]
+
+    def _get_identity(self, request):
+        """요청자 식별 키 생성 (토큰/세션 키는 해시로만 사용)"""
+        auth_header = request.META.get("HTTP_AUTHORIZATION", "")
+        if auth_header.startswith("Token "):
+            digest = hashlib.sha256(auth_header[6:].encode()).hexdigest()[:32]
+            return f"token:{digest}"
+
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if session_key:
+            digest = hashlib.sha256(session_key.encode()).hexdigest()[:32]
+            return f"session:{digest}"
+
+        return f"ip:{ClientInfoExtractor.get_client_ip(request)}"
+
+
 class UserAccessMiddleware:
     """사용자 권한에 따른 접근 제어 미들웨어"""
 
@@ -23,7 +86,6 @@ class UserAccessMiddleware:
     def __call__(self, request):
         # 요청 처리 전 로직
         if request.user.is_authenticated:
-            url_name = resolve(request.path_info).url_name
             logger.info(
                 f"[middleware] 접근 URL: {request.path}, 사용자: {request.user.username}"
             )
@@ -138,72 +200,85 @@ class SingleSessionMiddleware:
         """
         세션 유효성 체크
 
+        저장된 세션/토큰 키는 SessionActivityTracker 캐시에서 읽고,
+        불일치가 보이면 DB에서 다시 확인한 뒤에만 무효로 판단합니다
+        (다른 워커에서 방금 로그인해 캐시가 늦게 갱신된 경우 보호).
+
         Returns:
             bool: True면 세션이 무효함 (로그아웃 필요), False면 유효함
         """
         try:
-            user_session = UserSession.objects.get(user=request.user)
-
-            # 현재 요청의 세션 키와 토큰 키 확인
-            current_session_key = request.session.session_key
-            current_token_key = self._extract_token_key(request)
+            stored_keys = SessionActivityTracker.get_session_keys(request.user.id)
+            if stored_keys is not None and self._find_mismatch(request, stored_keys):
+                stored_keys = SessionActivityTracker.get_session_keys(
+                    request.user.id, use_cache=False
+                )
 
-            # 저장된 세션/토큰과 비교
-            stored_session_key = user_session.session_key
-            stored_token_key = user_session.token_key
+            if stored_keys is None:
+                # UserSession이 없는 경우 새로 생성
+                logger.info(f"📝 UserSession 없음, 새로 생성: {request.user.username}")
+
+                # 클라이언트 정보 추출
+                client_info = ClientInfoExtractor.extract_client_info(request)
+
+                # 새 세션 생성
+                UserSession.objects.create(
+                    user=request.user,
+                    session_key=request.session.session_key,
+                    token_key=self._extract_token_key(request),
+                    current_ip=client_info["ip_address"],
+                    current_user_agent=client_info["user_agent"],
+                    current_device_type=client_info["device_type"],
+                )
 
-            # 세션 키 체크 (세션 기반 인증)
-            if current_session_key and stored_session_key:
-                if current_session_key != stored_session_key:
-                    logger.warning(
-                        f"🚨 세션 키 불일치 감지: {request.user.username} | "
-                        f"현재: {current_session_key[:10]}... | "
-                        f"저장된: {stored_session_key[:10]}..."
-                    )
-                    return True  # 무효한 세션
+                return False  # 새로 생성된 세션은 유효
 
-            # 토큰 키 체크 (토큰 기반 인증)
-            if current_token_key and stored_token_key:
-                if current_token_key != stored_token_key:
-                    logger.warning(
-                        f"🚨 토큰 키 불일치 감지: {request.user.username} | "
-                        f"현재: {current_token_key[:10]}... | "
-                        f"저장된: {stored_token_key[:10]}..."
-                    )
-                    return True  # 무효한 토큰
+            mismatch = self._find_mismatch(request, stored_keys)
+            if mismatch:
+                label, current_key, stored_key = mismatch
+                logger.warning(
+                    f"🚨 {label} 불일치 감지: {request.user.username} | "
+                    f"현재: {current_key[:10]}... | "
+                    f"저장된: {stored_key[:10]}..."
+                )
+                return True  # 무효한 세션/토큰
 
             # 세션이 모두 None인 경우 (비정상 상태)
-            if not stored_session_key and not stored_token_key:
+            if not any(stored_keys):
                 logger.warning(f"⚠️ 저장된 세션/토큰이 없음: {request.user.username}")
                 return True  # 무효한 상태
 
             return False  # 유효한 세션
 
-        except UserSession.DoesNotExist:
-            # UserSession이 없는 경우 새로 생성
-            logger.info(f"📝 UserSession 없음, 새로 생성: {request.user.username}")
-
-            # 클라이언트 정보 추출
-            client_info = ClientInfoExtractor.extract_client_info(request)
-
-            # 새 세션 생성
-            UserSession.objects.create(
-                user=request.user,
-                session_key=request.session.session_key,
-                token_key=self._extract_token_key(request),
-                current_ip=client_info["ip_address"],
-                current_user_agent=client_info["user_agent"],
-                current_device_type=client_info["device_type"],
-            )
-
-            return False  # 새로 생성된 세션은 유효
-
         except Exception as e:
             logger.error(
                 f"❌ 세션 유효성 체크 오류: {request.user.username} | 오류: {str(e)}"
             )
             return False  # 오류 시에는 세션을 유효한 것으로 간주
 
+    def _find_mismatch(self, request, stored_keys):
+        """
+        현재 요청의 세션/토큰 키와 저장된 키 비교
+
+        Returns:
+            tuple | None: 불일치 시 (구분, 현재 키, 저장된 키), 일치하면 None
+        """
+        stored_session_key, stored_token_key = stored_keys
+        current_session_key = request.session.session_key
+        current_token_key = self._extract_token_key(request)
+
+        # 세션 키 체크 (세션 기반 인증)
+        if current_session_key and stored_session_key:
+            if current_session_key != stored_session_key:
+                return "세션 키", current_session_key, stored_session_key
+
+        # 토큰 키 체크 (토큰 기반 인증)
+        if current_token_key and stored_token_key:
+            if current_token_key != stored_token_key:
+                return "토큰 키", current_token_key, stored_token_key
+
+        return None
+
     def _extract_token_key(self, request):
         """요청에서 토큰 키 추출"""
         auth_header = request.META.get("HTTP_AUTHORIZATION", "")
@@ -249,17 +324,5 @@ class SingleSessionMiddleware:
             return HttpResponseRedirect("/login")
 
     def _update_last_activity(self, request):
-        """마지막 활동 시간 업데이트"""
-        try:
-            user_session = UserSession.objects.get(user=request.user)
-            user_session.last_activity = timezone.now()
-            user_session.save(update_fields=["last_activity"])
-
-        except UserSession.DoesNotExist:
-            # UserSession이 없으면 생성하지 않음 (위에서 이미 처리됨)
-            pass
-        except Exception as e:
-            # 마지막 활동 시간 업데이트 실패는 조용히 무시
-            logger.debug(
-                f"🔍 마지막 활동 시간 업데이트 실패: {request.user.username} | 오류: {str(e)}"
-            )
+        """마지막 활동 시간 기록 (메모리에 모았다가 일정 간격으로 일괄 반영)"""
+        SessionActivityTracker.touch(request.user.id)
@@ -0,0 +1,195 @@
+"""
+API 페이지네이션
+
+KeysetPagination: 인덱스 컬럼 값(커서) 기준 페이지네이션
+- COUNT(*)/OFFSET 없이 "마지막 항목 다음"부터 조회하므로 테이블이 커져도 페이지 비용이 일정
+- 여러 컬럼 정렬(예: -expected_clinic_date, -created_at, -id)을 커서에 모두 담아
+  같은 날짜 데이터가 많아도 중복/누락 없이 이어서 조회
+- 응답 형식은 기존 페이지네이션과 같음 (next, previous, results)
+  전체 개수가 필요하면 ?with_count=true 로 요청 (COUNT 쿼리 1회 추가)
+"""
+
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    커서(정렬 컬럼 값) 기반 페이지네이션
+
+    ordering의 마지막 컬럼은 유일해야 합니다 (보통 id).
+    뷰셋에서 상속해 ordering만 바꿔 사용합니다.
+    """
+
+    ordering = ("id",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    invalid_cursor_message = "유효하지 않은 커서입니다."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+        position = self.to_field_values(queryset.model, self.position)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() == "true":
+            self.count = queryset.count()
+
+        ordering = self.get_ordering(reverse=self.reverse)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(ordering, position))
+
+        # 한 건 더 조회해서 다음(역방향이면 이전) 페이지 존재 여부 확인
+        items = list(queryset[: self.page_size + 1])
+        has_more = len(items) > self.page_size
+        items = items[: self.page_size]
+
+        if self.reverse:
+            items.reverse()
+            self.has_previous, self.has_next = has_more, position is not None
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+
+        self.page = items
+        return items
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, reverse=False):
+        """정렬 필드 목록 (역방향이면 방향을 뒤집음)"""
+        if not reverse:
+            return list(self.ordering)
+        return [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+
+    def get_position_filter(self, ordering, position):
+        """
+        커서 위치 이후 항목 조건
+
+        (a, b, c) > (x, y, z) 를 a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        형태로 풀어 각 컬럼의 정렬 방향에 맞게 gt/lt 적용하고,
+        첫 컬럼 범위 조건(a >= x)을 AND로 더해 OR 조건이어도 인덱스 범위 스캔이 되도록 함
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        first_field, first_value = ordering[0], position[0]
+        bound = "lte" if first_field.startswith("-") else "gte"
+        return Q(**{f"{first_field.lstrip('-')}__{bound}": first_value}) & condition
+
+    def to_field_values(self, model, position):
+        """커서 값을 모델 필드 타입으로 변환 (잘못된 값은 404)"""
+        if position is None:
+            return None
+        try:
+            return [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (FieldDoesNotExist, ValidationError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, instance):
+        """항목의 정렬 컬럼 값을 커서에 담을 수 있는 형태로 변환"""
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            if isinstance(value, (datetime.date, datetime.datetime)):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def decode_cursor(self, request):
+        """커서 문자열 → (정렬 컬럼 값 목록, 역방향 여부)"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position = cursor["p"]
+            reverse = bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = {"p": position}
+        if reverse:
+            cursor["r"] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # 빈 페이지면 요청한 커서 위치에서 정방향으로 이어서 조회
+        position = self.get_position(self.page[-1]) if self.page else self.position
+        return self.encode_cursor(position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.get_position(self.page[0]) if self.page else self.position
+        return self.encode_cursor(position, reverse=True)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response["count"] = self.count
+        response["next"] = self.get_next_link()
+        response["previous"] = self.get_previous_link()
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class ClinicAttendanceKeysetPagination(KeysetPagination):
+    """출석 목록 - 최근 클리닉 날짜/예약 순서 (모델 기본 정렬 + id)"""
+
+    ordering = ("-expected_clinic_date", "-created_at", "-id")
@@ -0,0 +1,84 @@
+"""
+API 응답 렌더러
+
+- FastJSONRenderer: orjson으로 JSON 인코딩 (DRF JSONRenderer와 같은 출력)
+- MessagePackRenderer: Accept: application/msgpack 요청에 MessagePack으로 응답
+
+날짜/Decimal/지연 번역 문자열 등 orjson이 직접 처리하지 않는 값은
+DRF JSONEncoder.default로 변환하므로 기존 JSON 응답과 값 표현이 같습니다.
+"""
+
+import logging
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 DRF 기본 인코더 사용
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack 미설치 시 MessagePack 렌더러 비활성화
+    msgpack = None
+
+logger = logging.getLogger("api.renderers")
+
+# DRF와 같은 규칙으로 datetime/Decimal/lazy str 등을 변환
+_drf_encoder = JSONEncoder()
+
+# orjson 옵션: datetime은 DRF 표현(밀리초, Z)을 유지하도록 default로 넘기고
+# 정수 키 dict는 json.dumps처럼 문자열 키로 출력
+_ORJSON_OPTIONS = (
+    (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson 기반 JSON 렌더러
+
+    들여쓰기 요청(브라우저블 API 등)이나 orjson이 처리할 수 없는 값(64비트 초과 정수 등)은
+    DRF JSONRenderer로 처리합니다.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=_ORJSON_OPTIONS)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"[renderers.py] orjson 인코딩 실패, 기본 렌더러 사용: {e}")
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # DRF JSONRenderer와 같이 JavaScript에서 문제가 되는 줄 구분자 이스케이프
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack 렌더러 (Accept: application/msgpack 또는 ?format=msgpack)
+
+    msgpack 패키지가 설치된 경우에만 settings의 렌더러 목록에 추가됩니다.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # JSON 응답과 같은 값 표현이 되도록 DRF 인코더로 변환
+        return msgpack.packb(data, default=_drf_encoder.default, use_bin_type=True)
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models import Prefetch, prefetch_related_objects
 from core.models import (
     # Student,  # Student 모델 삭제로 주석처리
     Subject,
@@ -71,6 +73,73 @@ class UserSerializer(serializers.ModelSerializer):
 #     # Student 모델이 삭제되었으므로 주석처리
 
 
+def _get_user_field_sources():
+    """
+    UserSerializer.Meta.fields 순서대로 (키, 속성 경로) 목록 생성
+
+    선언 필드(subject_name 등)는 source 경로를, 모델 필드는 attname(FK는 subject_id)을 사용하므로
+    UserSerializer 필드가 바뀌면 학생 명단 항목도 함께 바뀝니다.
+    """
+    declared_fields = UserSerializer._declared_fields
+    sources = []
+    for name in UserSerializer.Meta.fields:
+        if name in declared_fields:
+            attrs = (declared_fields[name].source or name).split(".")
+        else:
+            attrs = [User._meta.get_field(name).attname]
+        sources.append((name, attrs))
+    return sources
+
+
+_USER_FIELD_SOURCES = _get_user_field_sources()
+
+
+def clinic_student_representation(user):
+    """
+    클리닉 학생 명단 항목 (UserSerializer(user).data와 같은 키/값을 DRF 필드 없이 생성)
+
+    클리닉 목록에서 학생마다 UserSerializer 필드를 거치지 않도록 사용합니다.
+    user.subject는 select_related로 함께 조회되어 있어야 추가 쿼리가 없습니다.
+    """
+    representation = {}
+    for name, attrs in _USER_FIELD_SOURCES:
+        value = user
+        for attr in attrs:
+            if value is None:
+                # 중간 객체가 없으면 DRF와 같이 키 생략 (과목이 없는 사용자의 subject_name)
+                break
+            value = getattr(value, attr)
+        else:
+            representation[name] = value
+    return representation
+
+
+class ClinicListSerializer(serializers.ListSerializer):
+    """
+    클리닉 목록 직렬화 (many=True)
+
+    강사/과목은 select_related, 학생 명단(+학생 과목)은 prefetch로 함께 조회하므로
+    클리닉 수와 관계없이 쿼리 수가 고정됩니다. 인원 수는 reserved_count 컬럼을 사용합니다.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+
+        if isinstance(iterable, models.QuerySet):
+            iterable = ClinicSerializer.optimize_queryset(iterable)
+        else:
+            # 페이지네이션 등으로 이미 평가된 목록은 prefetch_related_objects로 한 번에 조회
+            iterable = list(iterable)
+            prefetch_related_objects(
+                iterable,
+                "clinic_teacher",
+                "clinic_subject",
+                ClinicSerializer.get_students_prefetch(),
+            )
+
+        return [self.child.to_representation(item) for item in iterable]
+
+
 class ClinicSerializer(serializers.ModelSerializer):
     # 선생님의 이름을 가져오는 필드 (필드명 변경: user_name → name)
     teacher_name = serializers.CharField(source="clinic_teacher.name", read_only=True)
@@ -96,6 +165,23 @@ class ClinicSerializer(serializers.ModelSerializer):
     class Meta:
         model = Clinic
         fields = "__all__"
+        read_only_fields = ["reserved_count"]  # m2m_changed 시그널로만 관리
+        list_serializer_class = ClinicListSerializer  # 목록은 쿼리 수 고정 경로 사용
+
+    @staticmethod
+    def get_students_prefetch():
+        """학생 명단 prefetch (학생 과목명까지 JOIN)"""
+        return Prefetch(
+            "clinic_students", queryset=User.objects.select_related("subject")
+        )
+
+    @classmethod
+    def optimize_queryset(cls, queryset):
+        """목록 직렬화에 필요한 관계를 한 번에 조회하도록 queryset 구성"""
+        queryset = queryset.select_related("clinic_teacher", "clinic_subject")
+        if not queryset._prefetch_related_lookups:
+            queryset = queryset.prefetch_related(cls.get_students_prefetch())
+        return queryset
 
     def get_current_students_count(self, obj):
         """현재 예약된 학생 수"""
@@ -110,12 +196,12 @@ class ClinicSerializer(serializers.ModelSerializer):
         return obj.is_full()
 
     def to_representation(self, instance):
-        """출력 시 clinic_students를 User 객체로 직렬화"""
+        """출력 시 clinic_students를 User 객체로 직렬화 (prefetch된 명단 사용)"""
         representation = super().to_representation(instance)
-        # clinic_students를 UserSerializer로 직렬화
-        representation["clinic_students"] = UserSerializer(
-            instance.clinic_students.all(), many=True
-        ).data
+        representation["clinic_students"] = [
+            clinic_student_representation(student)
+            for student in instance.clinic_students.all()
+        ]
         return representation
 
     def update(self, instance, validated_data):
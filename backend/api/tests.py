@@ -1,3 +1,1577 @@
-from django.test import TestCase
+import queue
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import login
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import F
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.audit import LoginAuditWriter
+from core.models import (
+    Clinic,
+    ClinicAttendance,
+    DataVersion,
+    IdempotencyRecord,
+    LoginHistory,
+    LoginProfile,
+    ReservationPreference,
+    ScheduleChange,
+    Subject,
+    User,
+    UserSession,
+    WaitingRoomTicket,
+)
+from core.session_backend import SessionStore
+from core.utils import (
+    ClientInfoExtractor,
+    ClinicReservationOptimizer,
+    ClinicSeatBroadcaster,
+    DatabaseOptimizer,
+    CacheRateLimitStore,
+    DatabaseRateLimitStore,
+    IdempotencyManager,
+    LoginSecurityUtils,
+    RateLimiter,
+    ReservationLotteryManager,
+    SessionActivityTracker,
+    TokenAuthCache,
+    WaitingRoom,
+)
+
+from .renderers import FastJSONRenderer, orjson
+from .serializers import ClinicSerializer, UserSerializer, clinic_student_representation
+from .views import ClinicViewSet
+
+
+class ClinicFixtureMixin:
+    """
+    클리닉/학생 생성 헬퍼
+
+    setUpTestData에서 cls.subject, cls.teacher를 설정한 테스트 클래스에서 사용합니다.
+    """
+
+    student_seq = 0
+
+    @classmethod
+    def create_student(cls, **fields):
+        ClinicFixtureMixin.student_seq += 1
+        seq = ClinicFixtureMixin.student_seq
+        fields = {"subject": cls.subject, "is_student": True, **fields}
+        return User.objects.create(
+            username=f"fixture_student_{seq}", name=f"학생{seq}", **fields
+        )
+
+    @classmethod
+    def add_clinic(
+        cls, day, time, student_count=0, room="1강의실", capacity=10, is_active=True
+    ):
+        """클리닉 생성 후 학생을 예약 상태로 추가 (reserved_count는 시그널로 동기화)"""
+        clinic = Clinic.objects.create(
+            clinic_teacher=cls.teacher,
+            clinic_subject=cls.subject,
+            clinic_day=day,
+            clinic_time=time,
+            clinic_room=room,
+            clinic_capacity=capacity,
+            is_active=is_active,
+        )
+        clinic.clinic_students.add(
+            *[cls.create_student() for _ in range(student_count)]
+        )
+        clinic.refresh_from_db(fields=["reserved_count"])
+        return clinic
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class ReservedCountSyncTest(ClinicFixtureMixin, TestCase):
+    """reserved_count가 clinic_students를 바꾸는 경로마다 실제 인원과 맞는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="count_teacher", name="카운터강사", subject=cls.subject
+        )
+
+    def test_deleting_student_frees_seat(self):
+        clinic = self.add_clinic("mon", "18:00", 1, capacity=1)
+        self.assertEqual(clinic.reserved_count, 1)
+        student = clinic.clinic_students.get()
+        version = DataVersion.get_version(DataVersion.CLINIC_SCHEDULE)
+
+        client = APIClient()
+        client.force_authenticate(user=self.teacher)
+        response = client.delete(reverse("user-detail", args=[student.id]))
+        self.assertEqual(response.status_code, 204)
+
+        # 중간 테이블 CASCADE 삭제에도 좌석이 돌아오고 스케줄 변경이 기록됨
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.reserved_count, 0)
+        self.assertEqual(clinic.clinic_students.count(), 0)
+        self.assertGreater(
+            DataVersion.get_version(DataVersion.CLINIC_SCHEDULE), version
+        )
+        self.assertTrue(
+            ScheduleChange.objects.filter(
+                clinic_id=clinic.id, version__gt=version
+            ).exists()
+        )
+
+    def test_clinic_edit_keeps_concurrent_seat_claims(self):
+        clinic = self.add_clinic("fri", "18:00", 1, capacity=2)
+        stale = Clinic.objects.get(id=clinic.id)  # 수정 요청이 읽은 시점 (reserved_count=1)
+
+        # 수정 저장 전에 다른 요청이 좌석 선점
+        Clinic.objects.filter(id=clinic.id).update(reserved_count=F("reserved_count") + 1)
+
+        serializer = ClinicSerializer(stale, data={"clinic_capacity": 3}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.clinic_capacity, 3)
+        self.assertEqual(clinic.reserved_count, 2)
+
+        # 관리자 변경 폼과 같은 전체 저장도 카운터를 되돌리지 않음
+        stale = Clinic.objects.get(id=clinic.id)
+        Clinic.objects.filter(id=clinic.id).update(reserved_count=F("reserved_count") + 1)
+        stale.clinic_room = "2강의실"
+        stale.save()
+        clinic.refresh_from_db()
+        self.assertEqual((clinic.clinic_room, clinic.reserved_count), ("2강의실", 3))
+        self.assertEqual(stale.reserved_count, 3)
+
+    def test_m2m_changes_keep_count_in_sync(self):
+        clinic = self.add_clinic("tue", "18:00", 2)
+        student = self.create_student()
+
+        clinic.clinic_students.add(student)
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.reserved_count, 3)
+
+        student.enrolled_clinics.remove(clinic)  # 역방향 변경
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.reserved_count, 2)
+
+        clinic.clinic_students.clear()
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.reserved_count, 0)
+
+    def test_reconcile_command_repairs_drift(self):
+        clinic = self.add_clinic("wed", "18:00", 2)
+        # 시그널을 거치지 않는 직접 수정으로 생긴 불일치
+        Clinic.objects.filter(id=clinic.id).update(reserved_count=5)
+
+        call_command("reconcile_clinic_seats", "--dry-run", stdout=StringIO())
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.reserved_count, 5)
+
+        call_command("reconcile_clinic_seats", stdout=StringIO())
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.reserved_count, 2)
+
+    def test_weekly_reset_clears_clinics_with_drifted_counter(self):
+        clinic = self.add_clinic("sat", "18:00", 2)
+        Clinic.objects.filter(id=clinic.id).update(reserved_count=0)  # 카운터 어긋남
+
+        out = StringIO()
+        call_command("reset_weekly_clinics", "--force", stdout=out)
+
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.clinic_students.count(), 0)
+        self.assertEqual(clinic.reserved_count, 0)
+        self.assertIn("2명의 학생 예약 초기화", out.getvalue())
+
+    def test_sync_locks_clinic_rows_before_recount(self):
+        clinic = self.add_clinic("thu", "18:00", 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            Clinic.sync_reserved_counts([clinic.id])
+
+        sqls = [q["sql"] for q in queries]
+        lock_index = next(
+            i for i, sql in enumerate(sqls) if '"core_clinic"' in sql and "SELECT" in sql
+        )
+        update_index = next(
+            i for i, sql in enumerate(sqls) if sql.startswith('UPDATE "core_clinic"')
+        )
+        self.assertLess(lock_index, update_index)
+        if connection.features.has_select_for_update:
+            self.assertIn("FOR UPDATE", sqls[lock_index])
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class WeeklyScheduleQueryCountTest(ClinicFixtureMixin, TestCase):
+    """주간 스케줄 조회 쿼리 수가 클리닉/학생 수와 무관하게 고정되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create_user(
+            username="schedule_teacher",
+            password="pass",
+            name="스케줄강사",
+            subject=cls.subject,
+            is_teacher=True,
+        )
+
+    def setUp(self):
+        # 테스트마다 DB가 롤백되어 스케줄 버전이 다시 시작되므로 캐시도 비움
+        cache.clear()
+        ClinicReservationOptimizer._local_snapshots.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.teacher)
+        self.url = reverse("clinic-weekly-schedule")
+
+    def count_schedule_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def test_query_count_is_constant(self):
+        clinic = self.add_clinic("mon", "18:00", 2)
+        small_count, data = self.count_schedule_queries()
+
+        cell = data["schedule"]["mon"]["18:00"]
+        self.assertEqual(cell["clinic_id"], clinic.id)
+        self.assertEqual(cell["current_count"], 2)
+        self.assertEqual(len(cell["students"]), 2)
+
+        for day in ["tue", "wed", "thu", "fri"]:
+            for time in ["18:00", "19:00", "20:00", "21:00"]:
+                self.add_clinic(day, time, 3)
+        large_count, data = self.count_schedule_queries()
+
+        self.assertEqual(large_count, small_count)
+        self.assertEqual(data["total_clinics"], 17)
+        self.assertEqual(data["days"], ["mon", "tue", "wed", "thu", "fri"])
+        self.assertEqual(data["times"], ["18:00", "19:00", "20:00", "21:00"])
+        self.assertEqual(data["schedule"]["mon"]["19:00"]["clinic_id"], None)
+
+    def test_first_clinic_per_slot_is_used(self):
+        first = self.add_clinic("mon", "18:00", 1)
+        self.add_clinic("mon", "18:00", 0, room="2강의실")
+
+        _, data = self.count_schedule_queries()
+
+        self.assertEqual(data["schedule"]["mon"]["18:00"]["clinic_id"], first.id)
+        self.assertEqual(data["total_clinics"], 2)
+
+    def test_cached_schedule_is_invalidated_by_reservation(self):
+        clinic = self.add_clinic("mon", "18:00", 0)
+        self.count_schedule_queries()
+
+        # 변경이 없으면 버전 조회 1회로 캐시 반환
+        cached_count, data = self.count_schedule_queries()
+        self.assertEqual(cached_count, 1)
+        self.assertEqual(data["schedule"]["mon"]["18:00"]["current_count"], 0)
+
+        student = User.objects.create(
+            username="schedule_reserver", name="예약학생", subject=self.subject
+        )
+        clinic.clinic_students.add(student)
+
+        _, data = self.count_schedule_queries()
+        cell = data["schedule"]["mon"]["18:00"]
+        self.assertEqual(cell["current_count"], 1)
+        self.assertEqual(cell["students"][0]["id"], student.id)
+
+    def test_since_returns_only_changed_cells(self):
+        clinic = self.add_clinic("mon", "18:00", 0)
+        self.add_clinic("tue", "19:00", 0)
+        version = self.client.get(self.url).data["version"]
+
+        response = self.client.get(self.url, {"since": version})
+        self.assertFalse(response.data["full"])
+        self.assertEqual(response.data["schedule"], {})
+
+        student = User.objects.create(
+            username="delta_student", name="변경학생", subject=self.subject
+        )
+        clinic.clinic_students.add(student)
+
+        response = self.client.get(self.url, {"since": version})
+        self.assertFalse(response.data["full"])
+        self.assertGreater(response.data["version"], version)
+        self.assertEqual(list(response.data["schedule"]), ["mon"])
+        cell = response.data["schedule"]["mon"]["18:00"]
+        self.assertEqual(cell["current_count"], 1)
+
+        # 클리닉 구성 변경(추가)은 전체 스냅샷
+        self.add_clinic("wed", "20:00", 0)
+        response = self.client.get(self.url, {"since": version})
+        self.assertTrue(response.data["full"])
+        self.assertIn("wed", response.data["days"])
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class ConditionalGetTest(TestCase):
+    """데이터 버전 기반 ETag / 304 응답 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.user = User.objects.create(
+            username="etag_user", name="ETag사용자", subject=cls.subject
+        )
+
+    def setUp(self):
+        cache.clear()
+        ClinicReservationOptimizer._local_snapshots.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_unchanged_subjects_return_304_without_serializing(self):
+        url = reverse("subject-list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)  # 버전 조회만 실행
+
+        Subject.objects.create(subject="chemistry1")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_last_login_update_keeps_etag(self):
+        url = reverse("student_placement")
+        etag = self.client.get(url)["ETag"]
+
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.user.name = "이름변경"
+        self.user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class ClinicAvailabilityTest(TestCase):
+    """학생용 잔여석 목록(명단 제외) 응답 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="availability_teacher", name="잔여석강사", subject=cls.subject
+        )
+        cls.student = User.objects.create(
+            username="availability_student",
+            name="잔여석학생",
+            subject=cls.subject,
+            is_student=True,
+        )
+        cls.clinic = Clinic.objects.create(
+            clinic_teacher=cls.teacher,
+            clinic_subject=cls.subject,
+            clinic_day="mon",
+            clinic_time="18:00",
+            clinic_capacity=6,
+            is_active=True,
+        )
+        cls.other_clinic = Clinic.objects.create(
+            clinic_teacher=cls.teacher,
+            clinic_subject=cls.subject,
+            clinic_day="tue",
+            clinic_time="19:00",
+            clinic_capacity=6,
+            is_active=True,
+        )
+        cls.clinic.clinic_students.add(cls.student)
+
+    def setUp(self):
+        cache.clear()
+        ClinicReservationOptimizer._local_snapshots.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student)
+
+    def test_rows_have_no_roster_and_flag_my_reservation(self):
+        response = self.client.get(reverse("clinic-availability"))
+        self.assertEqual(response.status_code, 200)
+
+        fields = response.data["fields"]
+        rows = {row[0]: dict(zip(fields, row)) for row in response.data["rows"]}
+        self.assertNotIn("students", fields)
+        self.assertTrue(rows[self.clinic.id]["reserved_by_me"])
+        self.assertEqual(rows[self.clinic.id]["remaining_spots"], 5)
+        self.assertFalse(rows[self.other_clinic.id]["reserved_by_me"])
+        self.assertEqual(rows[self.other_clinic.id]["teacher_name"], "잔여석강사")
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class ClinicListQueryCountTest(ClinicFixtureMixin, TestCase):
+    """클리닉 목록 직렬화 쿼리 수가 클리닉/학생 수와 무관하게 고정되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="list_teacher", name="목록강사", subject=cls.subject
+        )
+
+    def setUp(self):
+        cache.clear()
+        ClinicReservationOptimizer._local_snapshots.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.teacher)
+        self.url = reverse("clinic-list")
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data["results"]
+
+    def test_query_count_is_constant(self):
+        self.add_clinic("mon", "18:00", 1)
+        small_count, _ = self.count_list_queries()
+
+        for day in ["tue", "wed", "thu"]:
+            for time in ["18:00", "19:00", "20:00"]:
+                self.add_clinic(day, time, 3)
+        large_count, results = self.count_list_queries()
+
+        self.assertEqual(large_count, small_count)
+        self.assertEqual(len(results), 10)
+        student = results[-1]["clinic_students"][0]
+        self.assertEqual(student["subject_name"], "physics1")
+        self.assertTrue(student["is_student"])
+
+    def test_student_representation_matches_user_serializer(self):
+        with_subject = self.create_student(grade="2학년", school="세화고")
+        without_subject = self.create_student(subject=None)
+
+        for user in User.objects.select_related("subject").filter(
+            id__in=[with_subject.id, without_subject.id]
+        ):
+            self.assertEqual(
+                clinic_student_representation(user), UserSerializer(user).data
+            )
+        # 과목이 없으면 DRF와 같이 subject_name 키 생략
+        self.assertNotIn(
+            "subject_name", clinic_student_representation(without_subject)
+        )
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class ClinicReservationTest(ClinicFixtureMixin, TestCase):
+    """예약 API의 좌석 선점 결과 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="reservation_teacher", name="예약강사", subject=cls.subject
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def reserve(self, user, clinic, **extra):
+        self.client.force_authenticate(user=user)
+        return self.client.post(
+            reverse("clinic-reserve-clinic"),
+            {"user_id": user.id, "clinic_id": clinic.id, **extra},
+            format="json",
+        )
+
+    def test_reservation_rejects_once_clinic_is_full(self):
+        clinic = self.add_clinic("mon", "18:00", capacity=1)
+        first, second = self.create_student(), self.create_student()
+
+        # 좌석 선점은 조건부 UPDATE로만 판단
+        self.assertEqual(self.reserve(first, clinic).status_code, 200)
+        response = self.reserve(second, clinic)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["error"], "occupied")
+        clinic.refresh_from_db(fields=["reserved_count"])
+        self.assertEqual(clinic.reserved_count, 1)
+        self.assertEqual(
+            ClinicAttendance.objects.filter(clinic=clinic).count(), 1
+        )
+
+    def test_seat_claim_bumps_schedule_version_last(self):
+        clinic = self.add_clinic("mon", "18:00")
+        student = self.create_student()
+        version = DataVersion.get_version(DataVersion.CLINIC_SCHEDULE)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(
+                DatabaseOptimizer.claim_clinic_seat(clinic.id, student.id),
+                DatabaseOptimizer.SEAT_CLAIMED,
+            )
+
+        self.assertEqual(
+            list(ScheduleChange.objects.filter(version=version + 1).values_list(
+                "clinic_id", flat=True
+            )),
+            [clinic.id],
+        )
+        # 전역 버전 행은 좌석 선점 UPDATE 이후 마지막 문장에서만 잠금
+        statements = [
+            q["sql"] for q in queries if "SAVEPOINT" not in q["sql"].upper()
+        ]
+        self.assertTrue(statements[-3].startswith('UPDATE "core_clinic"'))
+        if connection.vendor == "postgresql":
+            self.assertIn("pg_notify", statements[-2])
+            self.assertTrue(statements[-1].startswith("WITH bumped AS"))
+
+    def test_bulk_user_updates_bump_user_version(self):
+        from django.contrib.admin.sites import site
+
+        clinic = self.add_clinic("mon", "18:00")
+        student = self.create_student(non_pass=True, no_show=1)
+
+        def bumped(action):
+            version = DataVersion.get_version(DataVersion.USERS)
+            action()
+            return DataVersion.get_version(DataVersion.USERS) - version
+
+        # 일괄 예약: 커밋 이후 non_pass 해제와 함께 버전 증가
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(self.reserve_batch([(student, clinic)]).status_code, 200)
+        self.assertEqual(bumped(lambda: [callback() for callback in callbacks]), 1)
+
+        # 관리자 무단결석 초기화
+        user_admin = site._registry[User]
+        with mock.patch.object(user_admin, "message_user"):
+            self.assertEqual(
+                bumped(
+                    lambda: user_admin.reset_no_show_count(
+                        None, User.objects.filter(id=student.id)
+                    )
+                ),
+                1,
+            )
+
+        # 추첨 배정: 배정된 의무 클리닉 대상자 non_pass 해제
+        other = self.create_student(non_pass=True)
+        lottery = ReservationLotteryManager.open_lottery()
+        ReservationLotteryManager.record_preference(lottery, other, clinic)
+        self.assertEqual(bumped(lambda: ReservationLotteryManager.allocate(lottery)), 1)
+        other.refresh_from_db(fields=["non_pass"])
+        self.assertFalse(other.non_pass)
+
+    def test_full_clinic_overflows_to_sibling_room(self):
+        full = self.add_clinic("mon", "18:00", student_count=1, capacity=1)
+        busier = self.add_clinic("mon", "18:00", room="2강의실", student_count=2)
+        emptier = self.add_clinic("mon", "18:00", room="3강의실", student_count=1)
+        self.add_clinic("mon", "19:00", room="4강의실")  # 다른 시간대는 후보 아님
+        student = self.create_student()
+
+        response = self.reserve(student, full, allow_overflow=True)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["overflow"])
+        self.assertEqual(data["requested_clinic_id"], full.id)
+        self.assertEqual(data["clinic_info"]["id"], emptier.id)  # 예약 인원이 적은 순
+
+        emptier.refresh_from_db(fields=["reserved_count"])
+        busier.refresh_from_db(fields=["reserved_count"])
+        self.assertEqual((emptier.reserved_count, busier.reserved_count), (2, 2))
+        self.assertTrue(emptier.clinic_students.filter(id=student.id).exists())
+
+    def test_overflow_returns_occupied_when_every_candidate_is_full(self):
+        full = self.add_clinic("mon", "18:00", student_count=1, capacity=1)
+        self.add_clinic("mon", "18:00", room="2강의실", student_count=1, capacity=1)
+        self.add_clinic("mon", "18:00", room="3강의실", capacity=3, is_active=False)
+        student = self.create_student()
+
+        response = self.reserve(student, full, allow_overflow=True)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["error"], "occupied")
+        self.assertFalse(student.enrolled_clinics.exists())
+        self.assertFalse(ClinicAttendance.objects.filter(student=student).exists())
+
+    def reserve_batch(self, pairs):
+        self.client.force_authenticate(user=self.teacher)
+        return self.client.post(
+            reverse("clinic-reserve-clinics-batch"),
+            {
+                "reservations": [
+                    {"user_id": user.id, "clinic_id": clinic.id}
+                    for user, clinic in pairs
+                ]
+            },
+            format="json",
+        )
+
+    def test_batch_reserves_per_item_and_locks_clinics_in_id_order(self):
+        small = self.add_clinic("mon", "18:00", capacity=1)
+        large = self.add_clinic("tue", "18:00", capacity=5)
+        first, second = self.create_student(), self.create_student()
+
+        # 요청 순서와 무관하게 클리닉 행은 id 오름차순으로 잠금
+        with CaptureQueriesContext(connection) as queries:
+            response = self.reserve_batch(
+                [(first, large), (first, small), (second, small)]
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["status"] for r in response.json()["results"]],
+            ["reserved", "reserved", "occupied"],
+        )
+
+        lock_sql = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith(
+                'SELECT "core_clinic"."id", "core_clinic"."clinic_capacity"'
+            )
+        ]
+        self.assertEqual(len(lock_sql), 1)
+        self.assertIn('ORDER BY "core_clinic"."id" ASC', lock_sql[0])
+        if connection.features.has_select_for_update:
+            self.assertIn("FOR UPDATE", lock_sql[0])
+
+        # 행 INSERT가 클리닉 잠금보다 먼저 (단건 예약과 같은 순서)
+        sqls = [q["sql"] for q in queries]
+        first_insert = next(
+            i
+            for i, sql in enumerate(sqls)
+            if sql.startswith("INSERT") and '"core_clinic_clinic_students"' in sql
+        )
+        self.assertLess(first_insert, sqls.index(lock_sql[0]))
+
+        small.refresh_from_db(fields=["reserved_count"])
+        large.refresh_from_db(fields=["reserved_count"])
+        self.assertEqual((small.reserved_count, large.reserved_count), (1, 1))
+        # 정원 초과 항목의 행은 남지 않음
+        self.assertFalse(small.clinic_students.filter(id=second.id).exists())
+        self.assertFalse(
+            ClinicAttendance.objects.filter(clinic=small, student=second).exists()
+        )
+
+    def test_batch_reports_concurrent_reservation_as_duplicate(self):
+        clinic = self.add_clinic("mon", "18:00", capacity=3)
+        student = self.create_student()
+        insert_rows = ClinicViewSet._insert_batch_rows
+
+        def reserved_meanwhile(view, target, user, today):
+            # 사전 조회 이후 단건 예약이 같은 좌석을 먼저 커밋한 상황
+            target.clinic_students.add(user)
+            return insert_rows(view, target, user, today)
+
+        with mock.patch.object(ClinicViewSet, "_insert_batch_rows", reserved_meanwhile):
+            response = self.reserve_batch([(student, clinic)])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["status"], "duplicate")
+        self.assertEqual(response.json()["reserved_count"], 0)
+        clinic.refresh_from_db(fields=["reserved_count"])
+        self.assertEqual(clinic.reserved_count, 1)
+
+    def test_batch_treats_clinic_deleted_before_lock_as_invalid(self):
+        kept, deleted = self.add_clinic("mon", "18:00"), self.add_clinic("tue", "18:00")
+        student = self.create_student()
+        insert_rows = ClinicViewSet._insert_batch_rows
+
+        def delete_after_insert(view, target, user, today):
+            inserted = insert_rows(view, target, user, today)
+            if target.id == deleted.id:
+                Clinic.objects.filter(id=deleted.id).delete()
+            return inserted
+
+        with mock.patch.object(ClinicViewSet, "_insert_batch_rows", delete_after_insert):
+            response = self.reserve_batch([(student, kept), (student, deleted)])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["status"] for r in response.json()["results"]],
+            ["reserved", "invalid_clinic"],
+        )
+        kept.refresh_from_db(fields=["reserved_count"])
+        self.assertEqual(kept.reserved_count, 1)
+
+    def test_batch_failure_rolls_back_every_item(self):
+        clinics = [self.add_clinic("mon", "18:00"), self.add_clinic("tue", "18:00")]
+        student = self.create_student(non_pass=True)
+
+        with mock.patch.object(
+            ClinicAttendance.objects, "bulk_create", side_effect=DatabaseError("boom")
+        ), self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.reserve_batch([(student, clinic) for clinic in clinics])
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(callbacks, [])
+        for clinic in clinics:
+            clinic.refresh_from_db(fields=["reserved_count"])
+            self.assertEqual(clinic.reserved_count, 0)
+            self.assertEqual(clinic.clinic_students.count(), 0)
+        student.refresh_from_db(fields=["non_pass"])
+        self.assertTrue(student.non_pass)
+
+    def test_batch_clears_non_pass_after_commit(self):
+        clinic = self.add_clinic("mon", "18:00", capacity=1)
+        reserved = self.create_student(non_pass=True)
+        rejected = self.create_student(non_pass=True)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.reserve_batch([(reserved, clinic), (rejected, clinic)])
+        self.assertEqual(response.status_code, 200)
+
+        # 커밋 전에는 non_pass가 그대로이고, 커밋 후 예약된 학생만 해제
+        reserved.refresh_from_db(fields=["non_pass"])
+        self.assertTrue(reserved.non_pass)
+        for callback in callbacks:
+            callback()
+
+        reserved.refresh_from_db(fields=["non_pass"])
+        rejected.refresh_from_db(fields=["non_pass"])
+        self.assertFalse(reserved.non_pass)
+        self.assertTrue(rejected.non_pass)
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class IdempotencyTest(ClinicFixtureMixin, TestCase):
+    """Idempotency-Key 재전송, 별칭 URL, 중단된 처리 중 기록 이어받기 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="idempotency_teacher", name="멱등강사", subject=cls.subject
+        )
+        cls.clinic = cls.add_clinic("mon", "18:00")
+        cls.student = cls.create_student()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.student)
+        self.body = {"user_id": self.student.id, "clinic_id": self.clinic.id}
+
+    def post(self, url_name, key="reserve-key"):
+        return self.client.post(
+            reverse(url_name), self.body, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_on_alias_url_is_replayed(self):
+        self.assertEqual(self.post("clinic-reserve-clinic").status_code, 200)
+
+        response = self.post("clinic_reserve")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Idempotent-Replayed"], "true")
+        self.assertEqual(self.clinic.clinic_students.count(), 1)
+
+    def test_abandoned_in_progress_record_is_reclaimed(self):
+        request = mock.Mock(data=self.body)
+        record = IdempotencyRecord.objects.create(
+            user=self.student,
+            key="reserve-key",
+            action="clinic_reservation",
+            request_hash=IdempotencyManager.get_request_hash(
+                "clinic_reservation", request
+            ),
+            expires_at=timezone.now() + timedelta(days=1),
+            lease_expires_at=timezone.now() + timedelta(seconds=60),
+        )
+
+        # 점유 시간 안에서는 처리 중 응답
+        response = self.post("clinic-reserve-clinic")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["error"], "idempotency_in_progress")
+
+        # 점유 시간이 지나면 재시도가 기록을 이어받아 실행
+        IdempotencyRecord.objects.filter(id=record.id).update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        response = self.post("clinic-reserve-clinic")
+        self.assertEqual(response.status_code, 200)
+        record.refresh_from_db()
+        self.assertEqual(record.status, "completed")
+        self.assertEqual(self.clinic.clinic_students.count(), 1)
+
+
+@override_settings(
+    RATE_LIMIT={"ENABLED": False},
+    WAITING_ROOM={"ENABLED": True, "MAX_ADMITTED": 1},
+)
+class WaitingRoomTest(ClinicFixtureMixin, TestCase):
+    """대기열 입장 제한, 예약 후 티켓 반납, 만료 처리 간격 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="waiting_teacher", name="대기열강사", subject=cls.subject
+        )
+        cls.clinic = cls.add_clinic("mon", "18:00")
+        cls.first = cls.create_student()
+        cls.second = cls.create_student()
+
+    def setUp(self):
+        cache.clear()
+        WaitingRoom._last_sweep = 0.0
+        self.url = reverse("clinic-availability")
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_successful_reservation_admits_next_ticket(self):
+        first, second = self.client_for(self.first), self.client_for(self.second)
+        self.assertEqual(first.get(self.url).status_code, 200)
+
+        response = second.get(self.url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["position"], 1)
+
+        response = first.post(
+            reverse("clinic-reserve-clinic"),
+            {"user_id": self.first.id, "clinic_id": self.clinic.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            WaitingRoomTicket.objects.get(user=self.first).status, "released"
+        )
+        self.assertEqual(second.get(self.url).status_code, 200)
+
+    def test_admitted_user_skips_ticket_queries(self):
+        client = self.client_for(self.first)
+        self.assertEqual(client.get(self.url).status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(client.get(self.url).status_code, 200)
+        ticket_sql = [q for q in queries if "waitingroomticket" in q["sql"]]
+        self.assertEqual(ticket_sql, [])
+
+    def test_sweep_runs_at_most_once_per_interval(self):
+        WaitingRoomTicket.objects.create(
+            user=self.first,
+            last_seen_at=timezone.now() - timedelta(minutes=5),
+        )
+        self.assertEqual(WaitingRoom.expire_stale_tickets(), 1)
+
+        WaitingRoomTicket.objects.create(
+            user=self.second,
+            last_seen_at=timezone.now() - timedelta(minutes=5),
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(WaitingRoom.expire_stale_tickets(), 0)
+
+        # 다른 워커(프로세스 시각 초기화)도 공유 잠금이 남아 있으면 건너뜀
+        WaitingRoom._last_sweep = 0.0
+        self.assertEqual(WaitingRoom.expire_stale_tickets(), 0)
+        self.assertEqual(WaitingRoom.expire_stale_tickets(force=True), 1)
+
+
+@override_settings(WAITING_ROOM={"ENABLED": False})
+class RateLimitTest(TestCase):
+    """요청 제한 저장소 선택, 슬라이딩 윈도우, 429 응답 확인"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_store_defaults_to_cache_only_for_shared_cache(self):
+        with self.settings(RATE_LIMIT={"STORE": "auto"}):
+            self.assertIs(RateLimiter.get_store(), DatabaseRateLimitStore)
+            with self.settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                        "LOCATION": "redis://127.0.0.1:6379/0",
+                    }
+                }
+            ):
+                self.assertIs(RateLimiter.get_store(), CacheRateLimitStore)
+
+    def test_sliding_window(self):
+        for store in ["database", "cache"]:
+            with self.subTest(store=store), self.settings(RATE_LIMIT={"STORE": store}):
+
+                def hit(now):
+                    with mock.patch("core.utils.time.time", return_value=now):
+                        return RateLimiter.hit("window_user", store, limit=2, window=60)
+
+                self.assertFalse(hit(6000.0)[0])
+                self.assertFalse(hit(6010.0)[0])
+
+                limited, remaining, retry_after = hit(6020.0)
+                self.assertTrue(limited)
+                self.assertEqual(remaining, 0)
+                self.assertEqual(retry_after, 60)  # 6080초에 추정치가 2 이하로 내려감
+
+                # 다음 윈도우 중간: 지난 윈도우 3회 × 0.5 + 이번 윈도우 1회 = 2.5회
+                self.assertTrue(hit(6090.0)[0])
+                # 두 윈도우가 지나면 다시 허용
+                self.assertFalse(hit(6190.0)[0])
+
+    def test_limited_route_returns_429(self):
+        subject = Subject.objects.create(subject="physics1")
+        student = User.objects.create(
+            username="limited_student", name="제한학생", subject=subject
+        )
+        client = APIClient()
+        client.force_authenticate(user=student)
+        url = reverse("clinic-availability")
+
+        with self.settings(
+            RATE_LIMIT={
+                "ENABLED": True,
+                "STORE": "database",
+                "ROUTES": {"clinic-availability": (2, 60)},
+            }
+        ):
+            self.assertEqual(client.get(url).status_code, 200)
+            self.assertEqual(client.get(url).status_code, 200)
+            response = client.get(url)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["error"], "rate_limited")
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class ReservationLotteryTest(ClinicFixtureMixin, TestCase):
+    """추첨 예약 희망 순위 기록과 결과 조회 권한 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="lottery_teacher",
+            name="추첨강사",
+            subject=cls.subject,
+            is_teacher=True,
+        )
+        cls.clinics = [cls.add_clinic("mon", "18:00"), cls.add_clinic("tue", "18:00")]
+        cls.student = cls.create_student()
+        cls.other = cls.create_student()
+        cls.lottery = ReservationLotteryManager.open_lottery()
+
+    def test_rank_collision_retries_with_next_rank(self):
+        ReservationLotteryManager.record_preference(
+            self.lottery, self.student, self.clinics[0]
+        )
+
+        # 동시 요청이 같은 순위(1)를 계산한 상황 - unique 제약으로 실패 후 재계산
+        with mock.patch.object(
+            ReservationLotteryManager, "_next_rank", side_effect=[1, 2]
+        ):
+            preference, created = ReservationLotteryManager.record_preference(
+                self.lottery, self.student, self.clinics[1]
+            )
+
+        self.assertTrue(created)
+        self.assertEqual(preference.rank, 2)
+        self.assertEqual(
+            list(
+                ReservationPreference.objects.filter(user=self.student).values_list(
+                    "rank", flat=True
+                )
+            ),
+            [1, 2],
+        )
+
+    def test_allocate_locks_clinics_before_counting_seats(self):
+        clinic = self.add_clinic("wed", "18:00", 1, capacity=2)
+        ReservationLotteryManager.record_preference(self.lottery, self.student, clinic)
+        ReservationLotteryManager.record_preference(self.lottery, self.other, clinic)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = ReservationLotteryManager.allocate(self.lottery)
+
+        sqls = [q["sql"] for q in queries]
+        lock_index = next(
+            i
+            for i, sql in enumerate(sqls)
+            if sql.startswith("SELECT") and 'FROM "core_clinic" ' in sql
+        )
+        insert_index = next(
+            i
+            for i, sql in enumerate(sqls)
+            if sql.startswith("INSERT") and '"core_clinic_clinic_students"' in sql
+        )
+        self.assertLess(lock_index, insert_index)
+        if connection.features.has_select_for_update:
+            self.assertIn("FOR UPDATE", sqls[lock_index])
+
+        # 남은 좌석 1개만 배정
+        self.assertEqual(result["won"], 1)
+        clinic.refresh_from_db()
+        self.assertEqual(clinic.reserved_count, 2)
+
+    def test_students_only_see_their_own_preferences(self):
+        ReservationLotteryManager.record_preference(
+            self.lottery, self.other, self.clinics[0]
+        )
+        url = reverse("clinic_lottery") + f"?user_id={self.other.id}"
+
+        client = APIClient()
+        client.force_authenticate(user=self.student)
+        self.assertEqual(client.get(url).json()["preferences"], [])
+
+        client.force_authenticate(user=self.teacher)
+        preferences = client.get(url).json()["preferences"]
+        self.assertEqual([p["clinic_info"]["id"] for p in preferences], [self.clinics[0].id])
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class FastJSONRendererTest(TestCase):
+    """orjson 렌더러 출력이 DRF JSONRenderer와 바이트 단위로 같은지 확인"""
+
+    def assertSameBytes(self, data):
+        expected = JSONRenderer().render(data, "application/json", {})
+        with self.assertNoLogs("api.renderers"):  # 기본 렌더러로 돌아가지 않음
+            rendered = FastJSONRenderer().render(data, "application/json", {})
+        self.assertEqual(rendered, expected)
+
+    def setUp(self):
+        if orjson is None:
+            self.skipTest("orjson 미설치")
+
+    def test_datetimes(self):
+        self.assertSameBytes(
+            {
+                "aware": datetime(2024, 3, 4, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+                "aware_no_micro": datetime(2024, 3, 4, 9, 30, tzinfo=dt_timezone.utc),
+                "kst": timezone.localtime(
+                    datetime(2024, 3, 4, 9, 30, 15, 500, tzinfo=dt_timezone.utc)
+                ),
+                "naive": datetime(2024, 3, 4, 18, 0, 1, 999999),
+                "date": date(2024, 3, 4),
+                "time": dt_time(18, 30, 0, 250000),
+                "duration": timedelta(hours=1, minutes=30),
+            }
+        )
+
+    def test_decimals(self):
+        self.assertSameBytes(
+            {"score": Decimal("87.50"), "items": [Decimal("0.1"), Decimal("-3")]}
+        )
+
+    def test_lazy_strings_and_unicode(self):
+        self.assertSameBytes(
+            {
+                "message": gettext_lazy("This field is required."),
+                "korean": "예약 완료",
+                "separators": "line\u2028para\u2029",
+                "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                1: [None, True, 1.5],
+            }
+        )
+
+
+class KeysetPaginationTest(TestCase):
+    """출석 목록 커서 페이지네이션이 같은 날짜 데이터도 중복/누락 없이 이어지는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.teacher = User.objects.create(
+            username="page_teacher", name="페이지강사", subject=cls.subject
+        )
+        clinic = Clinic.objects.create(
+            clinic_teacher=cls.teacher,
+            clinic_subject=cls.subject,
+            clinic_day="mon",
+            clinic_time="18:00",
+        )
+        for i in range(7):
+            student = User.objects.create(
+                username=f"page_student_{i}", name=f"페이지학생{i}", subject=cls.subject
+            )
+            ClinicAttendance.objects.create(
+                clinic=clinic,
+                student=student,
+                expected_clinic_date="2025-03-03" if i < 5 else "2025-03-10",
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.teacher)
+
+    def test_pages_cover_all_rows_in_both_directions(self):
+        expected = list(
+            ClinicAttendance.objects.order_by(
+                "-expected_clinic_date", "-created_at", "-id"
+            ).values_list("id", flat=True)
+        )
+
+        seen, pages = [], []
+        url = reverse("clinicattendance-list") + "?page_size=3&with_count=true"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["count"], 7)
+            pages.append(response.data)
+            seen += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        back = self.client.get(pages[-1]["previous"]).data
+        self.assertEqual(back["results"], pages[1]["results"])
+        self.assertEqual(
+            self.client.get(back["previous"]).data["results"], pages[0]["results"]
+        )
+
+    def test_ties_on_clinic_date_page_both_directions(self):
+        # 같은 날짜 + 같은 생성 시간 → id만으로 순서가 정해지는 동률 구간
+        ClinicAttendance.objects.filter(expected_clinic_date="2025-03-03").update(
+            created_at=timezone.now()
+        )
+        expected = list(
+            ClinicAttendance.objects.order_by(
+                "-expected_clinic_date", "-created_at", "-id"
+            ).values_list("id", flat=True)
+        )
+
+        pages = []
+        url = reverse("clinicattendance-list") + "?page_size=2"
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([row["id"] for row in response.data["results"]])
+            url = response.data["next"]
+        self.assertEqual(sum(pages, []), expected)
+        # 커서 조회는 첫 컬럼 범위 조건(<=)을 포함해 인덱스 범위 스캔 가능
+        sql = next(q["sql"] for q in queries if "core_clinicattendance" in q["sql"])
+        self.assertIn('"expected_clinic_date" <=', sql)
+
+        backward = []
+        url = response.data["previous"]
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            backward.insert(0, [row["id"] for row in response.data["results"]])
+            url = response.data["previous"]
+        self.assertEqual(backward, pages[:-1])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("clinicattendance-list"), {"cursor": "!!"})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(
+    RATE_LIMIT={"ENABLED": False},
+    WAITING_ROOM={"ENABLED": False},
+    LOGIN_AUDIT={"ASYNC": False},
+)
+class SingleSessionCacheTest(TestCase):
+    """중복 로그인 체크가 캐시로 처리되고 세션 변경 시 바로 반영되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.user = User.objects.create(
+            username="session_user", name="세션사용자", subject=cls.subject
+        )
+
+    def setUp(self):
+        cache.clear()
+        SessionActivityTracker._pending.clear()
+        self.client = APIClient()
+        self.login(self.client, self.user)
+        UserSession.objects.update_or_create(
+            user=self.user,
+            defaults={"session_key": self.client.session.session_key, "token_key": None},
+        )
+        self.url = reverse("subject-list")
+
+    @staticmethod
+    def login(client, user):
+        """실제 로그인 요청처럼 REMOTE_ADDR가 있는 요청으로 로그인 (client.login()은 IP가 없음)"""
+        request = RequestFactory().get("/", REMOTE_ADDR="127.0.0.1")
+        request.session = client.session
+        login(request, user, backend="django.contrib.auth.backends.ModelBackend")
+        request.session.save()
+        client.cookies[settings.SESSION_COOKIE_NAME] = request.session.session_key
+
+    def session_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in queries if "core_usersession" in q["sql"]]
+
+    def test_repeated_requests_skip_user_session_table(self):
+        self.session_queries()  # 캐시 적재 + 첫 활동 시간 기록
+        self.assertEqual(self.session_queries(), [])
+
+        SessionActivityTracker.flush()
+        self.assertIsNotNone(UserSession.objects.get(user=self.user).last_activity)
+
+    def test_session_change_is_enforced_immediately(self):
+        self.session_queries()
+
+        user_session = UserSession.objects.get(user=self.user)
+        user_session.session_key = "other-device-session"
+        user_session.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["reason"], "duplicate_login")
+
+    @override_settings(SESSION_TRACKING={"FLUSH_SECONDS": 7})
+    def test_activity_is_flushed_on_timer_without_new_requests(self):
+        class Stop(Exception):
+            pass
+
+        stale = timezone.now() - timedelta(hours=1)
+        self.session_queries()
+        UserSession.objects.filter(user=self.user).update(last_activity=stale)
+
+        # 기록 스레드 한 주기 실행 (요청이 더 없어도 FLUSH_SECONDS 뒤 반영)
+        with mock.patch("core.utils.time.sleep", side_effect=[None, Stop]) as sleep:
+            with mock.patch("django.db.close_old_connections"):
+                with self.assertRaises(Stop):
+                    SessionActivityTracker._run()
+        sleep.assert_called_with(7)
+        self.assertGreater(UserSession.objects.get(user=self.user).last_activity, stale)
+
+    def test_flush_is_registered_at_exit(self):
+        with mock.patch.object(SessionActivityTracker, "_thread", None), mock.patch.object(
+            SessionActivityTracker, "_atexit_registered", False
+        ), mock.patch("core.utils.threading.Thread") as thread, mock.patch(
+            "core.utils.atexit.register"
+        ) as register:
+            SessionActivityTracker.touch(self.user.id)
+        register.assert_called_once_with(SessionActivityTracker.flush)
+        thread.return_value.start.assert_called_once()
+
+
+@override_settings(
+    RATE_LIMIT={"ENABLED": False},
+    WAITING_ROOM={"ENABLED": False},
+    LOGIN_AUDIT={"ASYNC": False},
+    TOKEN_AUTH={"CACHE": "True"},
+)
+class CachedTokenAuthenticationTest(TestCase):
+    """토큰 인증이 캐시로 처리되고 로그아웃/재로그인 시 바로 무효화되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.user = User.objects.create(
+            username="token_user", name="토큰사용자", subject=cls.subject
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.token = Token.objects.create(user=self.user)
+        UserSession.objects.create(user=self.user, token_key=self.token.key)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("subject-list")
+
+    def auth_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        sql = [q["sql"] for q in queries if "authtoken_token" in q["sql"]]
+        return response, sql
+
+    def test_cached_token_needs_no_queries(self):
+        response, sql = self.auth_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(sql), 1)  # 토큰/사용자/세션 JOIN 한 번
+
+        response, sql = self.auth_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sql, [])
+
+    def test_logout_invalidates_cached_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.token.delete()
+        self.assertEqual(self.client.post(reverse("logout")).status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_token_replaced_elsewhere_returns_session_expired(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        user_session = UserSession.objects.get(user=self.user)
+        user_session.token_key = "a" * 40
+        user_session.save()
+        TokenAuthCache.invalidate(self.token.key)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["error"], "session_expired")
+
+    def test_deleted_user_tokens_are_invalidated(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertIsNotNone(TokenAuthCache.get(self.token.key))
+
+        self.user.delete()  # 토큰은 post_delete 전에 CASCADE로 삭제됨
+        self.assertIsNone(TokenAuthCache.get(self.token.key))
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @override_settings(TOKEN_AUTH={"CACHE": "auto"})
+    def test_auto_skips_cache_unless_shared(self):
+        # 테스트 캐시는 LocMemCache(워커별) → 매 요청 DB 확인
+        self.assertFalse(TokenAuthCache.is_enabled())
+        self.assertEqual(len(self.auth_queries()[1]), 1)
+        self.assertEqual(len(self.auth_queries()[1]), 1)
+
+        redis_cache = {
+            "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}
+        }
+        with override_settings(CACHES=redis_cache):
+            self.assertTrue(TokenAuthCache.is_enabled())
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, WAITING_ROOM={"ENABLED": False})
+class ClinicSeatStreamTest(TestCase):
+    """좌석 스트림이 기본 비활성화이고, 헤더 토큰 + 중복 로그인 확인으로만 연결되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subject = Subject.objects.create(subject="physics1")
+        cls.user = User.objects.create(
+            username="stream_user", name="스트림사용자", subject=cls.subject
+        )
+        cls.token = Token.objects.create(user=cls.user)
+        UserSession.objects.create(user=cls.user, token_key=cls.token.key)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("clinic_seat_stream")
+
+    def test_disabled_by_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"status": "disabled"})
+
+    @override_settings(SEAT_STREAM={"ENABLED": True})
+    def test_wsgi_request_is_rejected(self):
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+        self.assertEqual(response.status_code, 501)
+
+    @override_settings(SEAT_STREAM={"ENABLED": True})
+    async def test_query_token_is_not_accepted(self):
+        response = await AsyncClient().get(self.url, {"token": self.token.key})
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(SEAT_STREAM={"ENABLED": True})
+    async def test_token_replaced_elsewhere_is_rejected(self):
+        await UserSession.objects.filter(user=self.user).aupdate(token_key="a" * 40)
+
+        response = await AsyncClient().get(
+            self.url, headers={"authorization": f"Token {self.token.key}"}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["error"], "session_expired")
+
+    @override_settings(SEAT_STREAM={"ENABLED": True})
+    async def test_current_token_is_authenticated(self):
+        with mock.patch.object(
+            ClinicSeatBroadcaster, "ensure_started", return_value=False
+        ) as ensure_started:
+            response = await AsyncClient().get(
+                self.url, headers={"authorization": f"Token {self.token.key}"}
+            )
+        ensure_started.assert_called_once()  # 인증 통과 후 감지 스레드 시작 단계
+        self.assertEqual(response.status_code, 503)
+
+    def test_open_stream_detects_new_login(self):
+        from .views import ClinicSeatStreamView
+
+        credentials = (None, self.token.key)
+        self.assertTrue(ClinicSeatStreamView._is_current_session(self.user.id, credentials))
+
+        UserSession.objects.filter(user=self.user).update(token_key="a" * 40)
+        SessionActivityTracker.invalidate(self.user.id)
+        self.assertFalse(
+            ClinicSeatStreamView._is_current_session(self.user.id, credentials)
+        )
+
+        UserSession.objects.filter(user=self.user).delete()
+        SessionActivityTracker.invalidate(self.user.id)
+        self.assertFalse(
+            ClinicSeatStreamView._is_current_session(self.user.id, credentials)
+        )
+
+
+class SessionWriteElisionTest(TestCase):
+    """세션 엔진이 변경/만료 임박 시에만 django_session을 저장하는지 확인"""
+
+    def session_writes(self, store):
+        with CaptureQueriesContext(connection) as queries:
+            store.save()
+        return [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+
+    def test_unchanged_session_is_not_rewritten(self):
+        created = SessionStore()
+        created["user_id"] = 1
+        created.create()
+
+        store = SessionStore(created.session_key)
+        self.assertEqual(store["user_id"], 1)
+        self.assertEqual(self.session_writes(store), [])
+
+        store["user_id"] = 2
+        self.assertEqual(len(self.session_writes(store)), 1)
+
+        # 남은 유효 시간이 기준보다 적으면 만료 연장 저장
+        with self.settings(SESSION_WRITE={"REFRESH_THRESHOLD": 10**9}):
+            store = SessionStore(created.session_key)
+            self.assertEqual(len(self.session_writes(store)), 1)
+
+
+@override_settings(RATE_LIMIT={"ENABLED": False}, LOGIN_AUDIT={"ASYNC": False})
+class LoginAuditWriterTest(TestCase):
+    """로그인 이력이 모아서 한 번에 저장되고 실패한 사용자명이 사용자와 연결되는지 확인"""
+
+    def test_batch_is_saved_with_single_insert(self):
+        subject = Subject.objects.create(subject="physics1")
+        user = User.objects.create(username="audit_user", name="감사", subject=subject)
+        client_info = ClientInfoExtractor.extract_client_info(
+            RequestFactory().get("/", HTTP_USER_AGENT="Mozilla/5.0 Chrome/120")
+        )
+
+        LoginAuditWriter._queue = queue.Queue()
+        self.addCleanup(setattr, LoginAuditWriter, "_queue", None)
+        for username in ["audit_user", "unknown_user"]:
+            LoginAuditWriter._queue.put(
+                {
+                    "user_id": None,
+                    "username": username,
+                    "client_info": client_info,
+                    "check_suspicious": False,
+                    "history": {"login_success": False, "failure_reason": "wrong"},
+                    "login_at": timezone.now(),
+                }
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            LoginAuditWriter.flush()
+        inserts = [
+            q
+            for q in queries
+            if q["sql"].startswith('INSERT INTO "core_loginhistory"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        # 존재하지 않는 사용자명은 이력 없이 로그로만 남음
+        self.assertEqual(
+            list(LoginHistory.objects.values_list("user_id", flat=True)), [user.id]
+        )
+
+    @override_settings(LOGIN_AUDIT={"ASYNC": True})
+    def test_logout_is_queued_behind_pending_login(self):
+        subject = Subject.objects.create(subject="physics1")
+        user = User.objects.create(username="logout_user", name="로그아웃", subject=subject)
+        client_info = ClientInfoExtractor.extract_client_info(
+            RequestFactory().get("/", HTTP_USER_AGENT="Mozilla/5.0 Chrome/120")
+        )
+
+        LoginAuditWriter._queue = queue.Queue()
+        self.addCleanup(setattr, LoginAuditWriter, "_queue", None)
+        with mock.patch.object(LoginAuditWriter, "_ensure_thread"):
+            LoginAuditWriter.record_login(user, client_info, check_suspicious=False)
+            with self.assertNumQueries(0):  # 요청 스레드에서는 기록하지 않음
+                LoginAuditWriter.record_logout(user, "manual_logout")
+
+        LoginAuditWriter.flush()  # 기록 스레드 한 번 처리와 같음
+        history = LoginHistory.objects.get(user=user)
+        self.assertEqual(history.logout_reason, "manual_logout")
+        self.assertIsNotNone(history.logout_at)
+
+    def test_logout_does_not_close_later_login_in_batch(self):
+        subject = Subject.objects.create(subject="physics1")
+        user = User.objects.create(username="relogin_user", name="재로그인", subject=subject)
+        client_info = ClientInfoExtractor.extract_client_info(
+            RequestFactory().get("/", HTTP_USER_AGENT="Mozilla/5.0 Chrome/120")
+        )
+        now = timezone.now()
+
+        def login(at):
+            return {
+                "user_id": user.id,
+                "username": user.username,
+                "client_info": client_info,
+                "check_suspicious": False,
+                "history": {"login_success": True},
+                "login_at": at,
+            }
+
+        LoginAuditWriter.write_batch(
+            [
+                login(now - timedelta(minutes=5)),
+                {
+                    "user_id": user.id,
+                    "username": user.username,
+                    "logout_reason": "manual_logout",
+                    "logout_at": now,
+                },
+                login(now + timedelta(seconds=1)),
+            ]
+        )
+        self.assertEqual(
+            list(
+                LoginHistory.objects.order_by("login_at").values_list(
+                    "logout_reason", flat=True
+                )
+            ),
+            ["manual_logout", None],
+        )
+
+    def test_login_profile_replaces_history_scan(self):
+        subject = Subject.objects.create(subject="physics1")
+        user = User.objects.create(username="profile_user", name="프로필", subject=subject)
+        factory = RequestFactory()
+        chrome = ClientInfoExtractor.extract_client_info(
+            factory.get("/", HTTP_USER_AGENT="Mozilla/5.0 Chrome/120")
+        )
+
+        # 처음 보는 기기는 의심 지표, 로그인 후에는 프로필에 기록되어 정상
+        LoginAuditWriter.write_batch(
+            [
+                {
+                    "user_id": user.id,
+                    "username": user.username,
+                    "client_info": chrome,
+                    "check_suspicious": True,
+                    "history": {"login_success": True},
+                    "login_at": timezone.now(),
+                }
+            ]
+        )
+        profile = LoginProfile.objects.get(user=user)
+        with self.assertNumQueries(0):
+            indicators = LoginSecurityUtils.is_suspicious_activity(
+                user, chrome, profile
+            )
+        self.assertEqual(indicators, [])
+
+        # 10분 내 4개 IP에서 시도하면 의심 지표 (같은 IP 반복은 한 번만 셈)
+        for ip in ["10.0.0.1", "10.0.0.2", "10.0.0.2", "10.0.0.3"]:
+            profile.record_attempt(
+                {**chrome, "ip_address": ip}, timezone.now(), success=False
+            )
+        self.assertEqual(
+            LoginSecurityUtils.is_suspicious_activity(user, chrome, profile),
+            ["10분 내 4개 IP에서 로그인"],
+        )
@@ -52,6 +52,11 @@ urlpatterns = [
         views.ClinicViewSet.as_view({"post": "reserve_clinic"}),
         name="clinic_reserve",
     ),
+    path(
+        "clinics/reserve-batch/",
+        views.ClinicViewSet.as_view({"post": "reserve_clinics_batch"}),
+        name="clinic_reserve_batch",
+    ),
     path(
         "clinics/cancel-reservation/",
         views.ClinicViewSet.as_view({"post": "cancel_reservation"}),
@@ -62,6 +67,24 @@ urlpatterns = [
         views.ClinicViewSet.as_view({"get": "weekly_schedule"}),
         name="clinic_weekly_schedule",
     ),
+    # 예약 오픈 대기열 티켓 API
+    path(
+        "clinics/waiting-room/",
+        views.WaitingRoomView.as_view(),
+        name="clinic_waiting_room",
+    ),
+    # 클리닉 좌석 변경 실시간 스트림 (SSE, ASGI 전용)
+    path(
+        "clinics/stream/",
+        views.ClinicSeatStreamView.as_view(),
+        name="clinic_seat_stream",
+    ),
+    # 추첨 예약 결과 조회 API
+    path(
+        "clinics/lottery/",
+        views.ReservationLotteryView.as_view(),
+        name="clinic_lottery",
+    ),
     # 기본 API 엔드포인트 (users, subjects, clinics) - Student 모델 삭제로 students 제거
     path("", include(router.urls)),
     # 인증 관련 API
@@ -5,13 +5,13 @@ REST API 엔드포인트를 제공합니다.
 """
 
 from django.shortcuts import render, redirect
-from rest_framework import viewsets, permissions, status, generics
+from rest_framework import viewsets, permissions, status, generics, exceptions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth import authenticate, login, logout
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
-from django.db import transaction
+from django.db import transaction, IntegrityError
 from core.models import (
     # Student,  # Student 모델 삭제로 주석처리
     Subject,
@@ -22,7 +22,12 @@ from core.models import (
     StudentPlacement,
     WeeklyReservationPeriod,  # 주간 예약 기간 관리
     ClinicAttendance,  # 클리닉 출석 모델
+    ReservationLottery,  # 추첨 예약 회차
+    DataVersion,  # 조건부 GET(ETag)용 데이터 버전
+    ScheduleChange,  # 주간 스케줄 변경 기록 (since 조회)
 )
+from .authentication import CachedTokenAuthentication
+from .pagination import ClinicAttendanceKeysetPagination, KeysetPagination
 from .serializers import (
     UserSerializer,
     # StudentSerializer,  # Student 모델 삭제로 주석처리
@@ -48,15 +53,28 @@ from django.http import JsonResponse
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 import os
-from django.db.models import Q
+import asyncio
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.views import View
+from django.db.models import Q, F, Prefetch
 from datetime import datetime
 from django.conf import settings
 from core.utils import (
-    with_reservation_lock,
     with_rate_limit,
+    with_waiting_room,
+    with_idempotency,
+    with_single_flight,
+    with_conditional_get,
     log_performance,
     ClinicReservationOptimizer,
     DatabaseOptimizer,
+    WaitingRoom,
+    ReservationLotteryManager,
+    ClinicSeatBroadcaster,
+    SessionActivityTracker,
+    TokenAuthCache,
 )
 
 # 로거 설정
@@ -75,10 +93,12 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all().order_by("id")  # 페이지네이션을 위한 순서 지정
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination  # id 커서 페이지네이션 (COUNT/OFFSET 없음)
 
     def get_queryset(self):
         """요청 파라미터에 따라 필터링된 사용자 목록 반환"""
-        queryset = User.objects.all().order_by("id")  # 페이지네이션을 위한 순서 지정
+        # 학생 과목명(subject_name) 직렬화를 위해 과목을 함께 조회
+        queryset = User.objects.select_related("subject").order_by("id")
 
         # students 엔드포인트로 접근한 경우 기본적으로 학생만 필터링 (backward compatibility)
         if hasattr(self, "basename") and self.basename == "students":
@@ -117,8 +137,6 @@ class UserViewSet(viewsets.ModelViewSet):
         if is_student is not None:
             queryset = queryset.filter(is_student=(is_student.lower() == "true"))
 
-        logger.info(f"[api/views.py] 사용자 조회 결과: {queryset.count()} 명")
-
         return queryset
 
     @action(detail=True, methods=["patch"])
@@ -681,6 +699,25 @@ class SubjectViewSet(viewsets.ModelViewSet):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
 
+    @with_conditional_get(DataVersion.SUBJECTS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @with_conditional_get(DataVersion.SUBJECTS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+def _schedule_version_key(request):
+    """주간 스케줄 single-flight 키 - 스케줄 버전별로 병합 (뷰에서 다시 조회하지 않도록 보관)"""
+    data_versions = getattr(request, "data_versions", {})
+    if DataVersion.CLINIC_SCHEDULE in data_versions:
+        # with_conditional_get에서 이미 조회한 버전 재사용
+        request.schedule_version = data_versions[DataVersion.CLINIC_SCHEDULE]
+    else:
+        request.schedule_version = ClinicReservationOptimizer.get_schedule_version()
+    return request.schedule_version
+
 
 class ClinicViewSet(viewsets.ModelViewSet):
     queryset = Clinic.objects.all().order_by(
@@ -706,13 +743,24 @@ class ClinicViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @with_conditional_get(
+        DataVersion.CLINIC_SCHEDULE, DataVersion.USERS, DataVersion.SUBJECTS
+    )
+    def list(self, request, *args, **kwargs):
+        """클리닉 목록 조회 (클리닉/사용자/과목 버전이 그대로면 304)"""
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["post"])
-    @with_rate_limit(action="clinic_reservation", limit=5, window=60)
+    @with_idempotency(action="clinic_reservation")
+    @with_waiting_room
     @log_performance("클리닉 예약")
     def reserve_clinic(self, request):
         """
         학생이 클리닉을 예약하는 API (선착순 시스템)
-        동시접속 보호: Rate limiting, 성능 로깅 적용
+        동시접속 보호: Rate limiting(RateLimitMiddleware), 성능 로깅 적용
+        좌석 선점: 행 잠금(select_for_update) 대신 reserved_count 조건부 UPDATE 사용
+        추첨 모드(RESERVATION_LOTTERY): 접수 기간에는 희망 순위만 기록 (202)
+        allow_overflow=true: 정원이 찼으면 같은 요일/시간/과목의 가장 여유 있는 클리닉에 예약
         """
         logger.info("[api/views.py] 클리닉 예약 요청 시작")
 
@@ -740,177 +788,538 @@ class ClinicViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            # 트랜잭션 내에서 클리닉 조회 및 예약 처리 (동시성 문제 방지)
-            with transaction.atomic():
-                # 클리닉 조회 (select_for_update를 트랜잭션 내에서 사용)
-                try:
-                    clinic = DatabaseOptimizer.get_clinic_with_lock(clinic_id)
-                except Clinic.DoesNotExist:
-                    return Response(
-                        {"error": "유효하지 않은 클리닉입니다."},
-                        status=status.HTTP_404_NOT_FOUND,
-                    )
+            # 클리닉 조회 (행 잠금 없이 조회 - 좌석 선점은 조건부 UPDATE로 처리)
+            try:
+                clinic = Clinic.objects.select_related(
+                    "clinic_teacher", "clinic_subject"
+                ).get(id=clinic_id)
+            except Clinic.DoesNotExist:
+                return Response(
+                    {"error": "유효하지 않은 클리닉입니다."},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-                # 클리닉 활성화 상태 확인 (간단한 시스템)
+            # 클리닉 활성화 상태 확인 (간단한 시스템)
+            if not clinic.is_active:
+                return self._reservation_closed_response()
+
+            # 이미 예약했는지 확인 (동시 요청은 좌석 선점 시 unique 제약으로 차단)
+            if Clinic.clinic_students.through.objects.filter(
+                clinic_id=clinic.id, user_id=user.id
+            ).exists():
+                return self._duplicate_reservation_response()
+
+            # no_show 체크 (학생만 해당, 2회 이상 무단결석한 학생은 예약 불가)
+            if user.is_student and user.no_show >= 2:
+                logger.warning(
+                    f"[api/views.py] 노쇼 학생 예약 차단: user_id={user_id}, "
+                    f"user_name={user.name}, no_show_count={user.no_show}"
+                )
+                return Response(
+                    {
+                        "error": "no_show_blocked",
+                        "message": f"{user.name} 학생은 {user.no_show}회 무단결석하여 금주 보충 예약이 불가능합니다.",
+                        "no_show_count": user.no_show,
+                        "user_name": user.name,
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            # 추첨 예약 모드: 접수 기간에는 좌석을 잡지 않고 희망 순위만 기록
+            if ReservationLotteryManager.is_enabled():
+                lottery = ReservationLottery.get_pending()
+                if lottery is not None:
+                    return self._lottery_preference_response(lottery, user, clinic)
+
+            # 정원이 찬 경우 같은 시간대/과목의 다른 강의실로 자동 이월할지 여부
+            allow_overflow = str(request.data.get("allow_overflow", "")).lower() in (
+                "true",
+                "1",
+            )
+
+            # 현재 주의 클리닉 날짜 계산 기준일
+            today = datetime.now().date()
+
+            # 정원 사전 확인 (잠금 없는 조회 값 기준 - 마감된 클리닉은 트랜잭션 없이 바로 거절)
+            if clinic.reserved_count >= clinic.clinic_capacity:
+                seat_result = DatabaseOptimizer.SEAT_UNAVAILABLE
+            else:
+                seat_result = self._reserve_seat(clinic, user, today)
+                if seat_result == DatabaseOptimizer.SEAT_UNAVAILABLE:
+                    # 비활성화/정원 초과 구분을 위해 상태만 다시 조회
+                    clinic.refresh_from_db(fields=["is_active", "reserved_count"])
+
+            if seat_result == DatabaseOptimizer.SEAT_DUPLICATE:
+                return self._duplicate_reservation_response()
+
+            requested_clinic = None
+            if seat_result == DatabaseOptimizer.SEAT_UNAVAILABLE:
                 if not clinic.is_active:
-                    return Response(
-                        {
-                            "error": "reservation_closed",
-                            "message": "보충 예약 가능 기간이 아닙니다.",
-                            "clinic_status": "inactive",
-                        },
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-                # 이미 예약했는지 확인
-                if clinic.clinic_students.filter(id=user_id).exists():
-                    return Response(
-                        {"error": "이미 해당 클리닉에 예약되어 있습니다."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+                    return self._reservation_closed_response()
 
-                # 기존의 비활성화된 출석 데이터가 있다면 삭제 (unique 제약 조건 문제 해결)
-                # 현재 주의 클리닉 날짜 계산
-                from datetime import datetime, timedelta
-
-                # 클리닉 요일을 숫자로 변환 (0=월요일, 6=일요일)
-                clinic_day_map = {
-                    "mon": 0,
-                    "tue": 1,
-                    "wed": 2,
-                    "thu": 3,
-                    "fri": 4,
-                    "sat": 5,
-                    "sun": 6,
-                }
+                overflow_clinic = (
+                    self._reserve_overflow(clinic, user, today)
+                    if allow_overflow
+                    else None
+                )
+                if overflow_clinic is None:
+                    return self._occupied_response(clinic)
 
-                clinic_weekday = clinic_day_map.get(clinic.clinic_day, 0)
-                today = datetime.now().date()
-                today_weekday = today.weekday()
+                logger.info(
+                    f"[api/views.py] 예약 자동 이월: user_id={user_id}, "
+                    f"clinic_id={clinic.id} → {overflow_clinic.id}"
+                )
+                requested_clinic, clinic = clinic, overflow_clinic
 
-                # 이번 주의 클리닉 날짜 계산
-                days_until_clinic = clinic_weekday - today_weekday
+            # 선점한 좌석을 메모리상의 카운터에도 반영 (추가 조회 없이 남은 자리 계산)
+            clinic.reserved_count += 1
 
-                if days_until_clinic >= 0:
-                    # 이번 주 클리닉 날짜 (오늘 포함)
-                    expected_clinic_date = today + timedelta(days=days_until_clinic)
-                else:
-                    # 다음 주 클리닉 날짜
-                    expected_clinic_date = today + timedelta(days=days_until_clinic + 7)
-
-                # 기존의 비활성화된 출석 데이터 삭제 (unique 제약 조건 충돌 방지)
-                existing_inactive_attendances = ClinicAttendance.objects.filter(
-                    clinic=clinic,
-                    student=user,
-                    expected_clinic_date=expected_clinic_date,
-                    is_active=False,
+            return Response(
+                {
+                    "success": True,
+                    "message": "클리닉 예약이 완료되었습니다.",
+                    "clinic_info": {
+                        "id": clinic.id,
+                        "day": clinic.get_clinic_day_display(),
+                        "time": clinic.clinic_time,
+                        "room": clinic.clinic_room,
+                        "subject": clinic.clinic_subject.subject,
+                        "teacher": clinic.clinic_teacher.name,
+                    },
+                    "remaining_spots": clinic.get_remaining_spots(),
+                    "overflow": requested_clinic is not None,
+                    "requested_clinic_id": (
+                        requested_clinic.id if requested_clinic else clinic.id
+                    ),
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"[api/views.py] 클리닉 예약 오류: {error_msg}")
+            logger.error(f"[api/views.py] 스택 트레이스:\n{traceback.format_exc()}")
+
+            return Response(
+                {"error": f"클리닉 예약 중 오류가 발생했습니다: {error_msg}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    MAX_BATCH_RESERVATIONS = 50  # 일괄 예약 한 번에 처리할 최대 건수
+
+    @action(detail=False, methods=["post"])
+    @with_idempotency(action="clinic_reservation_batch")
+    @with_waiting_room
+    @log_performance("클리닉 일괄 예약")
+    def reserve_clinics_batch(self, request):
+        """
+        여러 (user_id, clinic_id) 예약을 한 트랜잭션으로 처리하는 API
+        요청: {"reservations": [{"user_id": 1, "clinic_id": 3}, ...]}
+
+        - 단건 예약과 같은 순서로 출석 데이터/중간 테이블 행을 먼저 INSERT한 뒤
+          클리닉 행을 id 오름차순으로 select_for_update (단건/일괄 예약과 교착 상태 방지)
+        - 잠금 후 정원을 다시 확인하고 요청 순서대로 좌석 배정, 배정되지 않은 행은 삭제
+        - 응답에는 항목별 결과(reserved, duplicate, occupied 등)를 포함
+        """
+        logger.info("[api/views.py] 클리닉 일괄 예약 요청 시작")
+
+        items = request.data.get("reservations")
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "reservations 목록이 필요합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.MAX_BATCH_RESERVATIONS:
+            return Response(
+                {
+                    "error": f"한 번에 최대 {self.MAX_BATCH_RESERVATIONS}건까지 예약할 수 있습니다."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            # 요청 항목 정리 (잘못된 형식은 항목별 오류로 처리)
+            results = []
+            for item in items:
+                try:
+                    user_id = int(item.get("user_id"))
+                    clinic_id = int(item.get("clinic_id"))
+                except (AttributeError, TypeError, ValueError):
+                    user_id = clinic_id = None
+                results.append(
+                    {"user_id": user_id, "clinic_id": clinic_id, "status": None}
                 )
-                if existing_inactive_attendances.exists():
-                    deleted_inactive_count = existing_inactive_attendances.count()
-                    existing_inactive_attendances.delete()
-                    logger.info(
-                        f"[api/views.py] 클리닉 예약 - 기존 비활성화 출석 데이터 삭제: "
-                        f"clinic_id={clinic_id}, student_id={user_id}, "
-                        f"expected_clinic_date={expected_clinic_date}, count={deleted_inactive_count}"
-                    )
 
-                # no_show 체크 (학생만 해당, 2회 이상 무단결석한 학생은 예약 불가)
-                if user.is_student and user.no_show >= 2:
-                    logger.warning(
-                        f"[api/views.py] 노쇼 학생 예약 차단: user_id={user_id}, "
-                        f"user_name={user.name}, no_show_count={user.no_show}"
-                    )
-                    return Response(
-                        {
-                            "error": "no_show_blocked",
-                            "message": f"{user.name} 학생은 {user.no_show}회 무단결석하여 금주 보충 예약이 불가능합니다.",
-                            "no_show_count": user.no_show,
-                            "user_name": user.name,
-                        },
-                        status=status.HTTP_403_FORBIDDEN,
+            users = User.objects.in_bulk(
+                {r["user_id"] for r in results if r["user_id"] is not None}
+            )
+            clinics = Clinic.objects.select_related(
+                "clinic_teacher", "clinic_subject"
+            ).in_bulk({r["clinic_id"] for r in results if r["clinic_id"] is not None})
+
+            # 잠금 전 사전 검사 (유효성, 노쇼, 요청 내 중복)
+            seen_pairs = set()
+            for result in results:
+                pair = (result["clinic_id"], result["user_id"])
+                user = users.get(result["user_id"])
+                if result["user_id"] is None or result["clinic_id"] is None:
+                    result["status"] = "invalid"
+                elif user is None:
+                    result["status"] = "invalid_user"
+                elif result["clinic_id"] not in clinics:
+                    result["status"] = "invalid_clinic"
+                elif pair in seen_pairs:
+                    result["status"] = "duplicate"
+                elif user.is_student and user.no_show >= 2:
+                    result["status"] = "no_show_blocked"
+                seen_pairs.add(pair)
+
+            pending = [r for r in results if r["status"] is None]
+            locked_clinic_ids = sorted({r["clinic_id"] for r in pending})
+            reserved_pairs = []
+            today = datetime.now().date()
+
+            if pending:
+                with transaction.atomic():
+                    # 1. 출석 데이터/중간 테이블 행을 먼저 INSERT (단건 예약과 같은 순서:
+                    #    행 INSERT → 클리닉 행 잠금). 클리닉을 잠근 채 다른 예약의 미커밋 행을
+                    #    기다리지 않으므로 교착 상태가 없고, unique 충돌은 항목별 중복으로 처리
+                    inserted = set()
+                    for result in sorted(
+                        pending, key=lambda r: (r["clinic_id"], r["user_id"])
+                    ):
+                        pair = (result["clinic_id"], result["user_id"])
+                        if self._insert_batch_rows(
+                            clinics[result["clinic_id"]], users[result["user_id"]], today
+                        ):
+                            inserted.add(pair)
+                        else:
+                            result["status"] = "duplicate"
+
+                    # 2. 클리닉 행을 id 오름차순으로 잠그고 최신 정원/예약 인원 조회
+                    locked_clinics = {
+                        clinic.id: clinic
+                        for clinic in Clinic.objects.select_for_update()
+                        .filter(id__in=locked_clinic_ids)
+                        .order_by("id")
+                        .only("id", "is_active", "clinic_capacity", "reserved_count")
+                    }
+                    remaining = {
+                        clinic_id: clinic.clinic_capacity - clinic.reserved_count
+                        for clinic_id, clinic in locked_clinics.items()
+                    }
+
+                    # 3. 요청 순서대로 좌석 배정 (이번에 INSERT한 행만 대상)
+                    for result in pending:
+                        if result["status"] is not None:
+                            continue
+                        clinic = locked_clinics.get(result["clinic_id"])
+                        if clinic is None:
+                            # 사전 조회 이후 삭제된 클리닉
+                            result["status"] = "invalid_clinic"
+                        elif not clinic.is_active:
+                            result["status"] = "reservation_closed"
+                        elif remaining[clinic.id] <= 0:
+                            result["status"] = "occupied"
+                        else:
+                            remaining[clinic.id] -= 1
+                            result["status"] = "reserved"
+                            reserved_pairs.append((clinic.id, result["user_id"]))
+
+                    # 4. 배정되지 않은 행 삭제 후 예약된 클리닉의 reserved_count 재계산
+                    rejected = inserted - set(reserved_pairs)
+                    if rejected:
+                        self._delete_batch_rows(rejected, clinics, today)
+                    if reserved_pairs:
+                        Clinic.sync_reserved_counts(
+                            sorted({clinic_id for clinic_id, _ in reserved_pairs})
+                        )
+
+                    reserved_user_ids = {user_id for _, user_id in reserved_pairs}
+                    transaction.on_commit(
+                        lambda: self._after_batch_commit(reserved_user_ids)
                     )
 
-                # 정원 확인
-                if clinic.is_full():
-                    logger.warning(
-                        f"[api/views.py] 클리닉 정원 초과: clinic_id={clinic_id}, "
-                        f"current={clinic.get_current_students_count()}, capacity={clinic.clinic_capacity}"
+                # 응답용 예약 인원 갱신 (잠금 시점 인원 + 이번에 배정한 좌석)
+                for clinic_id, clinic in locked_clinics.items():
+                    clinics[clinic_id].reserved_count = (
+                        clinic.clinic_capacity - remaining[clinic_id]
                     )
-                    return Response(
-                        {
-                            "error": "occupied",
-                            "message": "해당 시간대는 이미 마감되었습니다.",
-                            "current_count": clinic.get_current_students_count(),
-                            "capacity": clinic.clinic_capacity,
-                        },
-                        status=status.HTTP_409_CONFLICT,
+
+            # 항목별 결과에 클리닉 정보/남은 자리 추가
+            for result in results:
+                clinic = clinics.get(result["clinic_id"])
+                if clinic is not None:
+                    result["clinic_info"] = {
+                        "id": clinic.id,
+                        "day": clinic.get_clinic_day_display(),
+                        "time": clinic.clinic_time,
+                        "room": clinic.clinic_room,
+                        "subject": clinic.clinic_subject.subject,
+                        "teacher": clinic.clinic_teacher.name,
+                    }
+                    result["remaining_spots"] = clinic.get_remaining_spots()
+
+            logger.info(
+                f"[api/views.py] 클리닉 일괄 예약 완료: 요청 {len(results)}건, "
+                f"예약 {len(reserved_pairs)}건"
+            )
+
+            return Response(
+                {
+                    "success": bool(reserved_pairs),
+                    "reserved_count": len(reserved_pairs),
+                    "results": results,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"[api/views.py] 클리닉 일괄 예약 오류: {error_msg}")
+            logger.error(f"[api/views.py] 스택 트레이스:\n{traceback.format_exc()}")
+
+            return Response(
+                {"error": f"클리닉 일괄 예약 중 오류가 발생했습니다: {error_msg}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    MAX_OVERFLOW_ATTEMPTS = 3  # 자동 이월 시 시도할 최대 클리닉 수
+
+    def _reserve_seat(self, clinic, user, today):
+        """
+        한 클리닉에 대한 예약 트랜잭션 실행
+
+        좌석 선점 트랜잭션 (출석 데이터 INSERT → 좌석 선점 UPDATE → 커밋)
+        클리닉 행은 마지막 UPDATE부터 커밋까지만 잠기며, 로그/non_pass 변경 등
+        좌석과 무관한 작업은 커밋 이후(on_commit)로 미룸
+
+        Returns:
+            str: DatabaseOptimizer.SEAT_CLAIMED / SEAT_DUPLICATE / SEAT_UNAVAILABLE
+        """
+        expected_clinic_date = clinic.get_expected_clinic_date(today)
+
+        try:
+            with transaction.atomic():
+                seat_result = self._claim_reservation(
+                    clinic, user, today, expected_clinic_date
+                )
+                if seat_result == DatabaseOptimizer.SEAT_CLAIMED:
+                    transaction.on_commit(
+                        lambda: self._after_reservation_commit(clinic, user)
                     )
+                else:
+                    # 출석 데이터 등 트랜잭션 전체 롤백
+                    transaction.set_rollback(True)
+        except IntegrityError:
+            # 동시 요청으로 같은 출석 데이터가 먼저 생성된 경우 (중복 예약)
+            seat_result = DatabaseOptimizer.SEAT_DUPLICATE
+
+        return seat_result
+
+    def _reserve_overflow(self, clinic, user, today):
+        """
+        정원이 찬 클리닉 대신 같은 요일/시간/과목의 다른 활성 클리닉에 예약 (allow_overflow)
+
+        후보는 (clinic_day, clinic_time, clinic_subject, is_active, reserved_count) 인덱스로
+        예약 인원이 적은 순서대로 조회하며, 이미 같은 시간대에 예약한 학생은 이월하지 않습니다.
+
+        Returns:
+            Clinic: 예약된 클리닉 (실패 시 None)
+        """
+        slot = {
+            "clinic_day": clinic.clinic_day,
+            "clinic_time": clinic.clinic_time,
+            "clinic_subject_id": clinic.clinic_subject_id,
+        }
+
+        if Clinic.clinic_students.through.objects.filter(
+            user_id=user.id, **{f"clinic__{field}": value for field, value in slot.items()}
+        ).exists():
+            return None
+
+        candidates = (
+            Clinic.objects.select_related("clinic_teacher", "clinic_subject")
+            .filter(**slot, is_active=True, reserved_count__lt=F("clinic_capacity"))
+            .exclude(id=clinic.id)
+            .order_by("reserved_count", "id")[: self.MAX_OVERFLOW_ATTEMPTS]
+        )
 
-                # 예약 성공
-                clinic.clinic_students.add(user)
+        for candidate in candidates:
+            # 후보 조회 이후 다른 요청이 먼저 채웠으면 다음 후보로
+            if self._reserve_seat(candidate, user, today) == (
+                DatabaseOptimizer.SEAT_CLAIMED
+            ):
+                return candidate
 
-                # 학생인 경우에만 ClinicAttendance 생성
-                if user.is_student:
-                    # 위에서 계산한 expected_clinic_date 재사용
-                    ClinicAttendance.objects.create(
+        return None
+
+    def _claim_reservation(self, clinic, user, today, expected_clinic_date):
+        """
+        예약 트랜잭션 본문 - 호출하는 쪽의 transaction.atomic() 안에서 실행
+
+        1. 같은 날짜의 비활성화 출석 데이터 삭제 (unique 제약 충돌 방지, DELETE 한 번)
+        2. 학생인 경우 출석 데이터 INSERT (save()의 no_show 재계산 없이 bulk_create)
+        3. 좌석 선점 (중간 테이블 INSERT + 조건부 카운터 UPDATE) - 클리닉 잠금은 여기서부터 커밋까지
+           조건부 UPDATE가 같은 클리닉 요청을 직렬화하므로 별도 예약 락은 잡지 않음
+           (락 대기 중 트랜잭션이 열린 채 워커가 묶이거나 409가 나는 일이 없음)
+
+        Returns:
+            str: DatabaseOptimizer.SEAT_CLAIMED / SEAT_DUPLICATE / SEAT_UNAVAILABLE
+        """
+        self._insert_attendance(clinic, user, today, expected_clinic_date)
+        return DatabaseOptimizer.claim_clinic_seat(clinic.id, user.id)
+
+    def _insert_attendance(self, clinic, user, today, expected_clinic_date):
+        """같은 날짜의 비활성화 출석 데이터 삭제 후 학생 출석 데이터 INSERT"""
+        ClinicAttendance.objects.filter(
+            clinic=clinic,
+            student=user,
+            expected_clinic_date=expected_clinic_date,
+            is_active=False,
+        ).delete()
+
+        if user.is_student:
+            # attendance_type="none"은 no_show에 영향이 없으므로 save() 오버라이드 생략
+            ClinicAttendance.objects.bulk_create(
+                [
+                    ClinicAttendance(
                         is_active=True,
                         clinic=clinic,
                         student=user,
                         attendance_type="none",
-                        reservation_date=today,  # 오늘 날짜로 예약 날짜 설정
-                        expected_clinic_date=expected_clinic_date,  # 위에서 계산된 예상 클리닉 날짜 사용
-                    )
-                    logger.info(
-                        f"[api/views.py] 학생용 ClinicAttendance 생성 완료: user_id={user_id}"
-                    )
-
-                    # 의무 클리닉 대상자인 경우 non_pass를 False로 변경
-                    if user.non_pass:
-                        user.non_pass = False
-                        user.save(update_fields=["non_pass"])
-                        logger.info(
-                            f"[api/views.py] 의무 클리닉 대상자 예약 완료: user_id={user_id}, "
-                            f"non_pass를 False로 변경"
-                        )
-                else:
-                    logger.info(
-                        f"[api/views.py] 비학생 사용자는 ClinicAttendance 생성 안함: user_id={user_id}, name={user.name}"
+                        reservation_date=today,
+                        expected_clinic_date=expected_clinic_date,
                     )
+                ]
+            )
 
-                # 캐시 무효화 비활성화 (Railway 분산 환경 동기화 문제로 인해 임시 비활성화)
-                # ClinicReservationOptimizer.invalidate_clinic_cache(clinic_id)
+    def _insert_batch_rows(self, clinic, user, today):
+        """
+        일괄 예약 항목의 출석 데이터/중간 테이블 행 INSERT (savepoint, 좌석 카운터는 건드리지 않음)
 
-                logger.info(
-                    f"[api/views.py] 클리닉 예약 성공: user_id={user_id}, "
-                    f"clinic_id={clinic_id}, user_name={user.name}"
+        Returns:
+            bool: INSERT 성공 여부 (unique 충돌이면 False - 이미 예약됨)
+        """
+        try:
+            with transaction.atomic():
+                self._insert_attendance(
+                    clinic, user, today, clinic.get_expected_clinic_date(today)
                 )
-
-                return Response(
-                    {
-                        "success": True,
-                        "message": "클리닉 예약이 완료되었습니다.",
-                        "clinic_info": {
-                            "id": clinic.id,
-                            "day": clinic.get_clinic_day_display(),
-                            "time": clinic.clinic_time,
-                            "room": clinic.clinic_room,
-                            "subject": clinic.clinic_subject.subject,
-                            "teacher": clinic.clinic_teacher.name,
-                        },
-                        "remaining_spots": clinic.get_remaining_spots(),
-                    },
-                    status=status.HTTP_200_OK,
+                Clinic.clinic_students.through.objects.create(
+                    clinic_id=clinic.id, user_id=user.id
                 )
+        except IntegrityError:
+            return False
+        return True
+
+    def _delete_batch_rows(self, pairs, clinics, today):
+        """배정되지 않은 일괄 예약 항목의 출석 데이터/중간 테이블 행 삭제"""
+        pair_filter = Q()
+        attendance_filter = Q()
+        for clinic_id, user_id in pairs:
+            pair_filter |= Q(clinic_id=clinic_id, user_id=user_id)
+            attendance_filter |= Q(
+                clinic_id=clinic_id,
+                student_id=user_id,
+                expected_clinic_date=clinics[clinic_id].get_expected_clinic_date(today),
+            )
+        Clinic.clinic_students.through.objects.filter(pair_filter).delete()
+        ClinicAttendance.objects.filter(attendance_filter, is_active=True).delete()
+
+    def _after_batch_commit(self, user_ids):
+        """일괄 예약 커밋 이후 처리 - 예약된 의무 클리닉 대상자 non_pass 일괄 해제"""
+        with transaction.atomic():
+            updated = User.objects.filter(
+                id__in=user_ids, is_student=True, non_pass=True
+            ).update(non_pass=False)
+            if updated:
+                # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 사용자 버전 증가
+                DataVersion.bump(DataVersion.USERS)
+
+    def _after_reservation_commit(self, clinic, user):
+        """예약 커밋 이후 처리 - 의무 클리닉 대상자 non_pass 해제 및 로그"""
+        if user.is_student and user.non_pass:
+            with transaction.atomic():
+                User.objects.filter(id=user.id, non_pass=True).update(non_pass=False)
+                DataVersion.bump(DataVersion.USERS)
+            user.non_pass = False
+            logger.info(
+                f"[api/views.py] 의무 클리닉 대상자 예약 완료: user_id={user.id}, "
+                f"non_pass를 False로 변경"
+            )
 
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"[api/views.py] 클리닉 예약 오류: {error_msg}")
-            logger.error(f"[api/views.py] 스택 트레이스:\n{traceback.format_exc()}")
+        logger.info(
+            f"[api/views.py] 클리닉 예약 성공: user_id={user.id}, "
+            f"clinic_id={clinic.id}, user_name={user.name}"
+        )
 
+    def _lottery_preference_response(self, lottery, user, clinic):
+        """추첨 예약 접수 응답 (202) - 마감 후 배정 전이면 409"""
+        if not lottery.is_collecting():
             return Response(
-                {"error": f"클리닉 예약 중 오류가 발생했습니다: {error_msg}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {
+                    "error": "lottery_allocating",
+                    "message": "추첨 배정이 진행 중입니다. 잠시 후 결과를 확인해주세요.",
+                    "lottery_id": lottery.id,
+                },
+                status=status.HTTP_409_CONFLICT,
             )
 
+        preference, created = ReservationLotteryManager.record_preference(
+            lottery, user, clinic
+        )
+        logger.info(
+            f"[api/views.py] 추첨 예약 희망 {'기록' if created else '중복'}: "
+            f"user_id={user.id}, clinic_id={clinic.id}, rank={preference.rank}"
+        )
+
+        return Response(
+            {
+                "success": True,
+                "mode": "lottery",
+                "message": "추첨 예약 신청이 접수되었습니다. 마감 후 결과를 확인해주세요.",
+                "lottery_id": lottery.id,
+                "rank": preference.rank,
+                "closes_at": lottery.closes_at,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    def _reservation_closed_response(self):
+        """비활성화된 클리닉 예약 시도 응답"""
+        return Response(
+            {
+                "error": "reservation_closed",
+                "message": "보충 예약 가능 기간이 아닙니다.",
+                "clinic_status": "inactive",
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def _duplicate_reservation_response(self):
+        """이미 예약한 클리닉 예약 시도 응답"""
+        return Response(
+            {"error": "이미 해당 클리닉에 예약되어 있습니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def _occupied_response(self, clinic):
+        """정원이 찬 클리닉 예약 시도 응답 (409)"""
+        logger.warning(
+            f"[api/views.py] 클리닉 정원 초과: clinic_id={clinic.id}, "
+            f"current={clinic.reserved_count}, capacity={clinic.clinic_capacity}"
+        )
+        return Response(
+            {
+                "error": "occupied",
+                "message": "해당 시간대는 이미 마감되었습니다.",
+                "current_count": clinic.reserved_count,
+                "capacity": clinic.clinic_capacity,
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+
     @action(detail=False, methods=["post"])
     def cancel_reservation(self, request):
         """
@@ -932,111 +1341,330 @@ class ClinicViewSet(viewsets.ModelViewSet):
         # 기존 취소 로직은 모두 제거됨 - 관리자 문의 필요
 
     @action(detail=False, methods=["get"])
+    @with_waiting_room
+    @with_conditional_get(DataVersion.CLINIC_SCHEDULE)
+    @with_single_flight("weekly_schedule", key_func=_schedule_version_key)
     @log_performance("주간 스케줄 조회")
     def weekly_schedule(self, request):
         """
         주간 클리닉 스케줄 조회 API (5x4 그리드 데이터)
-        성능 최적화: 캐싱, 쿼리 최적화 적용
+        성능 최적화: 버전 기반 캐싱(캐시 적중 시 버전 조회 1회), 쿼리 수 고정
+
+        ?since=<version>: 해당 버전 이후 바뀐 칸만 응답 (full=false)
+        변경 기록이 보관 기간을 지났거나 클리닉 구성이 바뀐 경우 전체 스냅샷 응답 (full=true)
+        모든 응답에 현재 스케줄 버전(version) 포함
         """
         logger.info("[api/views.py] 주간 클리닉 스케줄 조회 시작")
 
-        # 캐시 비활성화 (Railway 분산 환경 동기화 문제로 인해 임시 비활성화)
-        # cached_data = ClinicReservationOptimizer.get_cached_schedule()
-        # if cached_data:
-        #     logger.info("[api/views.py] 캐시된 스케줄 데이터 반환")
-        #     return Response(cached_data, status=status.HTTP_200_OK)
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return Response(
+                    {"error": "since는 정수 버전이어야 합니다."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
         try:
-            # 최적화된 클리닉 데이터 조회 (활성화된 클리닉만)
-            clinics = DatabaseOptimizer.optimize_clinic_query().filter(is_active=True)
-
-            # DB에 실제로 존재하는 요일들만 동적으로 조회 (올바른 순서로 정렬)
-            day_order = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-            days_in_db_set = set(
-                clinics.values_list("clinic_day", flat=True).distinct()
-            )
-            days_in_db = [day for day in day_order if day in days_in_db_set]
-            times_in_db = list(
-                clinics.values_list("clinic_time", flat=True)
-                .distinct()
-                .order_by("clinic_time")
-            )
-
-            # 기본값 설정 (DB에 데이터가 없는 경우) - 토요일, 일요일까지 포함
-            days = (
-                days_in_db
-                if days_in_db
-                else ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-            )
-            times = times_in_db if times_in_db else ["18:00", "19:00", "20:00", "21:00"]
-
-            schedule_grid = {}
-
-            for day in days:
-                schedule_grid[day] = {}
-                for time in times:
-                    # 해당 요일/시간의 클리닉 찾기
-                    clinic = clinics.filter(clinic_day=day, clinic_time=time).first()
-
-                    if clinic:
-                        schedule_grid[day][time] = {
-                            "clinic_id": clinic.id,
-                            "teacher_name": clinic.clinic_teacher.name,
-                            "subject": clinic.clinic_subject.subject,
-                            "room": clinic.clinic_room,
-                            "capacity": clinic.clinic_capacity,
-                            "current_count": clinic.get_current_students_count(),
-                            "remaining_spots": clinic.get_remaining_spots(),
-                            "is_full": clinic.is_full(),
-                            "students": [
-                                {
-                                    "id": student.id,
-                                    "name": student.name,
-                                    "username": student.username,
-                                }
-                                for student in clinic.clinic_students.all()
-                            ],
-                        }
-                    else:
-                        schedule_grid[day][time] = {
-                            "clinic_id": None,
-                            "teacher_name": None,
-                            "subject": None,
-                            "room": None,
-                            "capacity": 0,
-                            "current_count": 0,
-                            "remaining_spots": 0,
-                            "is_full": False,
-                            "students": [],
-                        }
+            schedule_version = getattr(request, "schedule_version", None)
+            if schedule_version is None:
+                schedule_version = ClinicReservationOptimizer.get_schedule_version()
+
+            if since is not None and since <= schedule_version:
+                changed_clinic_ids = (
+                    set()
+                    if since == schedule_version
+                    else ScheduleChange.get_changed_clinic_ids(since)
+                )
+                if changed_clinic_ids is not None:
+                    schedule_delta = self._build_schedule_delta(changed_clinic_ids)
+                    logger.info(
+                        f"[api/views.py] 주간 스케줄 변경분 반환: since={since}, "
+                        f"version={schedule_version}, clinics={len(changed_clinic_ids)}"
+                    )
+                    return Response(
+                        {
+                            "version": schedule_version,
+                            "full": False,
+                            "schedule": schedule_delta,
+                        },
+                        status=status.HTTP_200_OK,
+                    )
 
+            response_data = self._get_schedule_snapshot(schedule_version)
+            if since is not None:
+                response_data = {**response_data, "full": True}
+            return Response(response_data, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"[api/views.py] 주간 클리닉 스케줄 조회 오류: {error_msg}")
+            logger.error(f"[api/views.py] 스택 트레이스:\n{traceback.format_exc()}")
+
+            return Response(
+                {"error": f"스케줄 조회 중 오류가 발생했습니다: {error_msg}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def _get_schedule_snapshot(self, schedule_version):
+        """전체 주간 스케줄 (스케줄 버전이 포함된 캐시 사용)"""
+        # 버전은 예약/클리닉 변경 트랜잭션에서 증가
+        # 버전을 먼저 읽어야 이전 데이터가 새 버전 키로 저장되지 않습니다.
+        schedule_version, cached_data = ClinicReservationOptimizer.get_cached_schedule(
+            schedule_version
+        )
+        if cached_data is not None:
             logger.info(
-                f"[api/views.py] 주간 클리닉 스케줄 조회 완료: {len(clinics)}개 클리닉"
+                f"[api/views.py] 캐시된 스케줄 데이터 반환: version={schedule_version}"
             )
+            return cached_data
 
-            response_data = {
-                "schedule": schedule_grid,
-                "days": days,
-                "times": times,
-                "total_clinics": len(clinics),
+        # 셀 수/학생 수와 관계없이 쿼리 수가 고정됩니다.
+        clinics = list(self._schedule_clinics())
+
+        # 요일/시간별 첫 번째 클리닉(id 순)으로 그리드 셀 구성
+        clinics_by_slot = {}
+        for clinic in clinics:
+            clinics_by_slot.setdefault((clinic.clinic_day, clinic.clinic_time), clinic)
+
+        # DB에 실제로 존재하는 요일들만 동적으로 조회 (올바른 순서로 정렬)
+        day_order = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+        days_in_db_set = {day for day, _ in clinics_by_slot}
+        days_in_db = [day for day in day_order if day in days_in_db_set]
+        times_in_db = sorted({time for _, time in clinics_by_slot})
+
+        # 기본값 설정 (DB에 데이터가 없는 경우) - 토요일, 일요일까지 포함
+        days = (
+            days_in_db if days_in_db else ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+        )
+        times = times_in_db if times_in_db else ["18:00", "19:00", "20:00", "21:00"]
+
+        schedule_grid = {}
+        for day in days:
+            schedule_grid[day] = {}
+            for time in times:
+                # 해당 요일/시간의 클리닉 찾기
+                schedule_grid[day][time] = self._build_schedule_cell(
+                    clinics_by_slot.get((day, time))
+                )
+
+        logger.info(
+            f"[api/views.py] 주간 클리닉 스케줄 조회 완료: {len(clinics)}개 클리닉"
+        )
+
+        response_data = {
+            "schedule": schedule_grid,
+            "days": days,
+            "times": times,
+            "total_clinics": len(clinics),
+            "version": schedule_version,
+        }
+
+        ClinicReservationOptimizer.set_cached_schedule(schedule_version, response_data)
+        logger.info(
+            f"[api/views.py] 스케줄 데이터 캐시 저장 완료: version={schedule_version}"
+        )
+        return response_data
+
+    def _build_schedule_delta(self, changed_clinic_ids):
+        """변경된 클리닉이 속한 요일/시간 칸만 다시 구성 ({day: {time: cell}})"""
+        if not changed_clinic_ids:
+            return {}
+
+        slots = set(
+            Clinic.objects.filter(id__in=changed_clinic_ids).values_list(
+                "clinic_day", "clinic_time"
+            )
+        )
+        if not slots:
+            return {}
+
+        slot_filter = Q()
+        for day, time in slots:
+            slot_filter |= Q(clinic_day=day, clinic_time=time)
+
+        clinics_by_slot = {}
+        for clinic in self._schedule_clinics().filter(slot_filter):
+            clinics_by_slot.setdefault((clinic.clinic_day, clinic.clinic_time), clinic)
+
+        schedule_delta = {}
+        for day, time in slots:
+            schedule_delta.setdefault(day, {})[time] = self._build_schedule_cell(
+                clinics_by_slot.get((day, time))
+            )
+        return schedule_delta
+
+    @staticmethod
+    def _schedule_clinics():
+        """
+        스케줄용 활성화 클리닉 조회 (강사/과목은 JOIN, 학생 목록은 prefetch 1회)
+        인원 수는 reserved_count 컬럼을 사용하므로 COUNT 쿼리가 필요 없습니다.
+        """
+        return (
+            Clinic.objects.filter(is_active=True)
+            .select_related("clinic_teacher", "clinic_subject")
+            .prefetch_related(
+                Prefetch(
+                    "clinic_students",
+                    queryset=User.objects.only("id", "name", "username"),
+                )
+            )
+            .order_by("id")
+        )
+
+    @staticmethod
+    def _build_schedule_cell(clinic):
+        """스케줄 그리드 한 칸 (클리닉이 없으면 빈 칸)"""
+        if clinic is None:
+            return {
+                "clinic_id": None,
+                "teacher_name": None,
+                "subject": None,
+                "room": None,
+                "capacity": 0,
+                "current_count": 0,
+                "remaining_spots": 0,
+                "is_full": False,
+                "students": [],
             }
 
-            # 캐시 저장 비활성화 (Railway 분산 환경 동기화 문제로 인해 임시 비활성화)
-            # ClinicReservationOptimizer.set_cached_schedule(response_data, timeout=300)
-            # logger.info("[api/views.py] 스케줄 데이터 캐시 저장 완료")
+        return {
+            "clinic_id": clinic.id,
+            "teacher_name": clinic.clinic_teacher.name,
+            "subject": clinic.clinic_subject.subject,
+            "room": clinic.clinic_room,
+            "capacity": clinic.clinic_capacity,
+            "current_count": clinic.get_current_students_count(),
+            "remaining_spots": clinic.get_remaining_spots(),
+            "is_full": clinic.is_full(),
+            "students": [
+                {
+                    "id": student.id,
+                    "name": student.name,
+                    "username": student.username,
+                }
+                for student in clinic.clinic_students.all()
+            ],
+        }
+
+    # 잔여석 목록 컬럼 순서 (rows의 각 행이 이 순서를 따름)
+    AVAILABILITY_FIELDS = [
+        "clinic_id",
+        "day",
+        "time",
+        "room",
+        "subject",
+        "teacher_name",
+        "capacity",
+        "remaining_spots",
+        "reserved_by_me",
+    ]
 
-            return Response(response_data, status=status.HTTP_200_OK)
+    @action(detail=False, methods=["get"])
+    @with_waiting_room
+    @with_conditional_get(
+        DataVersion.CLINIC_SCHEDULE,
+        key_func=lambda request: request.user.id,  # reserved_by_me가 사용자별로 다름
+    )
+    @log_performance("잔여석 목록 조회")
+    def availability(self, request):
+        """
+        학생용 잔여석 목록 API (예약 명단 제외, 컬럼형 응답)
+
+        weekly_schedule에서 가장 큰 부분인 칸별 학생 명단을 빼고
+        {"fields": [...], "rows": [[...], ...]} 형태로 활성화 클리닉을 id 순으로 반환합니다.
+        (같은 요일/시간에 여러 클리닉이 있으면 weekly_schedule과 같이 첫 번째 행이 그리드 칸)
+        명단이 포함된 전체 스케줄은 weekly_schedule(강사/관리자용)을 사용하세요.
+
+        비용: 공통 행은 스케줄 버전별 캐시, 요청마다 내 예약 조회 1회
+        """
+        try:
+            schedule_version, cached_data = (
+                ClinicReservationOptimizer.get_cached_schedule(
+                    getattr(request, "data_versions", {}).get(
+                        DataVersion.CLINIC_SCHEDULE
+                    ),
+                    cache_key=ClinicReservationOptimizer.AVAILABILITY_CACHE_KEY,
+                )
+            )
+            if cached_data is None:
+                cached_data = self._build_availability(schedule_version)
+                ClinicReservationOptimizer.set_cached_schedule(
+                    schedule_version,
+                    cached_data,
+                    cache_key=ClinicReservationOptimizer.AVAILABILITY_CACHE_KEY,
+                )
+
+            my_clinic_ids = set(
+                Clinic.clinic_students.through.objects.filter(
+                    user_id=request.user.id
+                ).values_list("clinic_id", flat=True)
+            )
+            rows = [row + [row[0] in my_clinic_ids] for row in cached_data["rows"]]
+
+            return Response(
+                {
+                    "version": schedule_version,
+                    "days": cached_data["days"],
+                    "times": cached_data["times"],
+                    "fields": self.AVAILABILITY_FIELDS,
+                    "rows": rows,
+                },
+                status=status.HTTP_200_OK,
+            )
 
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"[api/views.py] 주간 클리닉 스케줄 조회 오류: {error_msg}")
+            logger.error(f"[api/views.py] 잔여석 목록 조회 오류: {error_msg}")
             logger.error(f"[api/views.py] 스택 트레이스:\n{traceback.format_exc()}")
 
             return Response(
-                {"error": f"스케줄 조회 중 오류가 발생했습니다: {error_msg}"},
+                {"error": f"잔여석 조회 중 오류가 발생했습니다: {error_msg}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def _build_availability(self, schedule_version):
+        """잔여석 목록 공통 행 구성 (reserved_by_me 제외, 쿼리 1회)"""
+        clinics = (
+            Clinic.objects.filter(is_active=True)
+            .order_by("id")
+            .values_list(
+                "id",
+                "clinic_day",
+                "clinic_time",
+                "clinic_room",
+                "clinic_subject__subject",
+                "clinic_teacher__name",
+                "clinic_capacity",
+                "reserved_count",
+            )
+        )
+        rows = [
+            [
+                clinic_id,
+                day,
+                time,
+                room,
+                subject,
+                teacher_name,
+                capacity,
+                capacity - reserved_count,
+            ]
+            for clinic_id, day, time, room, subject, teacher_name, capacity, reserved_count in clinics
+        ]
+
+        # weekly_schedule과 같은 요일/시간 목록 (DB에 있는 값만, 없으면 기본값)
+        day_order = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+        days_in_db_set = {row[1] for row in rows}
+        days = [day for day in day_order if day in days_in_db_set] or day_order
+        times = sorted({row[2] for row in rows}) or ["18:00", "19:00", "20:00", "21:00"]
+
+        logger.info(
+            f"[api/views.py] 잔여석 목록 구성 완료: version={schedule_version}, {len(rows)}개 클리닉"
+        )
+        return {"days": days, "times": times, "rows": rows}
+
 
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -1063,7 +1691,11 @@ class LoginView(APIView):
 
                 if user.is_active:
                     # 기존 토큰이 있다면 삭제하고 새로 생성 (중복 로그인 방지)
-                    Token.objects.filter(user=user).delete()
+                    old_tokens = Token.objects.filter(user=user)
+                    TokenAuthCache.invalidate(
+                        *old_tokens.values_list("key", flat=True)
+                    )
+                    old_tokens.delete()
                     token = Token.objects.create(user=user)
 
                     # 시그널에서 사용할 수 있도록 토큰 키를 request에 저장
@@ -1141,6 +1773,8 @@ class LoginView(APIView):
 
 class LogoutView(APIView):
     def post(self, request):
+        # 토큰 인증 캐시 삭제 (세션 정보는 로그아웃 시그널에서 정리)
+        TokenAuthCache.invalidate(getattr(request.auth, "key", None))
         logout(request)
         return Response({"message": "로그아웃 되었습니다."}, status=status.HTTP_200_OK)
 
@@ -1171,6 +1805,9 @@ class ChangePasswordView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            # 인증 캐시의 사용자 객체일 수 있으므로 최신 값으로 비교/저장
+            request.user.refresh_from_db()
+
             # 현재 비밀번호 확인
             if not request.user.check_password(current_password):
                 return Response(
@@ -1319,6 +1956,10 @@ class StudentPlacementView(viewsets.ViewSet):
 
     permission_classes = [permissions.IsAuthenticated]  # 인증된 사용자만 접근 가능
 
+    @with_conditional_get(
+        DataVersion.USERS, DataVersion.SUBJECTS, DataVersion.STUDENT_PLACEMENTS
+    )
+    @with_single_flight("student_placement_list")
     def list(self, request):
         try:
             logger.info("[api/views.py] StudentPlacementView.list 시작")
@@ -1394,6 +2035,7 @@ class StudentPlacementView(viewsets.ViewSet):
             )
 
     @action(detail=False, methods=["post"])
+    @with_idempotency(action="student_placement_update")
     def update_placements(self, request):
         try:
             logger.info("[api/views.py] update_placements 시작")
@@ -1433,11 +2075,230 @@ class StudentPlacementView(viewsets.ViewSet):
             )
 
 
+class WaitingRoomView(APIView):
+    """
+    예약 오픈 대기열 티켓 API
+    POST: 티켓 발급 (이미 있으면 기존 티켓 반환)
+    GET: 내 티켓 상태 조회 (예약 페이지에서 폴링)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if not WaitingRoom.is_enabled():
+            return Response({"status": "disabled"})
+
+        ticket = WaitingRoom.issue_ticket(request.user)
+        return self._status_response(WaitingRoom.get_status(ticket))
+
+    def get(self, request):
+        if not WaitingRoom.is_enabled():
+            return Response({"status": "disabled"})
+
+        ticket = (
+            request.user.waiting_room_tickets.filter(
+                status__in=WaitingRoom.LIVE_STATUSES
+            )
+            .order_by("id")
+            .first()
+        )
+        if ticket is None:
+            return Response(
+                {"status": "none", "message": "발급된 대기열 티켓이 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return self._status_response(WaitingRoom.get_status(ticket))
+
+    def _status_response(self, ticket_status):
+        response = Response(ticket_status)
+        if "retry_after" in ticket_status:
+            response["Retry-After"] = str(ticket_status["retry_after"])
+        return response
+
+
+class ReservationLotteryView(APIView):
+    """
+    추첨 예약 결과 조회 API
+    GET: 최신 추첨 회차 상태와 사용자의 희망별 배정 결과
+         (?user_id= 로 다른 사용자 조회는 강사/관리자만 가능, 학생은 본인 결과만 조회)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        lottery = ReservationLottery.objects.order_by("-opens_at").first()
+        if lottery is None:
+            return Response(
+                {"status": "none", "message": "진행된 추첨 예약이 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        user = request.user
+        user_id = user.id
+        if user.is_teacher or user.is_staff or user.is_superuser:
+            user_id = request.query_params.get("user_id") or user.id
+        preferences = lottery.preferences.filter(user_id=user_id).select_related(
+            "clinic", "clinic__clinic_subject"
+        )
+
+        return Response(
+            {
+                "lottery_id": lottery.id,
+                "status": lottery.status,
+                "opens_at": lottery.opens_at,
+                "closes_at": lottery.closes_at,
+                "allocated_at": lottery.allocated_at,
+                "preferences": [
+                    {
+                        "rank": pref.rank,
+                        "status": pref.status,
+                        "clinic_info": {
+                            "id": pref.clinic.id,
+                            "day": pref.clinic.get_clinic_day_display(),
+                            "time": pref.clinic.clinic_time,
+                            "room": pref.clinic.clinic_room,
+                            "subject": pref.clinic.clinic_subject.subject,
+                        },
+                    }
+                    for pref in preferences
+                ],
+            }
+        )
+
+
+class ClinicSeatStreamView(View):
+    """
+    클리닉 좌석 변경 SSE(Server-Sent Events) 스트림
+    GET: 연결 직후 전체 좌석(snapshot) 전송, 이후 변경된 클리닉만(seats) 전송
+
+    메시지 data: [{"clinic_id", "reserved_count", "capacity", "is_active"}, ...]
+    메시지 id: 주간 스케줄 버전
+
+    기본 비활성화(SEAT_STREAM_ENABLED) - 현재 배포(gunicorn sync worker)는 WSGI라
+    ASGI 서버(config/asgi.py)로 배포할 때만 켭니다. 꺼져 있으면 503, WSGI에서는 501을 반환하며
+    클라이언트는 기존 조회 방식으로 동작합니다.
+    인증: Authorization: Token 헤더 또는 세션 (URL에 토큰을 싣지 않음)
+    연결 중에도 keepalive마다 중복 로그인을 확인해, 다른 곳에서 로그인하면 session_expired 후 종료합니다.
+    """
+
+    async def get(self, request):
+        if not ClinicSeatBroadcaster.is_enabled():
+            return JsonResponse({"status": "disabled"}, status=503)
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"error": "좌석 스트림은 ASGI 서버에서만 제공됩니다."}, status=501
+            )
+
+        user, credentials, error = await self._authenticate(request)
+        if user is None:
+            return JsonResponse(error or {"error": "인증이 필요합니다."}, status=401)
+
+        started = await sync_to_async(
+            ClinicSeatBroadcaster.ensure_started, thread_sensitive=False
+        )()
+        if not started:
+            return JsonResponse(
+                {"error": "좌석 정보를 불러오지 못했습니다. 잠시 후 다시 시도해주세요."},
+                status=503,
+            )
+
+        response = StreamingHttpResponse(
+            self._event_stream(user.id, credentials), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # 프록시 버퍼링 방지
+        return response
+
+    async def _authenticate(self, request):
+        """
+        토큰 헤더 또는 세션으로 사용자 확인
+
+        Returns:
+            tuple: (사용자, (세션 키, 토큰 키), 실패 응답) - 실패 시 사용자는 None
+        """
+        auth_header = request.META.get("HTTP_AUTHORIZATION", "")
+        if auth_header.startswith("Token "):
+            token_key = auth_header[6:]
+            try:
+                # 토큰 → 사용자 → 중복 로그인(UserSession) 확인
+                user, _ = await sync_to_async(
+                    CachedTokenAuthentication().authenticate_credentials
+                )(token_key)
+            except exceptions.AuthenticationFailed as e:
+                detail = e.detail if isinstance(e.detail, dict) else None
+                return None, None, detail
+            return user, (None, token_key), None
+
+        # 세션 인증은 SingleSessionMiddleware가 중복 로그인을 이미 확인함
+        user = await request.auser()
+        if not user.is_authenticated:
+            return None, None, None
+        return user, (request.session.session_key, None), None
+
+    @staticmethod
+    def _is_current_session(user_id, credentials):
+        """연결에 사용한 세션/토큰이 아직 UserSession에 저장된 것인지 확인"""
+        stored_keys = SessionActivityTracker.get_session_keys(user_id)
+        if stored_keys is None:
+            return False  # 로그아웃/강제 로그아웃으로 세션 삭제
+        return all(
+            not current or not stored or current == stored
+            for current, stored in zip(credentials, stored_keys)
+        )
+
+    async def _event_stream(self, user_id, credentials):
+        config = ClinicSeatBroadcaster.get_config()
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=config["QUEUE_SIZE"])
+        version, seats = ClinicSeatBroadcaster.subscribe(loop, queue)
+        logger.info(f"[api/views.py] 좌석 스트림 연결: version={version}")
+        is_current = sync_to_async(self._is_current_session)
+
+        try:
+            yield "retry: 3000\n\n"
+            yield ClinicSeatBroadcaster.format_event("snapshot", version, seats)
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=config["HEARTBEAT_SECONDS"]
+                    )
+                except asyncio.TimeoutError:
+                    # 다른 곳에서 다시 로그인했거나 로그아웃한 연결은 종료
+                    if not await is_current(user_id, credentials):
+                        logger.info(
+                            f"[api/views.py] 좌석 스트림 세션 만료: user_id={user_id}"
+                        )
+                        yield "event: session_expired\ndata: {}\n\n"
+                        return
+                    yield ": keepalive\n\n"  # 프록시 유휴 연결 종료 방지
+                    continue
+
+                if event == ClinicSeatBroadcaster.RESYNC:
+                    version, seats = ClinicSeatBroadcaster.get_snapshot()
+                    yield ClinicSeatBroadcaster.format_event("snapshot", version, seats)
+                else:
+                    yield ClinicSeatBroadcaster.format_event(
+                        "seats", event["version"], event["seats"]
+                    )
+        finally:
+            ClinicSeatBroadcaster.unsubscribe(loop, queue)
+            logger.info("[api/views.py] 좌석 스트림 연결 종료")
+
+
 class TodayClinicView(APIView):
     """오늘의 클리닉 정보를 조회하는 뷰"""
 
     permission_classes = [permissions.IsAuthenticated]
 
+    @with_conditional_get(
+        DataVersion.CLINIC_SCHEDULE,
+        DataVersion.USERS,
+        DataVersion.SUBJECTS,
+        key_func=lambda request: datetime.now().date(),  # 날짜가 바뀌면 다른 요일
+    )
+    @with_single_flight("today_clinic")
     def get(self, request):
         """오늘의 요일에 맞는 클리닉 정보를 반환"""
         try:
@@ -1507,6 +2368,8 @@ class ClinicAttendanceViewSet(viewsets.ModelViewSet):
     queryset = ClinicAttendance.objects.all()
     serializer_class = ClinicAttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # (-expected_clinic_date, -created_at, -id) 커서 페이지네이션
+    pagination_class = ClinicAttendanceKeysetPagination
 
     def get_queryset(self):
         """필터링된 queryset 반환"""
@@ -1577,8 +2440,7 @@ class ClinicAttendanceViewSet(viewsets.ModelViewSet):
 
                     logger.info(
                         f"[api/views.py] 출석 데이터 조회 - 클리닉 ID: {clinic_id}, "
-                        f"오늘: {today}, 예상 클리닉 날짜: {expected_clinic_date}, "
-                        f"필터링된 데이터: {queryset.count()}건"
+                        f"오늘: {today}, 예상 클리닉 날짜: {expected_clinic_date}"
                     )
 
                 except Clinic.DoesNotExist:
@@ -1591,6 +2453,7 @@ class ClinicAttendanceViewSet(viewsets.ModelViewSet):
         return queryset.select_related("clinic", "student")
 
     @action(detail=True, methods=["patch"])
+    @with_idempotency(action="attendance_update")
     def update_attendance(self, request, pk=None):
         """
         출석 상태 업데이트 (attended/absent/sick/late)
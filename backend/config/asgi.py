@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+
+클리닉 좌석 변경 스트림(/api/clinics/stream/, SSE)은 ASGI 서버에서만 제공됩니다.
+예: gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+(uvicorn 설치 필요 - 기존 API는 WSGI(config.wsgi)로 그대로 서비스 가능)
+스트림은 기본 비활성화이며, ASGI로 배포할 때 SEAT_STREAM_ENABLED=True로 켭니다.
 """
 
 import os
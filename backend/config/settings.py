@@ -11,9 +11,11 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 from dotenv import load_dotenv
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -79,6 +81,7 @@ MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",  # 정적 파일 서빙 (프로덕션용)
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # CORS 미들웨어 (API 요청 허용)
+    "api.middleware.RateLimitMiddleware",  # URL별 요청 제한 (CORS 헤더는 429 응답에도 적용)
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -107,6 +110,13 @@ else:
 
 # CORS 추가 설정
 CORS_ALLOW_CREDENTIALS = True  # 쿠키와 인증 정보 허용
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")  # 예약 재시도용 헤더 허용
+CORS_EXPOSE_HEADERS = [
+    "Retry-After",
+    "Idempotent-Replayed",
+    "ETag",
+    "Last-Modified",
+]  # 프론트엔드에서 읽을 헤더
 
 # 메인 URL 설정
 ROOT_URLCONF = "config.urls"
@@ -190,6 +200,20 @@ except Exception as e:
         raise
 
 
+# 캐시 설정
+# REDIS_URL이 있으면 모든 gunicorn 워커가 공유하는 Redis 캐시 사용 (redis 패키지 필요)
+# 없으면 Django 기본값(LocMemCache, 프로세스별) - 토큰 인증 캐시/단일 비행 병합/캐시 카운터는
+# 공유 캐시일 때만 워커 간에 동작합니다 (core.utils.is_shared_cache)
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -244,13 +268,18 @@ AUTH_USER_MODEL = "core.User"
 REST_FRAMEWORK = {
     # 인증 클래스 설정 (토큰 인증, 세션 인증 지원)
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "api.authentication.CachedTokenAuthentication",  # 토큰 + 중복 로그인 확인 (캐시)
         "rest_framework.authentication.SessionAuthentication",
     ],
     # 기본 권한 설정 (인증된 사용자만 접근 가능)
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # 응답 렌더러 (orjson 기반 JSON, 개발용 브라우저블 API)
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     # 페이지네이션 설정
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 100,  # 기본 페이지 크기를 100으로 증가
@@ -258,9 +287,23 @@ REST_FRAMEWORK = {
     "MAX_PAGE_SIZE": 1000,  # 최대 페이지 크기 설정
 }
 
+# msgpack 패키지가 설치되어 있으면 Accept: application/msgpack 응답 지원
+if importlib.util.find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "api.renderers.MessagePackRenderer"
+    )
+
 # 세션 설정
 SESSION_COOKIE_AGE = 720000  # 100시간 (초 단위)
 SESSION_SAVE_EVERY_REQUEST = True  # 매 요청마다 세션 갱신
+# 변경이 없으면 만료가 임박했을 때만 DB에 저장하는 세션 엔진 (core/session_backend.py)
+SESSION_ENGINE = "core.session_backend"
+SESSION_WRITE = {
+    # 남은 유효 시간이 이 값(초)보다 적을 때 만료 연장 저장 - 기본: 1시간에 한 번
+    "REFRESH_THRESHOLD": int(
+        os.environ.get("SESSION_REFRESH_THRESHOLD", str(SESSION_COOKIE_AGE - 3600))
+    ),
+}
 
 # 프로덕션 보안 설정
 if not DEBUG:
@@ -443,3 +486,121 @@ SCHEDULER_CONFIG = {
 
 # APScheduler 데이터베이스 설정 (Django ORM 사용)
 SCHEDULER_AUTOSTART = True
+
+# 예약 오픈 대기열(Waiting Room) 설정
+# 주간 예약 오픈 시점에 예약 API로 들어오는 동시 요청 수를 티켓 순서대로 제한
+WAITING_ROOM = {
+    "ENABLED": os.environ.get("WAITING_ROOM_ENABLED", "False") == "True",
+    # 동시에 예약 화면에 입장할 수 있는 티켓 수
+    "MAX_ADMITTED": int(os.environ.get("WAITING_ROOM_MAX_ADMITTED", "30")),
+    # 입장 후 유효 시간 (초) - 지나면 다음 대기자에게 자리 양보
+    "ADMISSION_TTL": int(os.environ.get("WAITING_ROOM_ADMISSION_TTL", "180")),
+    # 대기 중 폴링이 이 시간(초) 이상 없으면 이탈로 간주하고 만료
+    "POLL_TIMEOUT": int(os.environ.get("WAITING_ROOM_POLL_TIMEOUT", "30")),
+    # 클라이언트 권장 폴링 간격 (초)
+    "POLL_INTERVAL": int(os.environ.get("WAITING_ROOM_POLL_INTERVAL", "3")),
+    # 만료 티켓 정리 최소 간격 (초) - 공유 캐시가 있으면 전체 워커 기준
+    "SWEEP_SECONDS": int(os.environ.get("WAITING_ROOM_SWEEP_SECONDS", "5")),
+    # 입장 상태 캐시 시간 (초) - 입장한 사용자의 조회 요청은 티켓 쿼리 없이 통과
+    "ADMISSION_CACHE_SECONDS": int(
+        os.environ.get("WAITING_ROOM_ADMISSION_CACHE_SECONDS", "10")
+    ),
+}
+
+# 추첨 예약(Lottery) 모드 설정
+# 활성화 시 주간 예약 오픈 후 WINDOW_SECONDS 동안의 예약 요청은 희망 순위로만 기록하고
+# 마감 후 배정 작업(allocate_reservation_lottery)에서 좌석을 일괄 배정
+RESERVATION_LOTTERY = {
+    "ENABLED": os.environ.get("RESERVATION_LOTTERY_ENABLED", "False") == "True",
+    # 희망 순위 접수 기간 (초)
+    "WINDOW_SECONDS": int(os.environ.get("RESERVATION_LOTTERY_WINDOW", "300")),
+}
+
+# 요청 제한(Rate limiting) 설정
+# STORE: "auto"(공유 캐시가 설정되어 있으면 cache, 아니면 database)
+#        / "database"(RateLimitCounter 테이블, 모든 워커 공유) / "cache"(공유 캐시 설정 시)
+# ROUTES: url_name별 (허용 요청 수, 윈도우 초) - 등록되지 않은 URL은 제한 없음
+RATE_LIMIT = {
+    "ENABLED": os.environ.get("RATE_LIMIT_ENABLED", "True") == "True",
+    "STORE": os.environ.get("RATE_LIMIT_STORE", "auto"),
+    "ROUTES": {
+        # 클리닉 예약 (쓰기) - 엄격하게
+        "clinic-reserve-clinic": (5, 60),
+        "clinic_reserve": (5, 60),
+        "clinic-reserve-clinics-batch": (5, 60),
+        "clinic_reserve_batch": (5, 60),
+        # 주간 스케줄 / 잔여석 / 대기열 / 추첨 결과 조회 (읽기) - 느슨하게
+        "clinic-weekly-schedule": (60, 60),
+        "clinic_weekly_schedule": (60, 60),
+        "clinic-availability": (60, 60),
+        "clinic_waiting_room": (60, 60),
+        "clinic_lottery": (30, 60),
+        # 좌석 스트림 (재연결 폭주 방지)
+        "clinic_seat_stream": (10, 60),
+    },
+}
+
+# 읽기 요청 병합(Single-flight) 설정
+# 주간 스케줄/오늘의 클리닉/학생 배치 조회에서 동시에 들어온 같은 요청은 한 번만 계산
+# 워커 간 병합은 CACHES가 공유 캐시(Redis 등)일 때만 동작
+SINGLE_FLIGHT = {
+    "ENABLED": os.environ.get("SINGLE_FLIGHT_ENABLED", "True") == "True",
+    # 팔로워가 리더 결과를 기다리는 최대 시간 (초) - 초과 시 직접 계산
+    "WAIT_SECONDS": float(os.environ.get("SINGLE_FLIGHT_WAIT", "5")),
+    # 워커 간 계산 락 유지 시간 (초) - 리더가 비정상 종료해도 이 시간 후 해제
+    "LOCK_SECONDS": int(os.environ.get("SINGLE_FLIGHT_LOCK", "10")),
+    # 다른 워커가 다시 계산하는 동안 직전 결과를 반환할 시간 (초) - 0이면 사용 안 함
+    "STALE_SECONDS": int(os.environ.get("SINGLE_FLIGHT_STALE", "0")),
+}
+
+# 클리닉 좌석 변경 스트림(SSE) 설정 - ASGI 서버에서만 동작
+# 프로세스당 감지 스레드 하나가 변경을 감지해 모든 연결에 전송 (PostgreSQL은 LISTEN/NOTIFY)
+# 현재 배포(railway.json)는 gunicorn sync worker(WSGI)라 기본 비활성화.
+# ASGI(gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker)로 배포할 때만
+# SEAT_STREAM_ENABLED=True로 켭니다.
+SEAT_STREAM = {
+    "ENABLED": os.environ.get("SEAT_STREAM_ENABLED", "False") == "True",
+    # PostgreSQL 외 DB에서 스케줄 버전 확인 간격 (초)
+    "POLL_INTERVAL": float(os.environ.get("SEAT_STREAM_POLL_INTERVAL", "1")),
+    # 유휴 연결 유지용 keepalive 주석 전송 간격 (초)
+    "HEARTBEAT_SECONDS": int(os.environ.get("SEAT_STREAM_HEARTBEAT", "15")),
+    # 연결별 대기 메시지 수 - 넘치면 전체 스냅샷으로 대체
+    "QUEUE_SIZE": int(os.environ.get("SEAT_STREAM_QUEUE_SIZE", "50")),
+}
+
+# 중복 로그인 체크(SingleSessionMiddleware) 설정
+SESSION_TRACKING = {
+    # 저장된 세션/토큰 키 캐시 시간 (초) - UserSession 변경 시 즉시 삭제
+    "CACHE_SECONDS": int(os.environ.get("SESSION_TRACKING_CACHE_SECONDS", "30")),
+    # 마지막 활동 시간 일괄 기록 간격 (초, 프로세스 단위)
+    "FLUSH_SECONDS": int(os.environ.get("SESSION_TRACKING_FLUSH_SECONDS", "60")),
+}
+
+# 로그인 이력/의심 활동 검사 백그라운드 기록 (core/audit.py)
+LOGIN_AUDIT = {
+    # False면 로그인 요청 안에서 바로 기록
+    "ASYNC": os.environ.get("LOGIN_AUDIT_ASYNC", "True") == "True",
+    # 기록 대기 큐 크기 - 가득 차면 요청 스레드에서 바로 기록
+    "QUEUE_SIZE": int(os.environ.get("LOGIN_AUDIT_QUEUE_SIZE", "1000")),
+    # bulk_create 한 번에 저장할 최대 건수 / 모으는 최대 시간 (초)
+    "BATCH_SIZE": int(os.environ.get("LOGIN_AUDIT_BATCH_SIZE", "200")),
+    "FLUSH_SECONDS": float(os.environ.get("LOGIN_AUDIT_FLUSH_SECONDS", "1")),
+}
+
+# 토큰 인증 결과 캐시 - 로그인/로그아웃/강제 로그아웃/사용자 저장·삭제 시 즉시 삭제
+# 삭제가 모든 워커에 반영되어야 하므로 "auto"는 공유 캐시(REDIS_URL)일 때만 사용
+TOKEN_AUTH = {
+    "CACHE": os.environ.get("TOKEN_AUTH_CACHE", "auto"),  # "auto" / "True" / "False"
+    "CACHE_SECONDS": int(os.environ.get("TOKEN_AUTH_CACHE_SECONDS", "30")),
+}
+
+# 주간 스케줄 변경 기록 보관 시간 (초)
+# weekly_schedule?since=<버전> 요청은 이 기간 안의 버전이면 바뀐 칸만, 더 오래되면 전체 스냅샷 응답
+SCHEDULE_CHANGE_RETENTION = int(os.environ.get("SCHEDULE_CHANGE_RETENTION", "86400"))
+
+# Idempotency-Key 응답 보관 시간 (초)
+# 같은 키로 재전송된 예약/출석/배치 요청에는 이 기간 동안 처음 응답을 그대로 반환
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", "86400"))
+# 처리 중(in_progress) 기록의 점유 시간 (초) - 지나면 워커 종료 등으로 중단된 요청으로 보고
+# 같은 키의 재시도가 기록을 이어받아 다시 실행 (gunicorn --timeout과 같은 값)
+IDEMPOTENCY_LEASE = int(os.environ.get("IDEMPOTENCY_LEASE", "120"))
@@ -11,9 +11,15 @@ from .models import (
     ClinicAttendance,  # 클리닉 출석 모델 추가
     LoginHistory,
     UserSession,
+    WaitingRoomTicket,
+    ReservationLottery,
+    ReservationPreference,
+    DataVersion,
 )
+from .utils import ClinicReservationOptimizer
 import datetime
 from django import forms
+from django.db import transaction
 
 User = get_user_model()
 
@@ -319,7 +325,10 @@ class CustomUserAdmin(UserAdmin):
         """
         선택된 사용자들의 활성화 상태를 True로 설정
         """
-        queryset.update(is_active=True)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 사용자 버전 증가
+        with transaction.atomic():
+            queryset.update(is_active=True)
+            DataVersion.bump(DataVersion.USERS)
         self.message_user(
             request, "선택된 사용자들의 활성화 상태가 True로 설정되었습니다."
         )
@@ -328,7 +337,10 @@ class CustomUserAdmin(UserAdmin):
         """
         선택된 사용자들의 활성화 상태를 False로 설정
         """
-        queryset.update(is_active=False)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 사용자 버전 증가
+        with transaction.atomic():
+            queryset.update(is_active=False)
+            DataVersion.bump(DataVersion.USERS)
         self.message_user(
             request, "선택된 사용자들의 활성화 상태가 False로 설정되었습니다."
         )
@@ -340,7 +352,10 @@ class CustomUserAdmin(UserAdmin):
         """
         선택된 학생 사용자들의 의무 클리닉 신청 상태를 True로 설정
         """
-        queryset.update(essential_clinic=True)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 사용자 버전 증가
+        with transaction.atomic():
+            queryset.update(essential_clinic=True)
+            DataVersion.bump(DataVersion.USERS)
         self.message_user(
             request,
             "선택된 학생 사용자들의 의무 클리닉 신청 상태가 True로 설정되었습니다.",
@@ -352,7 +367,10 @@ class CustomUserAdmin(UserAdmin):
         """
         선택된 학생 사용자들의 의무 클리닉 신청 상태를 False로 설정
         """
-        queryset.update(essential_clinic=False)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 사용자 버전 증가
+        with transaction.atomic():
+            queryset.update(essential_clinic=False)
+            DataVersion.bump(DataVersion.USERS)
         self.message_user(
             request,
             "선택된 학생 사용자들의 의무 클리닉 신청 상태가 False로 설정되었습니다.",
@@ -417,7 +435,10 @@ class CustomUserAdmin(UserAdmin):
             )
             return
 
-        count = student_users.update(no_show=0)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 사용자 버전 증가
+        with transaction.atomic():
+            count = student_users.update(no_show=0)
+            DataVersion.bump(DataVersion.USERS)
         self.message_user(
             request,
             f"{count}명의 학생 무단결석 횟수가 0으로 초기화되었습니다.",
@@ -579,6 +600,7 @@ class ClinicAdmin(admin.ModelAdmin):
         "clinic_room",
     )
     filter_horizontal = ("clinic_students",)
+    readonly_fields = ("reserved_count",)  # m2m_changed 시그널로만 관리
     actions = [
         "activate_clinics",
         "deactivate_clinics",
@@ -630,14 +652,20 @@ class ClinicAdmin(admin.ModelAdmin):
     # 클리닉 관리 액션들
     def activate_clinics(self, request, queryset):
         """선택한 클리닉들을 활성화"""
-        count = queryset.update(is_active=True)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 스케줄 버전 증가
+        with transaction.atomic():
+            count = queryset.update(is_active=True)
+            ClinicReservationOptimizer.invalidate_schedule_cache()
         self.message_user(request, f"{count}개의 클리닉이 활성화되었습니다.")
 
     activate_clinics.short_description = "선택한 클리닉 활성화"
 
     def deactivate_clinics(self, request, queryset):
         """선택한 클리닉들을 비활성화"""
-        count = queryset.update(is_active=False)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 스케줄 버전 증가
+        with transaction.atomic():
+            count = queryset.update(is_active=False)
+            ClinicReservationOptimizer.invalidate_schedule_cache()
         self.message_user(request, f"{count}개의 클리닉이 비활성화되었습니다.")
 
     deactivate_clinics.short_description = "선택한 클리닉 비활성화"
@@ -646,8 +674,8 @@ class ClinicAdmin(admin.ModelAdmin):
         """선택한 클리닉들의 학생 예약을 모두 초기화"""
         total_reset = 0
         for clinic in queryset:
-            student_count = clinic.clinic_students.count()
-            clinic.clinic_students.clear()
+            student_count = clinic.reserved_count
+            clinic.clinic_students.clear()  # m2m_changed 시그널로 reserved_count 동기화
             total_reset += student_count
 
         self.message_user(
@@ -1289,6 +1317,39 @@ class ClinicAttendanceAdmin(admin.ModelAdmin):
     export_attendance_csv.short_description = "선택한 출석 데이터를 CSV로 내보내기"
 
 
+# 예약 오픈 대기열 티켓 관리자 설정
+class WaitingRoomTicketAdmin(admin.ModelAdmin):
+    list_display = ("id", "get_user", "status", "created_at", "admitted_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("user__name", "user__username")
+    readonly_fields = ("created_at", "admitted_at", "last_seen_at")
+    list_select_related = ("user",)
+
+    def get_user(self, obj):
+        return obj.user.name
+
+    get_user.short_description = "학생"
+
+
+# 추첨 예약 관리자 설정
+class ReservationLotteryAdmin(admin.ModelAdmin):
+    list_display = ("id", "opens_at", "closes_at", "status", "allocated_at")
+    list_filter = ("status",)
+    readonly_fields = ("seed", "allocated_at", "created_at")
+
+
+class ReservationPreferenceAdmin(admin.ModelAdmin):
+    list_display = ("lottery", "get_user", "rank", "clinic", "status")
+    list_filter = ("lottery", "status")
+    search_fields = ("user__name", "user__username")
+    list_select_related = ("user", "clinic", "clinic__clinic_subject", "lottery")
+
+    def get_user(self, obj):
+        return obj.user.name
+
+    get_user.short_description = "학생"
+
+
 # 관리자 사이트에 모델 등록
 admin.site.register(User, CustomUserAdmin)
 # admin.site.register(Student, StudentAdmin)  # Student 모델 삭제로 주석처리
@@ -1299,6 +1360,9 @@ admin.site.register(WeeklyReservationPeriod, WeeklyReservationPeriodAdmin)
 admin.site.register(LoginHistory, LoginHistoryAdmin)
 admin.site.register(UserSession, UserSessionAdmin)
 admin.site.register(ClinicAttendance, ClinicAttendanceAdmin)
+admin.site.register(WaitingRoomTicket, WaitingRoomTicketAdmin)
+admin.site.register(ReservationLottery, ReservationLotteryAdmin)
+admin.site.register(ReservationPreference, ReservationPreferenceAdmin)
 
 # 보충 시스템 개편으로 Time, Comment 모델 제거
 # admin.site.register(Time, TimeAdmin)
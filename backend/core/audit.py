@@ -0,0 +1,377 @@
+"""
+로그인 감사(이력/보안 검사) 백그라운드 기록
+
+로그인 요청에서는 세션/토큰 무효화만 동기로 처리하고, 로그인 이력(LoginHistory) 저장과
+의심 활동 검사/보안 이벤트 로깅은 프로세스 내 기록 스레드가 모아서 처리합니다.
+로그아웃 시각 기록도 같은 큐로 처리해 대기 중인 로그인 이력이 먼저 저장됩니다.
+의심 활동 검사는 사용자별 LoginProfile(알려진 기기/최근 IP)을 배치 단위로 조회/갱신합니다.
+
+- 큐는 settings.LOGIN_AUDIT["QUEUE_SIZE"]로 크기가 제한되며, 가득 차면 요청 스레드에서
+  바로 기록합니다 (감사 기록은 버리지 않음)
+- 기록 스레드는 BATCH_SIZE개 또는 FLUSH_SECONDS초마다 bulk_create 한 번으로 저장
+- ASYNC=False(테스트 등)면 요청 스레드에서 바로 기록
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger("api.auth")
+
+
+class LoginAuditWriter:
+    """로그인 이력/보안 검사 백그라운드 기록기 (프로세스당 스레드 1개)"""
+
+    # ClientInfoExtractor.extract_client_info() 결과 중 LoginHistory에 저장하는 필드
+    CLIENT_FIELDS = (
+        "ip_address",
+        "forwarded_ip",
+        "user_agent",
+        "device_type",
+        "browser_name",
+        "os_name",
+        "country",
+        "city",
+        "isp",
+    )
+
+    _queue = None
+    _thread = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_config(cls):
+        config = getattr(settings, "LOGIN_AUDIT", {})
+        return {
+            "ASYNC": config.get("ASYNC", True),
+            "QUEUE_SIZE": config.get("QUEUE_SIZE", 1000),
+            "BATCH_SIZE": config.get("BATCH_SIZE", 200),
+            "FLUSH_SECONDS": config.get("FLUSH_SECONDS", 1.0),
+        }
+
+    @classmethod
+    def record_login(
+        cls, user, client_info, check_suspicious=True, **history_fields
+    ):
+        """
+        로그인 성공 기록 요청
+
+        Args:
+            user: 로그인한 사용자
+            client_info: ClientInfoExtractor.extract_client_info() 결과
+            check_suspicious: 의심 활동 검사 여부 (superuser/테스트 사용자는 False)
+            history_fields: session_key, token_key, previous_session_terminated 등
+        """
+        cls.submit(
+            {
+                "user_id": user.id,
+                "username": user.username,
+                "client_info": client_info,
+                "check_suspicious": check_suspicious,
+                "history": {"login_success": True, **history_fields},
+                "login_at": timezone.now(),
+            }
+        )
+
+    @classmethod
+    def record_failed_login(cls, username, client_info, failure_reason):
+        """로그인 실패 기록 요청 (사용자 조회는 기록 스레드에서 일괄 처리)"""
+        cls.submit(
+            {
+                "user_id": None,
+                "username": username,
+                "client_info": client_info,
+                "check_suspicious": False,
+                "history": {"login_success": False, "failure_reason": failure_reason},
+                "login_at": timezone.now(),
+            }
+        )
+
+    @classmethod
+    def record_logout(cls, user, reason):
+        """
+        로그아웃 기록 요청 - 로그아웃 시각 이전의 마지막 로그인 이력을 닫음
+
+        로그인 이력과 같은 큐를 거치므로 기록 스레드가 아직 저장하지 않은(큐 대기 중이거나
+        처리 중인) 로그인 이력이 먼저 저장된 뒤 처리됩니다.
+        """
+        cls.submit(
+            {
+                "user_id": user.id,
+                "username": user.username,
+                "logout_reason": reason,
+                "logout_at": timezone.now(),
+            }
+        )
+
+    @classmethod
+    def submit(cls, event):
+        config = cls.get_config()
+        if not config["ASYNC"]:
+            cls.write_batch([event])
+            return
+
+        cls._ensure_thread(config)
+        try:
+            cls._queue.put_nowait(event)
+        except queue.Full:
+            logger.warning("[audit.py] 로그인 감사 큐가 가득 차 요청 스레드에서 기록합니다.")
+            cls.write_batch([event])
+
+    @classmethod
+    def flush(cls):
+        """대기 중인 기록을 현재 스레드에서 모두 저장 (프로세스 종료 시 등)"""
+        if cls._queue is None:
+            return
+        events = []
+        while True:
+            try:
+                events.append(cls._queue.get_nowait())
+            except queue.Empty:
+                break
+        cls.write_batch(events)
+
+    @classmethod
+    def _ensure_thread(cls, config):
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+        with cls._lock:
+            if cls._thread is not None and cls._thread.is_alive():
+                return
+            if cls._queue is None:
+                cls._queue = queue.Queue(maxsize=config["QUEUE_SIZE"])
+                atexit.register(cls.flush)
+            cls._thread = threading.Thread(
+                target=cls._run, name="login-audit-writer", daemon=True
+            )
+            cls._thread.start()
+            logger.info("[audit.py] 로그인 감사 기록 스레드 시작")
+
+    @classmethod
+    def _run(cls):
+        while True:
+            config = cls.get_config()
+            events = [cls._queue.get()]  # 첫 이벤트까지 대기
+
+            # 첫 이벤트 이후 FLUSH_SECONDS 동안 BATCH_SIZE까지 모아서 저장
+            deadline = time.monotonic() + config["FLUSH_SECONDS"]
+            while len(events) < config["BATCH_SIZE"]:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    events.append(cls._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            close_old_connections()
+            cls.write_batch(events)
+            close_old_connections()
+
+    @classmethod
+    def write_batch(cls, events):
+        """
+        이벤트 목록을 보안 검사 후 LoginHistory bulk_create 한 번으로 저장
+
+        의심 활동 검사에 쓰는 LoginProfile은 배치의 사용자별로 한 번에 잠가서 조회하고,
+        이벤트 순서대로 검사 → 반영한 뒤 한 번에 저장합니다.
+        로그아웃 이벤트는 로그인 이력을 모두 저장한 뒤 처리합니다.
+        """
+        logouts = [e for e in events if "logout_reason" in e]
+        events = [e for e in events if "logout_reason" not in e]
+        cls._write_logins(events)
+        cls._close_logins(logouts)
+
+    @classmethod
+    def _write_logins(cls, events):
+        if not events:
+            return
+
+        from .models import LoginHistory, User
+        from .utils import LoginSecurityUtils
+
+        try:
+            # 로그인 실패 이벤트의 사용자를 한 번에 조회
+            usernames = {e["username"] for e in events if e["user_id"] is None}
+            users_by_name = (
+                {u.username: u for u in User.objects.filter(username__in=usernames)}
+                if usernames
+                else {}
+            )
+            user_ids = {e["user_id"] for e in events if e["check_suspicious"]}
+            users_by_id = User.objects.in_bulk(user_ids) if user_ids else {}
+
+            attempts = []  # (LoginHistory, 의심 활동 검사 여부)
+            for event in events:
+                client_info = event["client_info"]
+                history = event["history"]
+                user_id = event["user_id"]
+
+                if not history["login_success"]:
+                    user = users_by_name.get(event["username"])
+                    if user is None:
+                        # LoginHistory.user는 필수 값이므로 로그로만 남김
+                        logger.info(
+                            f"🔍 존재하지 않는 사용자명으로 로그인 시도: {event['username']}"
+                        )
+                        continue
+                    user_id = user.id
+                    LoginSecurityUtils.log_security_event(
+                        user, "LOGIN_FAILED", client_info, history["failure_reason"]
+                    )
+
+                row = LoginHistory(
+                    user_id=user_id,
+                    login_at=event["login_at"],
+                    **{field: client_info[field] for field in cls.CLIENT_FIELDS},
+                    **history,
+                )
+                attempts.append((row, event["check_suspicious"]))
+
+            cls._update_profiles(attempts, users_by_id)
+            cls._save_rows([row for row, _ in attempts])
+        except Exception as e:
+            logger.error(f"❌ 로그인 이력 기록 오류: {len(events)}건 | 오류: {str(e)}")
+
+    @classmethod
+    def _close_logins(cls, logouts):
+        """
+        로그아웃 시각 이전의 마지막 열린 로그인 이력에 로그아웃 시각/사유 기록
+
+        로그아웃 뒤 같은 배치에서 저장된 새 로그인 이력은 login_at이 더 늦어 닫히지 않습니다.
+        """
+        from .models import LoginHistory
+
+        for event in logouts:
+            try:
+                recent_login = (
+                    LoginHistory.objects.filter(
+                        user_id=event["user_id"],
+                        login_success=True,
+                        logout_at__isnull=True,
+                        login_at__lte=event["logout_at"],
+                    )
+                    .order_by("-login_at")
+                    .first()
+                )
+                if recent_login is None:
+                    logger.warning(
+                        f"⚠️ 로그아웃할 로그인 이력을 찾을 수 없음: {event['username']}"
+                    )
+                    continue
+
+                recent_login.logout_at = event["logout_at"]
+                recent_login.logout_reason = event["logout_reason"]
+                recent_login.save(update_fields=["logout_at", "logout_reason"])
+                logger.info(
+                    f"[audit.py] 로그아웃 이력 기록: {event['username']} | "
+                    f"사유: {event['logout_reason']} | 세션시간: {recent_login.session_duration}"
+                )
+            except Exception as e:
+                logger.error(
+                    f"❌ 로그아웃 이력 기록 오류: {event['username']} | 오류: {str(e)}"
+                )
+
+    @classmethod
+    def _update_profiles(cls, attempts, users_by_id):
+        """로그인 프로필 검사/갱신 (로그인 시도 순서대로 처리)"""
+        from .models import LoginProfile
+
+        if not attempts:
+            return
+
+        try:
+            with transaction.atomic():
+                user_ids = {row.user_id for row, _ in attempts}
+                profiles = {
+                    p.user_id: p
+                    for p in LoginProfile.objects.select_for_update().filter(
+                        user_id__in=user_ids
+                    )
+                }
+                new_profiles = {}
+                for user_id in user_ids - profiles.keys():
+                    new_profiles[user_id] = profiles[user_id] = LoginProfile(
+                        user_id=user_id
+                    )
+
+                now = timezone.now()
+                for row, check_suspicious in attempts:
+                    profile = profiles[row.user_id]
+                    client_info = {
+                        field: getattr(row, field) for field in cls.CLIENT_FIELDS
+                    }
+                    user = users_by_id.get(row.user_id)
+                    if row.login_success and check_suspicious and user is not None:
+                        cls._check_suspicious(user, client_info, profile)
+                    profile.record_attempt(client_info, row.login_at, row.login_success)
+                    profile.updated_at = now  # bulk_update는 auto_now를 갱신하지 않음
+
+                existing = [
+                    p for user_id, p in profiles.items() if user_id not in new_profiles
+                ]
+                if existing:
+                    LoginProfile.objects.bulk_update(
+                        existing, ["known_devices", "recent_ips", "updated_at"]
+                    )
+                if new_profiles:
+                    # 다른 프로세스가 먼저 만든 경우는 건너뜀 (다음 로그인부터 반영)
+                    LoginProfile.objects.bulk_create(
+                        new_profiles.values(), ignore_conflicts=True
+                    )
+        except Exception as e:
+            # 프로필 갱신 실패로 로그인 이력 저장까지 막지 않음
+            logger.error(
+                f"❌ 로그인 프로필 갱신 오류: {len(attempts)}건 | 오류: {str(e)}"
+            )
+
+    @classmethod
+    def _save_rows(cls, rows):
+        """bulk_create 실패 시(잘못된 IP 값 등) 한 건씩 저장해 나머지 이력은 보존"""
+        from .models import LoginHistory
+
+        if not rows:
+            return
+        try:
+            with transaction.atomic():
+                LoginHistory.objects.bulk_create(rows)
+            logger.debug(f"[audit.py] 로그인 이력 {len(rows)}건 기록")
+            return
+        except Exception as e:
+            logger.warning(f"[audit.py] 로그인 이력 일괄 저장 실패, 개별 저장: {str(e)}")
+
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    row.save()
+            except Exception as e:
+                logger.error(
+                    f"❌ 로그인 이력 기록 오류: user_id={row.user_id} | 오류: {str(e)}"
+                )
+
+    @classmethod
+    def _check_suspicious(cls, user, client_info, profile):
+        """의심 활동 검사 및 보안 이벤트 로깅"""
+        from .utils import LoginSecurityUtils
+
+        indicators = LoginSecurityUtils.is_suspicious_activity(
+            user, client_info, profile
+        )
+        if not indicators:
+            return
+
+        LoginSecurityUtils.log_security_event(
+            user,
+            "SUSPICIOUS_LOGIN",
+            client_info,
+            f"의심 지표: {', '.join(indicators)}",
+        )
+        logger.warning(
+            f"⚠️ 의심스러운 로그인: {user.username} | 지표: {', '.join(indicators)}"
+        )
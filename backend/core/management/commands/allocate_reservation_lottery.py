@@ -0,0 +1,61 @@
+"""
+추첨 예약 회차를 열거나, 접수 마감된 회차의 좌석을 일괄 배정하는 관리 명령어
+스케줄러가 1분마다 실행하며, 수동 실행도 가능합니다.
+"""
+
+from django.core.management.base import BaseCommand
+from core.utils import ReservationLotteryManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    접수 마감(closes_at)이 지난 추첨 회차를 찾아 배정하는 command
+
+    Usage:
+        python manage.py allocate_reservation_lottery
+        python manage.py allocate_reservation_lottery --open
+    """
+
+    help = "접수 마감된 추첨 예약 회차의 좌석을 일괄 배정합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--open",
+            action="store_true",
+            help="지금부터 WINDOW_SECONDS 동안 접수하는 새 추첨 회차를 엽니다",
+        )
+
+    def handle(self, *args, **options):
+        if options["open"]:
+            lottery = ReservationLotteryManager.open_lottery()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ 추첨 회차 {lottery.id}번을 열었습니다. (마감: {lottery.closes_at})"
+                )
+            )
+            return
+
+        try:
+            results = ReservationLotteryManager.allocate_due_lotteries()
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"❌ 추첨 배정 중 오류가 발생했습니다: {str(e)}")
+            )
+            logger.error(f"[allocate_reservation_lottery] 오류 발생: {str(e)}")
+            raise
+
+        if not results:
+            self.stdout.write("배정할 추첨 회차가 없습니다.")
+            return
+
+        for result in results:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ 추첨 회차 {result['lottery_id']}번 배정 완료: "
+                    f"학생 {result['students']}명, 배정 {result['won']}건, "
+                    f"미배정 {result['lost']}건, 예약 불가 {result['blocked']}건"
+                )
+            )
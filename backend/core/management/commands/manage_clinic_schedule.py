@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from django.db import transaction
 from core.models import Clinic
+from core.utils import ClinicReservationOptimizer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -54,7 +56,10 @@ class Command(BaseCommand):
                 return
 
         # 모든 클리닉 활성화
-        updated_count = clinics.update(is_active=True)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 스케줄 버전 증가
+        with transaction.atomic():
+            updated_count = clinics.update(is_active=True)
+            ClinicReservationOptimizer.invalidate_schedule_cache()
 
         logger.info(f"클리닉 활성화 완료: {updated_count}개")
         self.stdout.write(
@@ -75,7 +80,10 @@ class Command(BaseCommand):
                 return
 
         # 모든 클리닉 비활성화
-        updated_count = clinics.update(is_active=False)
+        # queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 스케줄 버전 증가
+        with transaction.atomic():
+            updated_count = clinics.update(is_active=False)
+            ClinicReservationOptimizer.invalidate_schedule_cache()
 
         logger.info(f"클리닉 비활성화 완료: {updated_count}개")
         self.stdout.write(
@@ -87,7 +95,7 @@ class Command(BaseCommand):
         clinics = Clinic.objects.all()
 
         # 예약된 학생 수 계산
-        total_reservations = sum(clinic.clinic_students.count() for clinic in clinics)
+        total_reservations = sum(clinic.reserved_count for clinic in clinics)
 
         if not force and total_reservations > 0:
             confirm = input(
@@ -100,8 +108,8 @@ class Command(BaseCommand):
         # 모든 클리닉의 학생 예약 초기화
         reset_count = 0
         for clinic in clinics:
-            student_count = clinic.clinic_students.count()
-            clinic.clinic_students.clear()
+            student_count = clinic.reserved_count
+            clinic.clinic_students.clear()  # m2m_changed 시그널로 reserved_count 동기화
             reset_count += student_count
 
         logger.info(f"클리닉 학생 예약 초기화 완료: {reset_count}명")
@@ -0,0 +1,87 @@
+"""
+클리닉 좌석 카운터(reserved_count)를 실제 예약 인원과 맞추는 관리 명령어
+m2m_changed 시그널을 거치지 않은 직접 수정 등으로 생긴 불일치를 복구합니다.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from core.models import Clinic
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    reserved_count와 clinic_students 실제 인원을 비교하여 불일치를 복구하는 command
+
+    Usage:
+        python manage.py reconcile_clinic_seats
+        python manage.py reconcile_clinic_seats --dry-run
+    """
+
+    help = "클리닉 reserved_count를 실제 예약 인원(clinic_students)과 일치시킵니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="실제로 수정하지 않고 불일치 항목만 보여줍니다",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+
+        self.stdout.write(self.style.SUCCESS("=== 클리닉 좌석 카운터 점검 시작 ==="))
+
+        # 실제 예약 인원을 한 번의 쿼리로 집계
+        clinics = Clinic.objects.annotate(actual_count=Count("clinic_students")).order_by(
+            "id"
+        )
+
+        drifted_clinics = [
+            clinic for clinic in clinics if clinic.reserved_count != clinic.actual_count
+        ]
+
+        if not drifted_clinics:
+            self.stdout.write(
+                self.style.SUCCESS("✅ 모든 클리닉의 좌석 카운터가 정확합니다.")
+            )
+            return
+
+        self.stdout.write(f"📊 불일치 클리닉 {len(drifted_clinics)}개를 발견했습니다.")
+        for clinic in drifted_clinics:
+            self.stdout.write(
+                f"  - 클리닉 ID {clinic.id} ({clinic.get_clinic_day_display()} {clinic.clinic_time} {clinic.clinic_room}): "
+                f"reserved_count={clinic.reserved_count}, 실제={clinic.actual_count}"
+            )
+
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING("🔍 --dry-run 모드: 실제로 수정하지 않습니다.")
+            )
+            return
+
+        try:
+            with transaction.atomic():
+                # 집계 시점 이후 변경분까지 반영되도록 서브쿼리 UPDATE로 재계산
+                updated_count = Clinic.sync_reserved_counts(
+                    [clinic.id for clinic in drifted_clinics]
+                )
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ {updated_count}개 클리닉의 좌석 카운터를 복구했습니다."
+                )
+            )
+            logger.info(
+                f"[reconcile_clinic_seats] 좌석 카운터 복구 완료: {updated_count}개 클리닉"
+            )
+
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"❌ 좌석 카운터 복구 중 오류가 발생했습니다: {str(e)}")
+            )
+            logger.error(f"[reconcile_clinic_seats] 오류 발생: {str(e)}")
+            raise
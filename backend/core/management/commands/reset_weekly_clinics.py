@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Count
 from django.utils import timezone
-from core.models import Clinic, User
+from core.models import Clinic, User, WaitingRoomTicket
+from core.utils import ReservationLotteryManager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -69,8 +71,8 @@ class Command(BaseCommand):
             )
 
         try:
-            # 모든 클리닉 조회
-            clinics = Clinic.objects.all()
+            # 모든 클리닉 조회 (예약 학생 수는 reserved_count가 아닌 실제 중간 테이블 기준)
+            clinics = Clinic.objects.annotate(student_count=Count("clinic_students"))
             total_clinics = clinics.count()
             total_reset_students = 0
 
@@ -78,7 +80,7 @@ class Command(BaseCommand):
 
             # 각 클리닉의 예약 학생 수 계산 및 초기화
             for clinic in clinics:
-                student_count = clinic.clinic_students.count()
+                student_count = clinic.student_count
                 total_reset_students += student_count
 
                 # 예약된 학생이 있는 경우만 로그 출력
@@ -88,9 +90,10 @@ class Command(BaseCommand):
                         f"{student_count}명의 학생 예약 {'시뮬레이션' if options['dry_run'] else '초기화'}"
                     )
 
-                    # 실제 초기화 (dry-run이 아닌 경우)
-                    if not options["dry_run"]:
-                        clinic.clinic_students.clear()
+                # 실제 초기화 (dry-run이 아닌 경우) - 카운터와 관계없이 모든 클리닉 초기화
+                # clear()는 m2m_changed 시그널로 reserved_count도 0으로 동기화 (어긋난 카운터도 복구)
+                if not options["dry_run"]:
+                    clinic.clinic_students.clear()
 
             # === 학생들의 무단결석 횟수 감소 로직 ===
             students = User.objects.filter(is_student=True)
@@ -130,6 +133,26 @@ class Command(BaseCommand):
                             f"  [시뮬레이션] {student.name} ({student.username}): {old_no_show} → {new_no_show}"
                         )
 
+            # === 지난 주 대기열 티켓 정리 ===
+            # 새 예약 오픈은 빈 대기열에서 티켓 1번부터 줄을 세움
+            stale_tickets = WaitingRoomTicket.objects.all()
+            stale_ticket_count = stale_tickets.count()
+            self.stdout.write(
+                f"\n대기열 티켓 {stale_ticket_count}개 {'삭제 예정' if options['dry_run'] else '삭제'}"
+            )
+            if not options["dry_run"]:
+                stale_tickets.delete()
+
+            # === 추첨 예약 모드: 새 회차 접수 시작 ===
+            if ReservationLotteryManager.is_enabled():
+                if options["dry_run"]:
+                    self.stdout.write("\n[시뮬레이션] 추첨 예약 회차가 생성될 예정")
+                else:
+                    lottery = ReservationLotteryManager.open_lottery()
+                    self.stdout.write(
+                        f"\n추첨 예약 회차 {lottery.id}번 접수 시작 (마감: {lottery.closes_at})"
+                    )
+
             # 결과 요약
             if options["dry_run"]:
                 self.stdout.write(
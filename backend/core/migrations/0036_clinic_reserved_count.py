@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_reserved_count(apps, schema_editor):
+    """기존 clinic_students 데이터로 reserved_count 초기값 설정"""
+    Clinic = apps.get_model("core", "Clinic")
+
+    updated_count = 0
+    for clinic in Clinic.objects.annotate(student_count=Count("clinic_students")):
+        if clinic.reserved_count != clinic.student_count:
+            clinic.reserved_count = clinic.student_count
+            clinic.save(update_fields=["reserved_count"])
+            updated_count += 1
+
+    print(f"✅ {updated_count}개 클리닉의 reserved_count를 초기화했습니다.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0035_user_essential_clinic"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="clinic",
+            name="reserved_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="clinic_students 수를 저장한 좌석 카운터입니다. 예약 시 조건부 UPDATE로 증가합니다.",
+                verbose_name="예약 인원",
+            ),
+        ),
+        migrations.RunPython(populate_reserved_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_clinic_reserved_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitingRoomTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('waiting', '대기중'), ('admitted', '입장'), ('expired', '만료')], default='waiting', max_length=10, verbose_name='상태')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='발급 시간')),
+                ('admitted_at', models.DateTimeField(blank=True, null=True, verbose_name='입장 시간')),
+                ('last_seen_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='마지막 폴링 시간')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waiting_room_tickets', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '대기열 티켓',
+                'verbose_name_plural': '대기열 티켓',
+                'indexes': [models.Index(fields=['status', 'id'], name='core_waitin_status_c84b65_idx'), models.Index(fields=['user', 'status'], name='core_waitin_user_id_1a2f95_idx')],
+            },
+        ),
+    ]
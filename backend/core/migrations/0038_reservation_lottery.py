@@ -0,0 +1,50 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_waitingroomticket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationLottery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('opens_at', models.DateTimeField(verbose_name='신청 시작 시간')),
+                ('closes_at', models.DateTimeField(verbose_name='신청 마감 시간')),
+                ('status', models.CharField(choices=[('collecting', '신청 접수중'), ('allocating', '배정중'), ('allocated', '배정 완료')], default='collecting', max_length=10, verbose_name='상태')),
+                ('seed', models.BigIntegerField(default=0, help_text='배정 순서 셔플에 사용한 난수 시드 (결과 재현용)', verbose_name='추첨 시드')),
+                ('allocated_at', models.DateTimeField(blank=True, null=True, verbose_name='배정 완료 시간')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+            ],
+            options={
+                'verbose_name': '추첨 예약 회차',
+                'verbose_name_plural': '추첨 예약 회차',
+                'ordering': ['-opens_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReservationPreference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='희망 순위')),
+                ('status', models.CharField(choices=[('pending', '배정 대기'), ('won', '배정'), ('lost', '미배정'), ('blocked', '예약 불가')], default='pending', max_length=10, verbose_name='배정 결과')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='신청 시간')),
+                ('clinic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_preferences', to='core.clinic', verbose_name='클리닉')),
+                ('lottery', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='preferences', to='core.reservationlottery', verbose_name='추첨 회차')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_preferences', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '추첨 예약 희망',
+                'verbose_name_plural': '추첨 예약 희망',
+                'ordering': ['lottery', 'user', 'rank'],
+                'unique_together': {('lottery', 'user', 'clinic')},
+            },
+        ),
+    ]
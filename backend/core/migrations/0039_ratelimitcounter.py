@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_reservation_lottery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateLimitCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=150, verbose_name='제한 키')),
+                ('window_start', models.BigIntegerField(help_text='윈도우 시작 시각 (Unix timestamp, 초)', verbose_name='윈도우 시작')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='요청 수')),
+            ],
+            options={
+                'verbose_name': '요청 제한 카운터',
+                'verbose_name_plural': '요청 제한 카운터',
+                'indexes': [models.Index(fields=['window_start'], name='core_rateli_window__655a84_idx')],
+                'unique_together': {('key', 'window_start')},
+            },
+        ),
+    ]
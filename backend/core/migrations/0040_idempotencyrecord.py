@@ -0,0 +1,37 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:16
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_ratelimitcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, verbose_name='Idempotency-Key')),
+                ('action', models.CharField(max_length=50, verbose_name='요청 종류')),
+                ('request_hash', models.CharField(help_text='요청 본문 SHA-256', max_length=64, verbose_name='요청 해시')),
+                ('status', models.CharField(choices=[('in_progress', '처리중'), ('completed', '완료')], default='in_progress', max_length=12, verbose_name='상태')),
+                ('response_status', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='응답 코드')),
+                ('response_body', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='응답 본문')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+                ('expires_at', models.DateTimeField(verbose_name='만료 시간')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_records', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': 'Idempotency 기록',
+                'verbose_name_plural': 'Idempotency 기록',
+                'indexes': [models.Index(fields=['expires_at'], name='core_idempo_expires_9f124d_idx')],
+                'unique_together': {('user', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clinic',
+            index=models.Index(fields=['clinic_day', 'clinic_time', 'clinic_subject', 'is_active', 'reserved_count'], name='core_clinic_slot_load_idx'),
+        ),
+    ]
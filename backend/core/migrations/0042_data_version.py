@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:22
+
+from django.db import migrations, models
+
+
+def create_schedule_version(apps, schema_editor):
+    """주간 스케줄 버전 행 생성 (버전 증가 시 INSERT 경합 방지)"""
+    DataVersion = apps.get_model("core", "DataVersion")
+    DataVersion.objects.get_or_create(name="clinic_schedule")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_clinic_slot_load_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='이름')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='버전')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정 시간')),
+            ],
+            options={
+                'verbose_name': '데이터 버전',
+                'verbose_name_plural': '데이터 버전',
+            },
+        ),
+        migrations.RunPython(create_schedule_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+from django.db import migrations
+
+
+def create_data_versions(apps, schema_editor):
+    """조건부 GET(ETag)에 사용하는 데이터 버전 행 생성"""
+    DataVersion = apps.get_model("core", "DataVersion")
+    for name in ("subjects", "users", "student_placements"):
+        DataVersion.objects.get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0042_data_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_data_versions, migrations.RunPython.noop),
+    ]
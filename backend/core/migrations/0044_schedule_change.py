@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0043_data_version_rows'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(verbose_name='스케줄 버전')),
+                ('clinic_id', models.BigIntegerField(blank=True, help_text='비어 있으면 전체 스케줄 변경', null=True, verbose_name='클리닉 ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='기록 시간')),
+            ],
+            options={
+                'verbose_name': '스케줄 변경 기록',
+                'verbose_name_plural': '스케줄 변경 기록',
+                'indexes': [models.Index(fields=['version'], name='core_schedu_version_fb4567_idx'), models.Index(fields=['created_at'], name='core_schedu_created_589e67_idx')],
+            },
+        ),
+    ]
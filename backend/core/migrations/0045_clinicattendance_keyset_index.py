@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0044_schedule_change'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clinicattendance',
+            index=models.Index(fields=['-expected_clinic_date', '-created_at', '-id'], name='core_clinic_expecte_11b543_idx'),
+        ),
+    ]
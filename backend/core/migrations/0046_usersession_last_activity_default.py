@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0045_clinicattendance_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usersession',
+            name='last_activity',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='마지막 활동'),
+        ),
+    ]
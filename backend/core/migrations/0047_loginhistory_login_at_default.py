@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0046_usersession_last_activity_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loginhistory',
+            name='login_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='로그인 시간'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_known_devices(apps, schema_editor):
+    """기존 로그인 성공 이력의 기기/브라우저 조합으로 프로필 생성 (기존 사용자가 새 기기로 판정되지 않도록)"""
+    LoginHistory = apps.get_model("core", "LoginHistory")
+    LoginProfile = apps.get_model("core", "LoginProfile")
+
+    known_devices = {}
+    pairs = (
+        LoginHistory.objects.filter(login_success=True)
+        .values_list("user_id", "device_type", "browser_name")
+        .order_by()
+        .distinct()
+    )
+    for user_id, device_type, browser_name in pairs.iterator():
+        known_devices.setdefault(user_id, []).append(f"{device_type}|{browser_name}")
+
+    LoginProfile.objects.bulk_create(
+        [
+            LoginProfile(user_id=user_id, known_devices=devices)
+            for user_id, devices in known_devices.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0047_loginhistory_login_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('known_devices', models.JSONField(default=list, verbose_name='알려진 기기')),
+                ('recent_ips', models.JSONField(default=list, verbose_name='최근 로그인 IP')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정 시간')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='login_profile', to=settings.AUTH_USER_MODEL, verbose_name='사용자')),
+            ],
+            options={
+                'verbose_name': '로그인 프로필',
+                'verbose_name_plural': '로그인 프로필',
+            },
+        ),
+        migrations.RunPython(backfill_known_devices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0048_login_profile'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='waitingroomticket',
+            name='status',
+            field=models.CharField(choices=[('waiting', '대기중'), ('admitted', '입장'), ('expired', '만료'), ('released', '반납')], default='waiting', max_length=10, verbose_name='상태'),
+        ),
+    ]
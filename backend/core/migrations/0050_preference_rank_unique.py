@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-18 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0049_waiting_room_released'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='reservationpreference',
+            unique_together={('lottery', 'user', 'clinic'), ('lottery', 'user', 'rank')},
+        ),
+    ]
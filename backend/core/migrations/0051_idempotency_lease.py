@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0050_preference_rank_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencyrecord',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, help_text='처리 중 상태로 이 시간이 지나면 중단된 요청으로 보고 재시도가 이어받습니다.', null=True, verbose_name='처리 점유 만료 시간'),
+        ),
+    ]
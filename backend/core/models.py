@@ -4,11 +4,12 @@ User, Subject, Time, Clinic, Comment 등의 기본 모델을 포함하며,
 시스템 전체에서 사용되는 데이터 구조를 담당합니다.
 """
 
-from django.db import models
+from django.db import models, connection, transaction
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 from datetime import datetime, timedelta
 from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 class Subject(models.Model):
@@ -293,6 +294,11 @@ class Clinic(models.Model):
         max_length=10, choices=ROOM_CHOICES, default="1강의실", verbose_name="강의실"
     )  # 강의실
     clinic_capacity = models.IntegerField(default=6, verbose_name="정원")  # 정원
+    reserved_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="예약 인원",
+        help_text="clinic_students 수를 저장한 좌석 카운터입니다. 예약 시 조건부 UPDATE로 증가합니다.",
+    )  # 현재 예약 인원 (비정규화된 좌석 카운터)
     clinic_subject = models.ForeignKey(
         Subject,
         on_delete=models.CASCADE,
@@ -323,13 +329,52 @@ class Clinic(models.Model):
     class Meta:
         # 요일, 시간, 강의실은 고유해야 함 (중복 방지)
         unique_together = ("clinic_day", "clinic_time", "clinic_room")
+        indexes = [
+            # 같은 시간대/과목의 다른 강의실 중 가장 여유 있는 클리닉 조회용 (예약 자동 이월)
+            models.Index(
+                fields=[
+                    "clinic_day",
+                    "clinic_time",
+                    "clinic_subject",
+                    "is_active",
+                    "reserved_count",
+                ],
+                name="core_clinic_slot_load_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.clinic_subject} - {self.get_clinic_day_display()} {self.clinic_time} ({self.clinic_room})"
 
+    def save(self, *args, **kwargs):
+        """
+        기존 클리닉 저장 시 reserved_count는 쓰지 않음
+
+        관리자 수정/ClinicSerializer.update 등 전체 행 저장이 요청 시작 때 읽은 카운터를 다시 써서
+        그 사이 좌석 선점(reserved_count + 1)을 덮어쓰지 않도록 update_fields에서 제외합니다.
+        카운터는 claim_clinic_seat/sync_reserved_counts의 UPDATE로만 바뀝니다.
+        """
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            deferred = self.get_deferred_fields()  # only()로 읽지 않은 필드도 제외
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != "reserved_count"
+                and field.attname not in deferred
+            ]
+            super().save(*args, **kwargs)
+            self.refresh_from_db(fields=["reserved_count"])
+            return
+        super().save(*args, **kwargs)
+
     def get_current_students_count(self):
-        """현재 예약된 학생 수 반환"""
-        return self.clinic_students.count()
+        """현재 예약된 학생 수 반환 (저장된 reserved_count 컬럼 사용, COUNT 쿼리 없음)"""
+        return self.reserved_count
 
     def is_full(self):
         """정원이 찬 상태인지 확인"""
@@ -351,6 +396,73 @@ class Clinic(models.Model):
 
         return True
 
+    def get_expected_clinic_date(self, today=None):
+        """
+        예약 기준일(today)로부터 이번 주 또는 다음 주의 클리닉 날짜 계산
+        (클리닉 요일이 오늘 이후면 이번 주, 지났으면 다음 주)
+        """
+        clinic_day_map = {
+            "mon": 0,
+            "tue": 1,
+            "wed": 2,
+            "thu": 3,
+            "fri": 4,
+            "sat": 5,
+            "sun": 6,
+        }
+
+        clinic_weekday = clinic_day_map.get(self.clinic_day, 0)
+        today = today or datetime.now().date()
+        days_until_clinic = clinic_weekday - today.weekday()
+
+        if days_until_clinic < 0:
+            days_until_clinic += 7
+
+        return today + timedelta(days=days_until_clinic)
+
+    @classmethod
+    def sync_reserved_counts(cls, clinic_ids=None):
+        """
+        clinic_students 실제 인원으로 reserved_count 재계산
+
+        클리닉 행을 먼저 잠근(select_for_update) 뒤 서브쿼리 UPDATE로 처리하고
+        주간 스케줄 버전을 증가시킵니다. 잠금 없이 재계산하면 READ COMMITTED에서
+        서브쿼리 시점 이후 커밋된 좌석 선점(reserved_count + 1)을 절대값으로 덮어쓸 수 있습니다.
+        clinic_ids가 None이면 모든 클리닉을 재계산합니다.
+
+        Returns:
+            int: 업데이트된 클리닉 수
+        """
+        through_model = cls.clinic_students.through
+        student_count = (
+            through_model.objects.filter(clinic_id=models.OuterRef("pk"))
+            .order_by()
+            .values("clinic_id")
+            .annotate(count=models.Count("id"))
+            .values("count")
+        )
+
+        queryset = cls.objects.all()
+        if clinic_ids is not None:
+            queryset = queryset.filter(pk__in=clinic_ids)
+
+        with transaction.atomic():
+            # 진행 중인 좌석 선점이 커밋될 때까지 기다린 뒤, 새 스냅샷으로 재계산
+            # (id 순서로 잠가 일괄 예약의 잠금 순서와 맞춤)
+            locked_ids = list(
+                queryset.select_for_update()
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            updated = cls.objects.filter(pk__in=locked_ids).update(
+                reserved_count=models.functions.Coalesce(
+                    models.Subquery(student_count), models.Value(0)
+                )
+            )
+            # 예약 인원이 바뀌었으므로 같은 트랜잭션에서 주간 스케줄 버전 증가 + 변경 기록
+            ScheduleChange.log(clinic_ids)
+        return updated
+
 
 class ClinicAttendance(models.Model):
     """클리닉 출석 관리 모델"""
@@ -423,6 +535,8 @@ class ClinicAttendance(models.Model):
             models.Index(fields=["clinic", "-expected_clinic_date"]),
             models.Index(fields=["attendance_type"]),
             models.Index(fields=["expected_clinic_date"]),  # 클리닉 날짜별 조회용
+            # 출석 목록 커서 페이지네이션 정렬 순서
+            models.Index(fields=["-expected_clinic_date", "-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -610,7 +724,8 @@ class LoginHistory(models.Model):
     )
 
     # 타임스탬프
-    login_at = models.DateTimeField(auto_now_add=True, verbose_name="로그인 시간")
+    # 백그라운드 일괄 기록(core/audit.py) 시에도 실제 로그인 시각을 저장
+    login_at = models.DateTimeField(default=timezone.now, verbose_name="로그인 시간")
     logout_at = models.DateTimeField(
         null=True, blank=True, verbose_name="로그아웃 시간"
     )
@@ -648,6 +763,70 @@ class LoginHistory(models.Model):
         return f"{self.device_type} - {self.browser_name} on {self.os_name}"
 
 
+class LoginProfile(models.Model):
+    """
+    사용자별 로그인 프로필 - 의심 활동 검사용 요약 (LoginHistory 전체를 조회하지 않음)
+
+    로그인 시도마다 core/audit.py 기록 스레드가 조금씩 갱신합니다.
+    - known_devices: 로그인에 성공한 "기기유형|브라우저" 목록
+    - recent_ips: 최근 로그인 시도 IP별 마지막 시각 [[ip, ISO 시각], ...] (오래된 순, 최대 RECENT_IP_LIMIT개)
+    """
+
+    RECENT_IP_LIMIT = 10
+    KNOWN_DEVICE_LIMIT = 50
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="login_profile",
+        verbose_name="사용자",
+    )
+    known_devices = models.JSONField(default=list, verbose_name="알려진 기기")
+    recent_ips = models.JSONField(default=list, verbose_name="최근 로그인 IP")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정 시간")
+
+    class Meta:
+        verbose_name = "로그인 프로필"
+        verbose_name_plural = "로그인 프로필"
+
+    def __str__(self):
+        return f"{self.user.username} - 기기 {len(self.known_devices)}개"
+
+    @staticmethod
+    def get_device_key(device_type, browser_name):
+        """기기 지문 (LoginHistory의 device_type/browser_name 조합)"""
+        return f"{device_type}|{browser_name}"
+
+    def is_known_device(self, client_info):
+        """이전에 로그인에 성공한 기기/브라우저인지 확인"""
+        key = self.get_device_key(client_info["device_type"], client_info["browser_name"])
+        return key in self.known_devices
+
+    def count_recent_ips(self, since):
+        """since 이후 로그인을 시도한 서로 다른 IP 수"""
+        return sum(
+            1
+            for _, attempted_at in self.recent_ips
+            if datetime.fromisoformat(attempted_at) >= since
+        )
+
+    def record_attempt(self, client_info, attempted_at, success):
+        """로그인 시도 반영 (저장은 호출하는 쪽에서 처리)"""
+        ip = client_info["ip_address"]
+        self.recent_ips = [entry for entry in self.recent_ips if entry[0] != ip]
+        self.recent_ips.append([ip, attempted_at.isoformat()])
+        self.recent_ips = self.recent_ips[-self.RECENT_IP_LIMIT :]
+
+        if success:
+            key = self.get_device_key(
+                client_info["device_type"], client_info["browser_name"]
+            )
+            if key not in self.known_devices:
+                self.known_devices = (self.known_devices + [key])[
+                    -self.KNOWN_DEVICE_LIMIT :
+                ]
+
+
 class UserSession(models.Model):
     """사용자 세션 관리 모델 - 중복 로그인 방지용"""
 
@@ -678,7 +857,10 @@ class UserSession(models.Model):
     # 타임스탬프
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 시간")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="업데이트 시간")
-    last_activity = models.DateTimeField(auto_now=True, verbose_name="마지막 활동")
+    # 요청마다 저장하지 않고 SessionActivityTracker가 일정 간격으로 모아서 기록
+    last_activity = models.DateTimeField(
+        default=timezone.now, verbose_name="마지막 활동"
+    )
 
     class Meta:
         verbose_name = "사용자 세션"
@@ -701,3 +883,447 @@ class UserSession(models.Model):
         self.session_key = None
         self.token_key = None
         self.save()
+
+
+class WaitingRoomTicket(models.Model):
+    """예약 오픈 대기열 티켓 모델 - 선착순(FIFO) 입장 제어용"""
+
+    STATUS_CHOICES = (
+        ("waiting", "대기중"),  # 입장 대기
+        ("admitted", "입장"),  # 예약 화면 입장 허용
+        ("expired", "만료"),  # 폴링 중단 또는 입장 시간 초과
+        ("released", "반납"),  # 예약 완료 후 자리 반납
+    )
+
+    # 티켓 번호는 id(자동 증가 시퀀스)를 그대로 사용 - 발급 순서가 곧 입장 순서
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="waiting_room_tickets",
+        verbose_name="사용자",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default="waiting",
+        verbose_name="상태",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="발급 시간")
+    admitted_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="입장 시간"
+    )
+    last_seen_at = models.DateTimeField(
+        default=timezone.now, verbose_name="마지막 폴링 시간"
+    )
+
+    class Meta:
+        verbose_name = "대기열 티켓"
+        verbose_name_plural = "대기열 티켓"
+        indexes = [
+            models.Index(fields=["status", "id"]),  # 앞선 대기자 수 계산용
+            models.Index(fields=["user", "status"]),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.user.username} ({self.get_status_display()})"
+
+
+class ReservationLottery(models.Model):
+    """
+    추첨 방식 예약 회차 모델
+
+    예약 오픈 후 WINDOW_SECONDS 동안 들어온 예약 요청은 희망 순위(ReservationPreference)로만
+    기록하고, 마감 시점에 한 번의 배정 작업으로 좌석을 일괄 배정합니다.
+    """
+
+    STATUS_CHOICES = (
+        ("collecting", "신청 접수중"),  # 희망 순위 접수 기간
+        ("allocating", "배정중"),  # 배정 작업 실행 중
+        ("allocated", "배정 완료"),  # 결과 확정
+    )
+
+    opens_at = models.DateTimeField(verbose_name="신청 시작 시간")
+    closes_at = models.DateTimeField(verbose_name="신청 마감 시간")
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default="collecting",
+        verbose_name="상태",
+    )
+    seed = models.BigIntegerField(
+        default=0,
+        verbose_name="추첨 시드",
+        help_text="배정 순서 셔플에 사용한 난수 시드 (결과 재현용)",
+    )
+    allocated_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="배정 완료 시간"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 시간")
+
+    class Meta:
+        ordering = ["-opens_at"]
+        verbose_name = "추첨 예약 회차"
+        verbose_name_plural = "추첨 예약 회차"
+
+    def __str__(self):
+        return f"{self.opens_at:%Y-%m-%d %H:%M} 추첨 ({self.get_status_display()})"
+
+    @classmethod
+    def get_pending(cls):
+        """아직 배정이 끝나지 않은 최신 회차 반환 (없으면 None)"""
+        return (
+            cls.objects.filter(status__in=["collecting", "allocating"])
+            .order_by("-opens_at")
+            .first()
+        )
+
+    def is_collecting(self, now=None):
+        """현재 희망 순위를 접수 중인지 확인"""
+        now = now or timezone.now()
+        return self.status == "collecting" and self.opens_at <= now < self.closes_at
+
+
+class ReservationPreference(models.Model):
+    """추첨 예약 희망 순위 모델 - 학생별로 신청 순서대로 순위 부여"""
+
+    STATUS_CHOICES = (
+        ("pending", "배정 대기"),
+        ("won", "배정"),
+        ("lost", "미배정"),  # 정원 초과
+        ("blocked", "예약 불가"),  # 무단결석 2회 이상 또는 클리닉 비활성화
+    )
+
+    lottery = models.ForeignKey(
+        ReservationLottery,
+        on_delete=models.CASCADE,
+        related_name="preferences",
+        verbose_name="추첨 회차",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="reservation_preferences",
+        verbose_name="사용자",
+    )
+    clinic = models.ForeignKey(
+        Clinic,
+        on_delete=models.CASCADE,
+        related_name="reservation_preferences",
+        verbose_name="클리닉",
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name="희망 순위")
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default="pending",
+        verbose_name="배정 결과",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="신청 시간")
+
+    class Meta:
+        ordering = ["lottery", "user", "rank"]
+        verbose_name = "추첨 예약 희망"
+        verbose_name_plural = "추첨 예약 희망"
+        # 같은 사용자의 순위 중복은 DB에서 막고, 동시 신청 시 다음 순위로 재시도
+        unique_together = (("lottery", "user", "clinic"), ("lottery", "user", "rank"))
+
+    def __str__(self):
+        return f"{self.user.name} - {self.rank}순위 {self.clinic} ({self.get_status_display()})"
+
+
+class RateLimitCounter(models.Model):
+    """
+    요청 제한(Rate limiting) 카운터 모델
+
+    CACHES 설정이 없으면 캐시가 프로세스별 LocMemCache라 워커마다 따로 세어지므로,
+    모든 워커가 공유하는 DB 테이블에 고정 윈도우별 요청 수를 원자적으로 누적합니다.
+    """
+
+    key = models.CharField(max_length=150, verbose_name="제한 키")
+    window_start = models.BigIntegerField(
+        verbose_name="윈도우 시작", help_text="윈도우 시작 시각 (Unix timestamp, 초)"
+    )
+    count = models.PositiveIntegerField(default=0, verbose_name="요청 수")
+
+    class Meta:
+        verbose_name = "요청 제한 카운터"
+        verbose_name_plural = "요청 제한 카운터"
+        unique_together = ("key", "window_start")
+        indexes = [
+            models.Index(fields=["window_start"]),  # 만료 카운터 정리용
+        ]
+
+    def __str__(self):
+        return f"{self.key} @ {self.window_start}: {self.count}"
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Idempotency-Key 요청 기록 모델
+
+    같은 Idempotency-Key로 재전송된 쓰기 요청에는 처음 저장한 응답을 그대로 돌려주어
+    모바일 재시도가 예약 트랜잭션을 다시 실행하지 않도록 합니다.
+    """
+
+    STATUS_CHOICES = (
+        ("in_progress", "처리중"),
+        ("completed", "완료"),
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="idempotency_records",
+        verbose_name="사용자",
+    )
+    key = models.CharField(max_length=255, verbose_name="Idempotency-Key")
+    action = models.CharField(max_length=50, verbose_name="요청 종류")
+    request_hash = models.CharField(
+        max_length=64, verbose_name="요청 해시", help_text="요청 본문 SHA-256"
+    )
+    status = models.CharField(
+        max_length=12,
+        choices=STATUS_CHOICES,
+        default="in_progress",
+        verbose_name="상태",
+    )
+    response_status = models.PositiveSmallIntegerField(
+        null=True, blank=True, verbose_name="응답 코드"
+    )
+    response_body = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name="응답 본문"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 시간")
+    expires_at = models.DateTimeField(verbose_name="만료 시간")
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="처리 점유 만료 시간",
+        help_text="처리 중 상태로 이 시간이 지나면 중단된 요청으로 보고 재시도가 이어받습니다.",
+    )
+
+    class Meta:
+        verbose_name = "Idempotency 기록"
+        verbose_name_plural = "Idempotency 기록"
+        unique_together = ("user", "key")
+        indexes = [
+            models.Index(fields=["expires_at"]),  # 만료 기록 정리용
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.action}, {self.get_status_display()})"
+
+
+class DataVersion(models.Model):
+    """
+    데이터 버전 카운터 모델
+
+    캐시 키에 DB에 저장된 버전 번호를 포함시켜, 여러 워커/레플리카가 각자 캐시를 가지고 있어도
+    커밋된 변경 이후에는 이전 버전 스냅샷이 사용되지 않도록 합니다.
+    버전 증가는 데이터를 변경하는 트랜잭션 안에서 수행합니다.
+    """
+
+    NOTIFY_CHANNEL = "data_version"  # 버전 증가 알림 채널 (PostgreSQL LISTEN/NOTIFY)
+
+    CLINIC_SCHEDULE = "clinic_schedule"  # 주간 클리닉 스케줄 (클리닉/예약)
+    SUBJECTS = "subjects"  # 과목
+    USERS = "users"  # 사용자 (학생/강사 정보)
+    STUDENT_PLACEMENTS = "student_placements"  # 학생 배치
+
+    name = models.CharField(max_length=50, unique=True, verbose_name="이름")
+    version = models.PositiveBigIntegerField(default=0, verbose_name="버전")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정 시간")
+
+    class Meta:
+        verbose_name = "데이터 버전"
+        verbose_name_plural = "데이터 버전"
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+    @classmethod
+    def get_version(cls, name):
+        """현재 버전 조회 (행이 없으면 0)"""
+        return (
+            cls.objects.filter(name=name).values_list("version", flat=True).first() or 0
+        )
+
+    @classmethod
+    def get_stamps(cls, names):
+        """
+        여러 버전을 쿼리 한 번으로 조회
+
+        Returns:
+            dict: {name: (version, updated_at)} - 행이 없으면 (0, None)
+        """
+        stamps = {name: (0, None) for name in names}
+        for name, version, updated_at in cls.objects.filter(name__in=names).values_list(
+            "name", "version", "updated_at"
+        ):
+            stamps[name] = (version, updated_at)
+        return stamps
+
+    @classmethod
+    def bump(cls, name):
+        """
+        버전 1 증가 후 새 버전 반환 (UPDATE ... RETURNING 한 번)
+
+        현재 트랜잭션에 포함되므로 롤백되면 버전도 함께 되돌아갑니다.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET version = version + 1, updated_at = %s "
+                f"WHERE name = %s RETURNING version",
+                [connection.ops.adapt_datetimefield_value(timezone.now()), name],
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            # 버전 행이 없으면 만들고 다시 증가
+            cls.objects.get_or_create(name=name)
+            return cls.bump(name)
+
+        cls.notify(name)
+        return row[0]
+
+    @classmethod
+    def notify(cls, name):
+        """
+        PostgreSQL: 커밋 시점에 변경 알림 전송 (롤백되면 전송되지 않음)
+        좌석 변경 스트림(ClinicSeatBroadcaster)이 폴링 없이 LISTEN으로 받습니다.
+        """
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)", [cls.NOTIFY_CHANNEL, name]
+                )
+
+
+class ScheduleChange(models.Model):
+    """
+    주간 스케줄 변경 기록 (추가 전용)
+
+    스케줄 버전이 증가할 때마다 변경된 클리닉을 같은 트랜잭션에서 기록합니다.
+    weekly_schedule?since=<버전> 요청은 이 기록으로 바뀐 칸만 응답합니다.
+    clinic_id가 비어 있으면 전체 변경(클리닉 추가/수정/삭제, 활성화 등)으로 전체 스냅샷이 필요합니다.
+    SCHEDULE_CHANGE_RETENTION(초)이 지난 기록은 스케줄러가 삭제합니다.
+    """
+
+    version = models.PositiveBigIntegerField(verbose_name="스케줄 버전")
+    clinic_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="클리닉 ID",
+        help_text="비어 있으면 전체 스케줄 변경",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="기록 시간")
+
+    class Meta:
+        verbose_name = "스케줄 변경 기록"
+        verbose_name_plural = "스케줄 변경 기록"
+        indexes = [
+            models.Index(fields=["version"]),  # since 이후 변경 조회
+            models.Index(fields=["created_at"]),  # 보관 기간 지난 기록 정리
+        ]
+
+    def __str__(self):
+        return f"v{self.version}: {self.clinic_id or '전체'}"
+
+    @classmethod
+    def log(cls, clinic_ids=None):
+        """
+        스케줄 버전 증가 + 변경 기록 (호출하는 쪽의 트랜잭션 안에서 실행)
+
+        Args:
+            clinic_ids: 예약 인원이 바뀐 클리닉 ID 목록 (None이면 전체 변경)
+
+        Returns:
+            int: 새 스케줄 버전
+        """
+        if connection.vendor == "postgresql" and (clinic_ids is None or clinic_ids):
+            return cls._log_in_one_statement(clinic_ids)
+
+        version = DataVersion.bump(DataVersion.CLINIC_SCHEDULE)
+        if clinic_ids is None:
+            cls.objects.create(version=version, clinic_id=None)
+        else:
+            cls.objects.bulk_create(
+                [cls(version=version, clinic_id=clinic_id) for clinic_id in set(clinic_ids)]
+            )
+        return version
+
+    @classmethod
+    def _log_in_one_statement(cls, clinic_ids):
+        """
+        PostgreSQL: 버전 증가와 변경 기록을 한 문장(UPDATE ... RETURNING을 INSERT로 연결)으로 실행
+
+        스케줄 버전 행은 모든 좌석 선점이 함께 갱신하는 전역 행이므로,
+        알림을 먼저 보내고(커밋 시 전송) 이 문장을 트랜잭션의 마지막 문장으로 두어
+        버전 행 잠금을 커밋 직전 한 번의 왕복 동안만 잡습니다.
+
+        Returns:
+            int: 새 스케줄 버전
+        """
+        name = DataVersion.CLINIC_SCHEDULE
+        DataVersion.notify(name)
+
+        quote = connection.ops.quote_name
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        ids = [None] if clinic_ids is None else sorted(set(clinic_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH bumped AS ("
+                f"UPDATE {quote(DataVersion._meta.db_table)} "
+                f"SET version = version + 1, updated_at = %s "
+                f"WHERE name = %s RETURNING version) "
+                f"INSERT INTO {quote(cls._meta.db_table)} (version, clinic_id, created_at) "
+                f"SELECT bumped.version, changed.clinic_id, %s "
+                f"FROM bumped CROSS JOIN unnest(%s::bigint[]) AS changed(clinic_id) "
+                f"RETURNING version",
+                [now, name, now, ids],
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            # 버전 행이 없으면 만들고 다시 실행
+            DataVersion.objects.get_or_create(name=name)
+            return cls._log_in_one_statement(clinic_ids)
+        return row[0]
+
+    @classmethod
+    def get_changed_clinic_ids(cls, since):
+        """
+        since 버전 이후 변경된 클리닉 ID 조회
+
+        Returns:
+            set 또는 None: None이면 기록이 부족하거나 전체 변경이 있어 전체 스냅샷 필요
+        """
+        oldest = (
+            cls.objects.order_by("version").values_list("version", flat=True).first()
+        )
+        # since 다음 버전의 기록이 이미 정리되었으면 중간 변경을 알 수 없음
+        if oldest is None or oldest > since + 1:
+            return None
+
+        clinic_ids = set(
+            cls.objects.filter(version__gt=since).values_list("clinic_id", flat=True)
+        )
+        if None in clinic_ids:
+            return None
+        return clinic_ids
+
+    @classmethod
+    def purge_expired(cls, retention_seconds):
+        """보관 기간이 지난 기록 삭제 (같은 버전의 기록은 함께 삭제되도록 버전 기준)"""
+        cutoff = timezone.now() - timedelta(seconds=retention_seconds)
+        expired_version = (
+            cls.objects.filter(created_at__lt=cutoff)
+            .order_by("-version")
+            .values_list("version", flat=True)
+            .first()
+        )
+        if expired_version is None:
+            return 0
+        deleted_count, _ = cls.objects.filter(version__lte=expired_version).delete()
+        return deleted_count
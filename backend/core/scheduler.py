@@ -39,6 +39,33 @@ def reset_weekly_clinics_job():
         raise
 
 
+def allocate_reservation_lottery_job():
+    """
+    접수 마감된 추첨 예약 회차 배정 작업 (추첨 모드가 꺼져 있으면 아무것도 하지 않음)
+    """
+    try:
+        call_command("allocate_reservation_lottery")
+    except Exception as e:
+        logger.error(f"[Scheduler] 추첨 예약 배정 중 오류 발생: {str(e)}", exc_info=True)
+
+
+def purge_schedule_changes_job():
+    """
+    보관 기간(SCHEDULE_CHANGE_RETENTION)이 지난 주간 스케줄 변경 기록 삭제
+    """
+    try:
+        from django.conf import settings
+        from .models import ScheduleChange
+
+        deleted_count = ScheduleChange.purge_expired(
+            getattr(settings, "SCHEDULE_CHANGE_RETENTION", 86400)
+        )
+        if deleted_count:
+            logger.info(f"[Scheduler] 스케줄 변경 기록 {deleted_count}건을 정리했습니다")
+    except Exception as e:
+        logger.error(f"[Scheduler] 스케줄 변경 기록 정리 중 오류: {str(e)}")
+
+
 def delete_old_job_executions(max_age=604_800):
     """
     오래된 작업 실행 기록을 삭제합니다 (기본: 7일)
@@ -96,6 +123,26 @@ def start_scheduler():
         )
         print("[Scheduler] 주간 클리닉 예약 초기화 작업 추가 완료")
 
+        # 추첨 예약 배정 작업 추가 (1분마다 접수 마감된 회차 확인)
+        scheduler.add_job(
+            allocate_reservation_lottery_job,
+            trigger=CronTrigger(second=5, timezone="Asia/Seoul"),
+            id="allocate_reservation_lottery",
+            max_instances=1,
+            replace_existing=True,
+            name="추첨 예약 배정",
+        )
+
+        # 주간 스케줄 변경 기록 정리 작업 추가 (1시간마다)
+        scheduler.add_job(
+            purge_schedule_changes_job,
+            trigger=CronTrigger(minute=0, second=30, timezone="Asia/Seoul"),
+            id="purge_schedule_changes",
+            max_instances=1,
+            replace_existing=True,
+            name="스케줄 변경 기록 정리",
+        )
+
         # 작업 실행 기록 정리 작업 추가
         # 매일 02:00에 오래된 기록 삭제
         scheduler.add_job(
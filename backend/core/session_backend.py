@@ -0,0 +1,65 @@
+"""
+쓰기 생략 세션 엔진 (SESSION_ENGINE = "core.session_backend")
+
+SESSION_SAVE_EVERY_REQUEST = True 이면 Django DB 세션은 요청마다 django_session을 UPDATE합니다.
+이 엔진은 다음 경우에만 저장합니다.
+1. 세션 데이터가 바뀐 경우 (로그인, set_expiry 등 modified=True)
+2. 남은 유효 시간이 settings.SESSION_WRITE["REFRESH_THRESHOLD"] 초 미만인 경우 (만료 연장)
+
+쿠키는 SessionMiddleware가 요청마다 그대로 연장하므로, DB 만료 시각은 쿠키보다
+최대 (SESSION_COOKIE_AGE - REFRESH_THRESHOLD) 초 먼저 도래할 수 있습니다.
+
+중복 로그인 처리(core/signals.py)에서 이전 세션 행을 삭제하면 다음 요청의 load()가
+빈 세션을 반환하므로, 이 엔진이 삭제된 세션을 다시 저장하는 일은 없습니다.
+"""
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.utils import timezone
+
+
+class SessionStore(DBStore):
+    """변경이 없고 만료까지 여유가 있으면 저장(UPDATE)을 생략하는 DB 세션"""
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._stored_expire_date = None  # DB에 저장된 만료 시각 (load 시 기록)
+
+    def _get_session_from_db(self):
+        s = super()._get_session_from_db()
+        self._stored_expire_date = s.expire_date if s else None
+        return s
+
+    async def _aget_session_from_db(self):
+        s = await super()._aget_session_from_db()
+        self._stored_expire_date = s.expire_date if s else None
+        return s
+
+    def get_refresh_threshold(self):
+        """남은 유효 시간이 이 값(초)보다 적으면 만료 연장 저장"""
+        default = settings.SESSION_COOKIE_AGE - 3600
+        return getattr(settings, "SESSION_WRITE", {}).get(
+            "REFRESH_THRESHOLD", default
+        )
+
+    def needs_save(self):
+        """저장이 필요한지 판단 (데이터 변경 또는 만료 임박)"""
+        if self.modified or self.session_key is None:
+            return True
+
+        # 저장된 만료 시각을 알기 위해 세션 로드 (대부분 인증 단계에서 이미 로드됨)
+        self._get_session()
+        if self.session_key is None:
+            # 요청 처리 중 다른 곳(중복 로그인/강제 로그아웃)에서 삭제된 세션은 다시 만들지 않음
+            return False
+        if self._stored_expire_date is None:
+            return True
+
+        remaining = (self._stored_expire_date - timezone.now()).total_seconds()
+        return remaining < self.get_refresh_threshold()
+
+    def save(self, must_create=False):
+        if not must_create and not self.needs_save():
+            return
+        super().save(must_create=must_create)
+        self._stored_expire_date = self.get_expiry_date()
@@ -6,17 +6,36 @@
 2. 로그인 이력 기록 (IP, 기기 정보 등)
 3. 보안 이벤트 로깅
 4. 세션 관리
+
+또한 클리닉 예약 인원 변경(m2m_changed, 학생 삭제)을 감지하여 reserved_count를 동기화하고,
+클리닉 생성/수정/삭제 시 주간 스케줄 버전을, 과목/사용자/학생 배치 변경 시
+각 데이터 버전(조건부 GET의 ETag)을 증가시킵니다.
 """
 
 import logging
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.contrib.sessions.models import Session
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from rest_framework.authtoken.models import Token
 
-from .models import User, LoginHistory, UserSession
-from .utils import ClientInfoExtractor, LoginSecurityUtils
+from .audit import LoginAuditWriter
+from .models import (
+    User,
+    Clinic,
+    Subject,
+    StudentPlacement,
+    LoginHistory,
+    UserSession,
+    DataVersion,
+)
+from .utils import (
+    ClientInfoExtractor,
+    ClinicReservationOptimizer,
+    SessionActivityTracker,
+    TokenAuthCache,
+)
 
 logger = logging.getLogger("api.auth")
 
@@ -54,26 +73,18 @@ def user_logged_in_handler(sender, request, user, **kwargs):
                 client_info, user, f"로그인 ({log_suffix})"
             )
 
-            # 2. 로그인 이력만 기록 (세션 무효화 없이)
-            login_history = LoginHistory.objects.create(
-                user=user,
+            # 2. 로그인 이력만 기록 (세션 무효화 없이, 백그라운드 기록)
+            LoginAuditWriter.record_login(
+                user,
+                client_info,
+                check_suspicious=False,
                 session_key=request.session.session_key,
                 token_key=getattr(request, "_token_key", None),
-                login_success=True,
-                ip_address=client_info["ip_address"],
-                forwarded_ip=client_info["forwarded_ip"],
-                user_agent=client_info["user_agent"],
-                device_type=client_info["device_type"],
-                browser_name=client_info["browser_name"],
-                os_name=client_info["os_name"],
-                country=client_info["country"],
-                city=client_info["city"],
-                isp=client_info["isp"],
                 # 우회 사용자는 기존 세션 종료 없음
                 previous_session_terminated=False,
             )
 
-            logger.info(f"✅ {bypass_reason} 로그인 이력 기록 완료: {user.username}")
+            logger.info(f"✅ {bypass_reason} 로그인 이력 기록 요청: {user.username}")
             return  # 중복 로그인 방지 로직 건너뛰기
 
         # 일반 사용자 로그인 처리
@@ -81,17 +92,7 @@ def user_logged_in_handler(sender, request, user, **kwargs):
         client_info = ClientInfoExtractor.extract_client_info(request)
         ClientInfoExtractor.log_client_info(client_info, user, "로그인")
 
-        # 2. 보안 이벤트 검사
-        suspicious_indicators = LoginSecurityUtils.is_suspicious_activity(
-            user, client_info
-        )
-        if suspicious_indicators:
-            LoginSecurityUtils.log_security_event(
-                user,
-                "SUSPICIOUS_LOGIN",
-                client_info,
-                f"의심 지표: {', '.join(suspicious_indicators)}",
-            )
+        # 2. 보안 이벤트 검사는 로그인 이력 기록과 함께 백그라운드에서 처리 (4번)
 
         # 3. 기존 세션/토큰 정보 확인 및 무효화 (일반 사용자만)
         previous_session_info = {}
@@ -145,6 +146,7 @@ def user_logged_in_handler(sender, request, user, **kwargs):
             user_session.current_ip = client_info["ip_address"]
             user_session.current_user_agent = client_info["user_agent"]
             user_session.current_device_type = client_info["device_type"]
+            user_session.last_activity = timezone.now()
             user_session.save()
 
             logger.info(f"🔄 세션 정보 업데이트 완료: {user.username}")
@@ -162,21 +164,12 @@ def user_logged_in_handler(sender, request, user, **kwargs):
 
             logger.info(f"🆕 새 사용자 세션 생성: {user.username}")
 
-        # 4. 로그인 이력 기록
-        login_history = LoginHistory.objects.create(
-            user=user,
+        # 4. 로그인 이력 기록 + 의심 활동 검사 (백그라운드 일괄 기록)
+        LoginAuditWriter.record_login(
+            user,
+            client_info,
             session_key=request.session.session_key,
             token_key=getattr(request, "_token_key", None),
-            login_success=True,
-            ip_address=client_info["ip_address"],
-            forwarded_ip=client_info["forwarded_ip"],
-            user_agent=client_info["user_agent"],
-            device_type=client_info["device_type"],
-            browser_name=client_info["browser_name"],
-            os_name=client_info["os_name"],
-            country=client_info["country"],
-            city=client_info["city"],
-            isp=client_info["isp"],
             **previous_session_info,
         )
 
@@ -190,13 +183,6 @@ def user_logged_in_handler(sender, request, user, **kwargs):
             f"{' | 기존세션종료' if previous_session_info.get('previous_session_terminated') else ''}"
         )
 
-        # 보안 이벤트가 있는 경우 추가 로깅
-        if suspicious_indicators:
-            logger.warning(
-                f"⚠️ 의심스러운 로그인: {user.username} | "
-                f"지표: {', '.join(suspicious_indicators)}"
-            )
-
     except Exception as e:
         # 시그널 처리 실패 시에도 로그인은 정상 진행되도록 함
         logger.error(
@@ -251,32 +237,12 @@ def user_logged_out_handler(sender, request, user, **kwargs):
         except UserSession.DoesNotExist:
             logger.warning(f"⚠️ 로그아웃 시 UserSession 없음: {user.username}")
 
-        # 3. 로그아웃 이력 업데이트
-        # 최근 로그인 이력 중에서 로그아웃 시간이 기록되지 않은 것을 찾아 업데이트
-        recent_login = (
-            user.login_history.filter(logout_at__isnull=True, login_success=True)
-            .order_by("-login_at")
-            .first()
-        )
-
-        if recent_login:
-            recent_login.logout_at = timezone.now()
-            recent_login.logout_reason = "manual_logout"
-            recent_login.save()
-
-            # 세션 지속 시간 계산
-            session_duration = recent_login.session_duration
-            duration_str = (
-                f" | 세션시간: {session_duration}" if session_duration else ""
-            )
+        # 3. 로그아웃 이력 업데이트 (기록 스레드가 대기 중인 로그인 이력을 먼저 저장한 뒤 처리)
+        LoginAuditWriter.record_logout(user, "manual_logout")
 
-            logger.info(
-                f"✅ 로그아웃 완료: {user.username} | "
-                f"IP: {client_info['ip_address']}"
-                f"{duration_str}"
-            )
-        else:
-            logger.warning(f"⚠️ 로그아웃할 로그인 이력을 찾을 수 없음: {user.username}")
+        logger.info(
+            f"✅ 로그아웃 완료: {user.username} | IP: {client_info['ip_address']}"
+        )
 
     except Exception as e:
         logger.error(
@@ -303,34 +269,9 @@ def record_failed_login(request, username, failure_reason):
             client_info, None, f"로그인실패({failure_reason})"
         )
 
-        # 사용자 조회 (실패해도 이력은 기록)
-        user = None
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            logger.info(f"🔍 존재하지 않는 사용자명으로 로그인 시도: {username}")
-
-        # 로그인 실패 이력 기록
-        LoginHistory.objects.create(
-            user=user,  # 사용자가 없으면 None
-            login_success=False,
-            failure_reason=failure_reason,
-            ip_address=client_info["ip_address"],
-            forwarded_ip=client_info["forwarded_ip"],
-            user_agent=client_info["user_agent"],
-            device_type=client_info["device_type"],
-            browser_name=client_info["browser_name"],
-            os_name=client_info["os_name"],
-            country=client_info["country"],
-            city=client_info["city"],
-            isp=client_info["isp"],
-        )
-
-        # 보안 이벤트 로깅 (사용자가 존재하는 경우)
-        if user:
-            LoginSecurityUtils.log_security_event(
-                user, "LOGIN_FAILED", client_info, failure_reason
-            )
+        # 사용자 조회, 실패 이력 저장, 보안 이벤트 로깅은 백그라운드 일괄 기록
+        # (존재하지 않는 사용자명은 로그로만 남김)
+        LoginAuditWriter.record_failed_login(username, client_info, failure_reason)
 
     except Exception as e:
         logger.error(f"❌ 로그인 실패 기록 오류: {username} | 오류: {str(e)}")
@@ -363,6 +304,7 @@ def force_logout_user(user, reason="duplicate_login"):
 
             # 토큰 삭제
             if user_session.token_key:
+                TokenAuthCache.invalidate(user_session.token_key)
                 try:
                     old_token = Token.objects.get(key=user_session.token_key)
                     old_token.delete()
@@ -375,19 +317,155 @@ def force_logout_user(user, reason="duplicate_login"):
         except UserSession.DoesNotExist:
             pass
 
-        # 로그아웃 이력 업데이트
-        recent_login = (
-            user.login_history.filter(logout_at__isnull=True, login_success=True)
-            .order_by("-login_at")
-            .first()
-        )
-
-        if recent_login:
-            recent_login.logout_at = timezone.now()
-            recent_login.logout_reason = reason
-            recent_login.save()
+        # 로그아웃 이력 업데이트 (기록 스레드가 대기 중인 로그인 이력을 먼저 저장한 뒤 처리)
+        LoginAuditWriter.record_logout(user, reason)
 
         logger.info(f"✅ 강제 로그아웃 완료: {user.username}")
 
     except Exception as e:
         logger.error(f"❌ 강제 로그아웃 오류: {user.username} | 오류: {str(e)}")
+
+
+@receiver(m2m_changed, sender=Clinic.clinic_students.through)
+def clinic_students_changed_handler(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    clinic_students 변경 시 reserved_count 동기화
+
+    add/remove/clear/set(=remove+add) 모든 경로에서 호출됩니다.
+    (ClinicSerializer.update, 관리자 reset_clinic_students 액션, reset_weekly_clinics 명령 등)
+    좌석 선점(DatabaseOptimizer.claim_clinic_seat)은 중간 테이블에 직접 INSERT하므로
+    이 시그널을 거치지 않고 카운터를 직접 증가시킵니다.
+
+    reverse=True인 경우 instance는 User이고 pk_set은 클리닉 ID 목록입니다.
+    """
+    if reverse and action == "pre_clear":
+        # user.enrolled_clinics.clear()는 post_clear에 pk_set이 없으므로 미리 기록
+        instance._cleared_clinic_ids = list(
+            instance.enrolled_clinics.values_list("id", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        if action == "post_clear":
+            clinic_ids = getattr(instance, "_cleared_clinic_ids", [])
+        else:
+            clinic_ids = list(pk_set or [])
+    else:
+        if action != "post_clear" and not pk_set:
+            return  # 실제로 변경된 사용자가 없음
+        clinic_ids = [instance.pk]
+
+    if not clinic_ids:
+        return
+
+    try:
+        Clinic.sync_reserved_counts(clinic_ids)
+
+        # 메모리상의 인스턴스도 최신 값으로 갱신 (직렬화 시 사용)
+        if not reverse:
+            instance.reserved_count = (
+                Clinic.objects.filter(pk=instance.pk)
+                .values_list("reserved_count", flat=True)
+                .first()
+                or 0
+            )
+
+        logger.debug(
+            f"[signals.py] reserved_count 동기화: action={action}, clinic_ids={clinic_ids}"
+        )
+    except Exception as e:
+        logger.error(f"❌ reserved_count 동기화 오류: clinic_ids={clinic_ids} | 오류: {str(e)}")
+        raise
+
+
+@receiver(pre_delete, sender=User)
+def user_pre_delete_handler(sender, instance, **kwargs):
+    """
+    사용자 삭제 전 예약한 클리닉 ID와 토큰 키 기록
+
+    사용자 삭제 시 clinic_students 중간 테이블 행은 m2m_changed 없이 CASCADE로 삭제되므로
+    삭제 후(user_deleted_handler) 해당 클리닉의 reserved_count를 다시 계산합니다.
+    토큰도 post_delete 전에 CASCADE로 삭제되므로 캐시 삭제(user_changed_handler)용 키를 미리 읽어 둡니다.
+    """
+    instance._enrolled_clinic_ids = list(
+        instance.enrolled_clinics.values_list("id", flat=True)
+    )
+    instance._token_keys = list(
+        Token.objects.filter(user_id=instance.pk).values_list("key", flat=True)
+    )
+
+
+@receiver(post_delete, sender=User)
+def user_deleted_handler(sender, instance, **kwargs):
+    """삭제된 사용자가 예약했던 클리닉의 reserved_count 동기화 (삭제와 같은 트랜잭션)"""
+    clinic_ids = getattr(instance, "_enrolled_clinic_ids", None)
+    if not clinic_ids:
+        return
+
+    Clinic.sync_reserved_counts(clinic_ids)
+    logger.debug(
+        f"[signals.py] 사용자 삭제로 reserved_count 동기화: user_id={instance.pk}, "
+        f"clinic_ids={clinic_ids}"
+    )
+
+
+@receiver(post_save, sender=Clinic)
+@receiver(post_delete, sender=Clinic)
+def clinic_changed_handler(sender, instance, **kwargs):
+    """
+    클리닉 생성/수정/삭제 시 주간 스케줄 버전 증가
+
+    저장과 같은 트랜잭션에서 실행되므로 커밋 이후 이전 스케줄 캐시가 사용되지 않습니다.
+    queryset.update()는 시그널을 보내지 않으므로 호출하는 쪽에서 직접 무효화합니다.
+    """
+    ClinicReservationOptimizer.invalidate_schedule_cache()
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def subject_changed_handler(sender, instance, **kwargs):
+    """과목 생성/수정/삭제 시 과목 데이터 버전 증가"""
+    DataVersion.bump(DataVersion.SUBJECTS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed_handler(sender, instance, update_fields=None, **kwargs):
+    """
+    사용자 생성/수정/삭제 시 사용자 데이터 버전 증가
+
+    로그인 때마다 실행되는 last_login 갱신은 응답 데이터와 무관하므로 제외합니다.
+    """
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    DataVersion.bump(DataVersion.USERS)
+
+    # 토큰 인증 캐시에 보관된 사용자 객체(권한/비밀번호 등) 갱신
+    # 삭제 시에는 토큰이 이미 CASCADE로 지워졌으므로 pre_delete에서 읽어 둔 키 사용
+    token_keys = getattr(instance, "_token_keys", None)
+    if token_keys is None:
+        token_keys = Token.objects.filter(user_id=instance.pk).values_list(
+            "key", flat=True
+        )
+    TokenAuthCache.invalidate(*token_keys)
+
+
+@receiver(post_save, sender=StudentPlacement)
+@receiver(post_delete, sender=StudentPlacement)
+def student_placement_changed_handler(sender, instance, **kwargs):
+    """학생 배치 생성/수정/삭제 시 배치 데이터 버전 증가"""
+    DataVersion.bump(DataVersion.STUDENT_PLACEMENTS)
+
+
+@receiver(post_save, sender=UserSession)
+@receiver(post_delete, sender=UserSession)
+def user_session_changed_handler(sender, instance, **kwargs):
+    """
+    로그인/로그아웃/강제 로그아웃으로 세션 정보가 바뀌면 중복 로그인 체크 캐시 삭제
+
+    마지막 활동 시간 일괄 기록은 queryset.update()라 이 시그널을 거치지 않습니다.
+    """
+    SessionActivityTracker.invalidate(instance.user_id)
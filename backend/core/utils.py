@@ -5,17 +5,29 @@
 발생할 수 있는 경합 조건(race condition)을 방지하기 위한 유틸리티 함수들을 제공합니다.
 
 주요 기능:
-1. 클리닉 예약 락 관리
-2. 사용자별 요청 제한 (Rate limiting)
-3. 데이터베이스 연결 최적화
-4. 캐싱 메커니즘
+1. 사용자별 요청 제한 (Rate limiting)
+2. 데이터베이스 연결 최적화
+3. 캐싱 메커니즘
+4. 예약 오픈 대기열 (Waiting Room)
+5. 추첨 예약 배정 (Lottery)
+6. Idempotency-Key 재전송 처리
+7. 읽기 요청 병합 (Single-flight)
+8. 데이터 버전 기반 조건부 GET (ETag / Last-Modified)
+9. 좌석 변경 실시간 전송 (SSE fan-out)
+10. 중복 로그인 체크용 세션 조회 캐시 / 마지막 활동 시간 일괄 기록
 """
 
+import atexit
+import json
+import math
 import time
+import uuid
+import hashlib
 import logging
+import threading
 from functools import wraps
 from django.core.cache import cache
-from django.db import transaction
+from django.db import transaction, IntegrityError
 from django.http import JsonResponse
 from django.conf import settings
 from datetime import datetime, timedelta
@@ -24,62 +36,125 @@ from django.utils import timezone
 logger = logging.getLogger(__name__)
 
 
-class ReservationLockManager:
-    """클리닉 예약 락 관리자"""
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
 
-    LOCK_TIMEOUT = 30  # 락 타임아웃 (초)
-    LOCK_PREFIX = "clinic_reservation_lock"
 
-    @classmethod
-    def get_lock_key(cls, clinic_id):
-        """클리닉 ID에 대한 락 키 생성"""
-        return f"{cls.LOCK_PREFIX}:{clinic_id}"
+def is_shared_cache(alias="default"):
+    """
+    CACHES[alias]가 모든 gunicorn 워커가 공유하는 캐시(Redis/Memcached/DB 등)인지 확인
+    LocMemCache(CACHES 미설정 시 기본값)는 프로세스별이라 워커 간 상태를 공유하지 못합니다.
+    """
+    backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+    return backend not in LOCAL_CACHE_BACKENDS
+
+
+class CacheRateLimitStore:
+    """
+    캐시 기반 카운터 저장소 (cache.add + cache.incr로 원자적 증가)
+    Redis/Memcached 등 공유 캐시를 CACHES에 설정한 경우에만 워커 간 공유됩니다.
+    """
 
     @classmethod
-    def acquire_lock(cls, clinic_id, timeout=None):
-        """클리닉 예약 락 획득"""
-        if timeout is None:
-            timeout = cls.LOCK_TIMEOUT
+    def incr(cls, key, window_start, ttl):
+        counter_key = f"{key}:{window_start}"
+        cache.add(counter_key, 0, ttl)
+        try:
+            return cache.incr(counter_key)
+        except ValueError:
+            # add와 incr 사이에 만료된 경우
+            cache.add(counter_key, 1, ttl)
+            return 1
 
-        lock_key = cls.get_lock_key(clinic_id)
-        lock_value = f"{timezone.now().timestamp()}:{clinic_id}"
+    @classmethod
+    def get(cls, key, window_start):
+        return cache.get(f"{key}:{window_start}", 0)
 
-        # 락 획득 시도
-        acquired = cache.add(lock_key, lock_value, timeout)
+    @classmethod
+    def purge(cls, before):
+        # 캐시 항목은 TTL로 자동 만료
+        return 0
 
-        if acquired:
-            logger.info(f"[utils.py] 클리닉 {clinic_id} 락 획득 성공")
-        else:
-            logger.warning(f"[utils.py] 클리닉 {clinic_id} 락 획득 실패 - 이미 처리 중")
 
-        return acquired
+class DatabaseRateLimitStore:
+    """
+    DB 기반 카운터 저장소 (RateLimitCounter 테이블)
+    INSERT ... ON CONFLICT DO UPDATE ... RETURNING 한 문장으로 원자적으로 증가시키므로
+    모든 gunicorn 워커/레플리카가 같은 카운터를 공유합니다. (PostgreSQL, SQLite 3.35+)
+    """
 
     @classmethod
-    def release_lock(cls, clinic_id):
-        """클리닉 예약 락 해제"""
-        lock_key = cls.get_lock_key(clinic_id)
-        released = cache.delete(lock_key)
+    def incr(cls, key, window_start, ttl):
+        from django.db import connection
+        from .models import RateLimitCounter
+
+        table = connection.ops.quote_name(RateLimitCounter._meta.db_table)
+        key_column = connection.ops.quote_name("key")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({key_column}, window_start, count) "
+                f"VALUES (%s, %s, 1) "
+                f"ON CONFLICT ({key_column}, window_start) "
+                f"DO UPDATE SET count = {table}.count + 1 "
+                f"RETURNING count",
+                [key, window_start],
+            )
+            return cursor.fetchone()[0]
 
-        if released:
-            logger.info(f"[utils.py] 클리닉 {clinic_id} 락 해제 성공")
-        else:
-            logger.warning(f"[utils.py] 클리닉 {clinic_id} 락 해제 실패")
+    @classmethod
+    def get(cls, key, window_start):
+        from .models import RateLimitCounter
 
-        return released
+        count = (
+            RateLimitCounter.objects.filter(key=key, window_start=window_start)
+            .values_list("count", flat=True)
+            .first()
+        )
+        return count or 0
 
     @classmethod
-    def is_locked(cls, clinic_id):
-        """클리닉이 락되어 있는지 확인"""
-        lock_key = cls.get_lock_key(clinic_id)
-        return cache.get(lock_key) is not None
+    def purge(cls, before):
+        from .models import RateLimitCounter
+
+        deleted, _ = RateLimitCounter.objects.filter(window_start__lt=before).delete()
+        return deleted
 
 
 class RateLimiter:
-    """사용자별 요청 제한"""
+    """
+    사용자별 요청 제한 (슬라이딩 윈도우 카운터)
+
+    고정 윈도우 카운터 두 개(이전/현재)를 경과 비율로 가중 합산해 슬라이딩 윈도우를 근사합니다.
+        추정 요청 수 = 이전 윈도우 수 × (1 - 현재 윈도우 경과 비율) + 현재 윈도우 수
+    카운터 증가는 저장소에서 원자적으로 처리되며, 제한된 요청도 카운트되므로
+    재시도를 반복하는 클라이언트는 멈출 때까지 계속 제한됩니다.
+
+    저장소는 settings.RATE_LIMIT["STORE"]로 선택 ("auto" / "database" / "cache")
+    "auto"는 공유 캐시가 설정되어 있으면 cache, 아니면 database
+    """
 
     RATE_LIMIT_PREFIX = "rate_limit"
     DEFAULT_LIMIT = 10  # 기본 제한: 10회/분
     DEFAULT_WINDOW = 60  # 기본 윈도우: 60초
+    PURGE_INTERVAL = 300  # 만료 카운터 정리 간격 (초, 프로세스 단위)
+    COUNTER_RETENTION = 7200  # 카운터 보관 기간 (초) - 윈도우는 1시간 이하로 설정
+
+    STORES = {
+        "database": DatabaseRateLimitStore,
+        "cache": CacheRateLimitStore,
+    }
+
+    _last_purge = 0.0
+
+    @classmethod
+    def get_store(cls):
+        """설정된 카운터 저장소 반환"""
+        store_name = getattr(settings, "RATE_LIMIT", {}).get("STORE", "auto")
+        if store_name == "auto":
+            store_name = "cache" if is_shared_cache() else "database"
+        return cls.STORES[store_name]
 
     @classmethod
     def get_rate_limit_key(cls, user_id, action):
@@ -87,49 +162,115 @@ class RateLimiter:
         return f"{cls.RATE_LIMIT_PREFIX}:{action}:{user_id}"
 
     @classmethod
-    def is_rate_limited(cls, user_id, action, limit=None, window=None):
-        """사용자의 요청이 제한되었는지 확인"""
+    def hit(cls, identity, action, limit=None, window=None):
+        """
+        요청 1회 기록 후 제한 여부 판단
+
+        Returns:
+            tuple: (제한 여부, 남은 요청 수, Retry-After 초)
+        """
         if limit is None:
             limit = cls.DEFAULT_LIMIT
         if window is None:
             window = cls.DEFAULT_WINDOW
 
-        key = cls.get_rate_limit_key(user_id, action)
-        current_count = cache.get(key, 0)
+        store = cls.get_store()
+        key = cls.get_rate_limit_key(identity, action)
+        now = time.time()
+        window_start = int(now // window) * window
+
+        current_count = store.incr(key, window_start, window * 2)
+
+        # 지난 윈도우 카운트는 더 이상 바뀌지 않으므로 프로세스 캐시에 보관
+        previous_key = f"{key}:prev:{window_start}"
+        previous_count = cache.get(previous_key)
+        if previous_count is None:
+            previous_count = store.get(key, window_start - window)
+            cache.set(previous_key, previous_count, window)
+
+        elapsed = now - window_start
+        estimated = previous_count * (1 - elapsed / window) + current_count
+        remaining = max(0, int(limit - estimated))
 
-        if current_count >= limit:
-            logger.warning(
-                f"[utils.py] 사용자 {user_id}의 {action} 요청이 제한됨: {current_count}/{limit}"
+        cls._purge_expired(store, now)
+
+        if estimated <= limit:
+            return False, remaining, 0
+
+        # 추가 요청이 없다고 가정할 때 추정치가 limit 이하로 내려가는 시점까지 대기
+        if current_count <= limit and previous_count:
+            wait_until = window_start + window * (
+                1 - (limit - current_count) / previous_count
             )
-            return True
+        else:
+            wait_until = window_start + window + window * (1 - limit / current_count)
+        retry_after = max(1, math.ceil(wait_until - now))
 
-        # 요청 횟수 증가
-        cache.set(key, current_count + 1, window)
-        logger.debug(
-            f"[utils.py] 사용자 {user_id}의 {action} 요청 카운트: {current_count + 1}/{limit}"
+        logger.warning(
+            f"[utils.py] {identity}의 {action} 요청이 제한됨: "
+            f"{estimated:.1f}/{limit} (Retry-After {retry_after}초)"
         )
+        return True, remaining, retry_after
 
-        return False
+    @classmethod
+    def _purge_expired(cls, store, now):
+        """만료된 카운터 정리 (프로세스당 PURGE_INTERVAL 간격)"""
+        if now - cls._last_purge < cls.PURGE_INTERVAL:
+            return
+        cls._last_purge = now
+        try:
+            store.purge(int(now) - cls.COUNTER_RETENTION)
+        except Exception as e:
+            logger.debug(f"[utils.py] 요청 제한 카운터 정리 실패: {str(e)}")
+
+    @classmethod
+    def is_rate_limited(cls, user_id, action, limit=None, window=None):
+        """사용자의 요청이 제한되었는지 확인 (요청 1회 기록)"""
+        limited, _, _ = cls.hit(user_id, action, limit, window)
+        return limited
 
     @classmethod
-    def get_remaining_requests(cls, user_id, action, limit=None):
-        """남은 요청 가능 횟수 반환"""
+    def get_remaining_requests(cls, user_id, action, limit=None, window=None):
+        """남은 요청 가능 횟수 반환 (기록 없이 조회만)"""
         if limit is None:
             limit = cls.DEFAULT_LIMIT
+        if window is None:
+            window = cls.DEFAULT_WINDOW
 
+        store = cls.get_store()
         key = cls.get_rate_limit_key(user_id, action)
-        current_count = cache.get(key, 0)
-
-        return max(0, limit - current_count)
+        now = time.time()
+        window_start = int(now // window) * window
+        estimated = store.get(key, window_start - window) * (
+            1 - (now - window_start) / window
+        ) + store.get(key, window_start)
+
+        return max(0, int(limit - estimated))
+
+
+def rate_limited_response(remaining, window, retry_after):
+    """요청 제한 초과 응답 (429 + Retry-After 헤더)"""
+    response = JsonResponse(
+        {
+            "error": "rate_limited",
+            "message": f"요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요. (남은 요청: {remaining}회)",
+            "remaining_requests": remaining,
+            "window_seconds": window,
+            "retry_after": retry_after,
+        },
+        status=429,
+    )
+    response["Retry-After"] = str(retry_after)
+    return response
 
 
-def with_reservation_lock(timeout=30):
+def with_rate_limit(action, limit=10, window=60):
     """
-    클리닉 예약 락을 사용하는 데코레이터
+    요청 제한을 적용하는 데코레이터
 
     사용 예:
-    @with_reservation_lock(timeout=30)
-    def reserve_clinic_view(request, clinic_id):
+    @with_rate_limit(action='clinic_reservation', limit=5, window=60)
+    def reserve_clinic_view(request):
         # 클리닉 예약 로직
         pass
     """
@@ -137,118 +278,916 @@ def with_reservation_lock(timeout=30):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # request에서 clinic_id 추출 시도
-            clinic_id = None
-
-            # args에서 찾기
-            for arg in args[1:]:  # 첫 번째는 보통 request
-                if hasattr(arg, "data") and "clinic_id" in arg.data:
-                    clinic_id = arg.data["clinic_id"]
-                    break
-                elif isinstance(arg, dict) and "clinic_id" in arg:
-                    clinic_id = arg["clinic_id"]
-                    break
-
-            # kwargs에서 찾기
-            if clinic_id is None:
-                clinic_id = kwargs.get("clinic_id")
-
-            if clinic_id is None:
-                logger.error(
-                    "[utils.py] with_reservation_lock: clinic_id를 찾을 수 없음"
-                )
-                return func(*args, **kwargs)  # 락 없이 실행
+            # request에서 사용자 ID 추출 (뷰셋 메서드는 args[0]이 self)
+            request = _find_request(args)
+            if request is None or not request.user.is_authenticated:
+                return func(*args, **kwargs)  # 인증되지 않은 경우 제한 없이 실행
 
-            # 락 획득 시도
-            if not ReservationLockManager.acquire_lock(clinic_id, timeout):
-                return JsonResponse(
-                    {
-                        "error": "concurrent_access",
-                        "message": "현재 다른 사용자가 해당 클리닉을 예약 중입니다. 잠시 후 다시 시도해주세요.",
-                    },
-                    status=409,
-                )
+            user_id = request.user.id
 
-            try:
-                # 실제 함수 실행
-                result = func(*args, **kwargs)
-                return result
-            finally:
-                # 락 해제
-                ReservationLockManager.release_lock(clinic_id)
+            # Rate limit 확인
+            limited, remaining, retry_after = RateLimiter.hit(
+                user_id, action, limit, window
+            )
+            if limited:
+                return rate_limited_response(remaining, window, retry_after)
+
+            return func(*args, **kwargs)
 
         return wrapper
 
     return decorator
 
 
-def with_rate_limit(action, limit=10, window=60):
+def _find_request(args):
     """
-    요청 제한을 적용하는 데코레이터
+    데코레이터 인자에서 request 객체 찾기
+    (함수형 뷰는 args[0], 뷰셋 메서드는 args[0]이 self이므로 전체를 탐색)
+    """
+    for arg in args:
+        if hasattr(arg, "user") and hasattr(arg, "method"):
+            return arg
+    return None
+
+
+class WaitingRoom:
+    """
+    예약 오픈 대기열 (가상 대기실)
+
+    주간 예약 오픈 시점에 모든 학생이 동시에 예약 API를 호출하면
+    gunicorn 워커가 모두 DB 경합에 묶이게 되므로, 티켓 순서대로
+    MAX_ADMITTED 명까지만 예약 API에 입장시키고 나머지는 대기 응답(429)을 받습니다.
+
+    - 티켓 번호는 WaitingRoomTicket.id (DB 시퀀스라 워커가 여러 개여도 단조 증가)
+    - 입장 여부 = "나보다 앞선 살아있는 티켓 수 < MAX_ADMITTED"
+    - 입장 후 ADMISSION_TTL이 지나거나, 대기 중 POLL_TIMEOUT 동안 폴링이 없으면 만료
+    - 예약에 성공하면 티켓을 released로 바꿔 즉시 다음 대기자에게 자리를 넘김
+    - 입장한 사용자는 ADMISSION_CACHE_SECONDS 동안 캐시로 통과 (티켓 조회 쿼리 생략)
+    """
+
+    LIVE_STATUSES = ("waiting", "admitted")
+    ADMISSION_CACHE_KEY = "waiting_room:admitted:{user_id}"
+    SWEEP_LOCK_KEY = "waiting_room:sweep"
+
+    _last_sweep = 0.0
+
+    @classmethod
+    def get_config(cls):
+        """settings.WAITING_ROOM 조회 (기본값 포함)"""
+        config = {
+            "ENABLED": False,
+            "MAX_ADMITTED": 30,
+            "ADMISSION_TTL": 180,
+            "POLL_TIMEOUT": 30,
+            "POLL_INTERVAL": 3,
+            "SWEEP_SECONDS": 5,
+            "ADMISSION_CACHE_SECONDS": 10,
+        }
+        config.update(getattr(settings, "WAITING_ROOM", {}))
+        return config
+
+    @classmethod
+    def is_enabled(cls):
+        """대기열 사용 여부"""
+        return bool(cls.get_config()["ENABLED"])
+
+    @classmethod
+    def issue_ticket(cls, user):
+        """
+        대기열 티켓 발급 (이미 살아있는 티켓이 있으면 그대로 반환)
+        새로고침해도 순번이 뒤로 밀리지 않도록 기존 티켓을 재사용합니다.
+        """
+        from .models import WaitingRoomTicket
+
+        ticket = (
+            WaitingRoomTicket.objects.filter(
+                user=user, status__in=cls.LIVE_STATUSES
+            )
+            .order_by("id")
+            .first()
+        )
+        if ticket is not None:
+            if not cls._is_expired(ticket):
+                return ticket
+            WaitingRoomTicket.objects.filter(id=ticket.id).update(status="expired")
+
+        ticket = WaitingRoomTicket.objects.create(user=user)
+        logger.info(
+            f"[utils.py] 대기열 티켓 발급: ticket_id={ticket.id}, user={user.username}"
+        )
+        return ticket
+
+    @classmethod
+    def _is_expired(cls, ticket, now=None):
+        """티켓 만료 여부 (DB 반영 전 개별 판단용)"""
+        config = cls.get_config()
+        now = now or timezone.now()
+
+        if ticket.status == "admitted":
+            return ticket.admitted_at is not None and (
+                now - ticket.admitted_at
+            ) > timedelta(seconds=config["ADMISSION_TTL"])
+        if ticket.status == "waiting":
+            return (now - ticket.last_seen_at) > timedelta(
+                seconds=config["POLL_TIMEOUT"]
+            )
+        return True
+
+    @classmethod
+    def expire_stale_tickets(cls, force=False):
+        """
+        입장 시간 초과/폴링 이탈 티켓 만료 처리
+        폴링마다 실행하면 UPDATE가 몰리므로 SWEEP_SECONDS 간격으로 제한
+        (프로세스 내 시각 + cache.add 잠금 - 공유 캐시면 전체 워커 중 한 곳만 실행)
+        """
+        from .models import WaitingRoomTicket
+
+        config = cls.get_config()
+        interval = config["SWEEP_SECONDS"]
+
+        if not force:
+            now_ts = time.monotonic()
+            if now_ts - cls._last_sweep < interval:
+                return 0
+            cls._last_sweep = now_ts
+            if not cache.add(cls.SWEEP_LOCK_KEY, 1, timeout=interval):
+                return 0
+
+        now = timezone.now()
+
+        expired = WaitingRoomTicket.objects.filter(
+            status="admitted",
+            admitted_at__lt=now - timedelta(seconds=config["ADMISSION_TTL"]),
+        ).update(status="expired")
+        expired += WaitingRoomTicket.objects.filter(
+            status="waiting",
+            last_seen_at__lt=now - timedelta(seconds=config["POLL_TIMEOUT"]),
+        ).update(status="expired")
+
+        if expired:
+            logger.info(f"[utils.py] 대기열 티켓 {expired}개 만료 처리")
+        return expired
+
+    @classmethod
+    def get_status(cls, ticket):
+        """
+        티켓 상태 조회 및 입장 처리
+
+        Returns:
+            dict: ticket_id, status, position(앞선 대기자 수), retry_after(초)
+        """
+        from .models import WaitingRoomTicket
+
+        config = cls.get_config()
+        now = timezone.now()
+
+        if ticket.status in cls.LIVE_STATUSES and cls._is_expired(ticket, now):
+            WaitingRoomTicket.objects.filter(id=ticket.id).update(status="expired")
+            ticket.status = "expired"
+
+        if ticket.status == "waiting":
+            # 만료 처리는 대기자가 있을 때만 의미가 있으므로 입장한 사용자 경로에서는 생략
+            cls.expire_stale_tickets()
+            ahead = WaitingRoomTicket.objects.filter(
+                status__in=cls.LIVE_STATUSES, id__lt=ticket.id
+            ).count()
+
+            if ahead < config["MAX_ADMITTED"]:
+                # 조건부 UPDATE - 다른 워커가 먼저 만료시켰다면 입장하지 않음
+                admitted = WaitingRoomTicket.objects.filter(
+                    id=ticket.id, status="waiting"
+                ).update(status="admitted", admitted_at=now)
+                if admitted:
+                    ticket.status = "admitted"
+                    ticket.admitted_at = now
+                    logger.info(
+                        f"[utils.py] 대기열 입장: ticket_id={ticket.id}, user_id={ticket.user_id}"
+                    )
+            elif (now - ticket.last_seen_at).total_seconds() >= config[
+                "POLL_INTERVAL"
+            ]:
+                # 폴링 시각 갱신도 POLL_INTERVAL 단위로만 기록
+                WaitingRoomTicket.objects.filter(id=ticket.id).update(
+                    last_seen_at=now
+                )
+                ticket.last_seen_at = now
+
+            if ticket.status == "waiting":
+                return {
+                    "ticket_id": ticket.id,
+                    "status": "waiting",
+                    "position": ahead - config["MAX_ADMITTED"] + 1,
+                    "retry_after": config["POLL_INTERVAL"],
+                }
+
+        if ticket.status == "admitted":
+            remaining = config["ADMISSION_TTL"] - int(
+                (now - ticket.admitted_at).total_seconds()
+            )
+            cls._cache_admission(ticket.user_id, remaining)
+            return {
+                "ticket_id": ticket.id,
+                "status": "admitted",
+                "position": 0,
+                "expires_in": max(0, remaining),
+            }
+
+        return {"ticket_id": ticket.id, "status": ticket.status}
+
+    @classmethod
+    def _cache_admission(cls, user_id, remaining):
+        """입장 상태를 짧게 캐시 (남은 입장 시간을 넘지 않도록)"""
+        timeout = min(cls.get_config()["ADMISSION_CACHE_SECONDS"], remaining)
+        if timeout > 0:
+            cache.set(cls.ADMISSION_CACHE_KEY.format(user_id=user_id), 1, timeout)
+
+    @classmethod
+    def is_admitted_cached(cls, user):
+        """캐시된 입장 상태 확인 - 적중하면 티켓 조회 없이 통과"""
+        return bool(cache.get(cls.ADMISSION_CACHE_KEY.format(user_id=user.id)))
+
+    @classmethod
+    def release(cls, user):
+        """
+        예약 완료 후 입장 티켓 반납
+        ADMISSION_TTL을 기다리지 않고 다음 대기자가 바로 입장할 수 있게 합니다.
+        """
+        from .models import WaitingRoomTicket
+
+        cache.delete(cls.ADMISSION_CACHE_KEY.format(user_id=user.id))
+        released = WaitingRoomTicket.objects.filter(
+            user=user, status="admitted"
+        ).update(status="released")
+        if released:
+            logger.info(f"[utils.py] 대기열 티켓 반납: user={user.username}")
+        return released
+
+
+def with_waiting_room(func):
+    """
+    예약 오픈 대기열을 적용하는 데코레이터
+
+    입장하지 못한 학생은 429 응답과 티켓 정보(순번, Retry-After)를 받습니다.
+    관리자/강사는 대기열을 거치지 않습니다.
+    쓰기 요청(예약)이 2xx로 끝나면 입장 티켓을 반납합니다.
 
     사용 예:
-    @with_rate_limit(action='clinic_reservation', limit=5, window=60)
-    def reserve_clinic_view(request):
-        # 클리닉 예약 로직
+    @with_waiting_room
+    def reserve_clinic(self, request):
+        pass
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not WaitingRoom.is_enabled():
+            return func(*args, **kwargs)
+
+        request = _find_request(args)
+        if (
+            request is None
+            or not request.user.is_authenticated
+            or request.user.is_staff
+            or request.user.is_superuser
+        ):
+            return func(*args, **kwargs)
+
+        def admitted_call():
+            response = func(*args, **kwargs)
+            if request.method not in ("GET", "HEAD", "OPTIONS") and 200 <= getattr(
+                response, "status_code", 500
+            ) < 300:
+                WaitingRoom.release(request.user)
+            return response
+
+        if WaitingRoom.is_admitted_cached(request.user):
+            return admitted_call()
+
+        ticket = WaitingRoom.issue_ticket(request.user)
+        ticket_status = WaitingRoom.get_status(ticket)
+        if ticket_status["status"] == "admitted":
+            return admitted_call()
+
+        # 만료된 경우 새 티켓으로 다시 줄 세우기
+        if ticket_status["status"] != "waiting":
+            ticket = WaitingRoom.issue_ticket(request.user)
+            ticket_status = WaitingRoom.get_status(ticket)
+            if ticket_status["status"] == "admitted":
+                return admitted_call()
+
+        response = JsonResponse(
+            {
+                "error": "waiting_room",
+                "message": "접속자가 많아 대기 중입니다. 순서가 되면 자동으로 입장합니다.",
+                **ticket_status,
+            },
+            status=429,
+        )
+        response["Retry-After"] = str(ticket_status.get("retry_after", 1))
+        return response
+
+    return wrapper
+
+
+class IdempotencyManager:
+    """
+    Idempotency-Key 요청 기록 관리
+
+    (user, key)가 unique이므로 같은 키로 동시에 들어온 요청 중 하나만 실행되고,
+    나머지는 처리 중(409) 또는 저장된 응답 재전송을 받습니다.
+    처리 중 기록은 IDEMPOTENCY_LEASE 동안만 유효하며, 그 안에 완료되지 않으면
+    (워커 종료 등) 같은 키의 재시도가 기록을 이어받아 다시 실행합니다.
+    """
+
+    HEADER = "HTTP_IDEMPOTENCY_KEY"
+    MAX_KEY_LENGTH = 255
+    PURGE_INTERVAL = 600  # 만료 기록 정리 간격 (초, 프로세스 단위)
+
+    _last_purge = 0.0
+
+    @classmethod
+    def get_ttl(cls):
+        """응답 보관 시간 (초)"""
+        return getattr(settings, "IDEMPOTENCY_TTL", 86400)
+
+    @classmethod
+    def get_lease(cls):
+        """처리 중 기록 점유 시간 (초)"""
+        return getattr(settings, "IDEMPOTENCY_LEASE", 120)
+
+    @classmethod
+    def get_request_hash(cls, action, request):
+        """
+        요청 본문 해시 (같은 키로 다른 요청을 보내는 경우 감지용)
+        URL 경로는 제외 - 같은 액션의 별칭 URL(/clinics/reserve/ 등)로 재전송해도 같은 요청
+        """
+        import hashlib
+        import json
+
+        try:
+            body = json.dumps(request.data, sort_keys=True, default=str)
+        except Exception:
+            body = request.body.decode("utf-8", errors="replace")
+
+        payload = f"{action}:{body}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def begin(cls, user, key, action, request_hash):
+        """
+        요청 기록 시작
+
+        Returns:
+            tuple: (IdempotencyRecord, created) - created가 False면 기존 기록
+        """
+        from .models import IdempotencyRecord
+
+        now = timezone.now()
+        lease_expires_at = now + timedelta(seconds=cls.get_lease())
+
+        # 재전송 요청은 SELECT 한 번으로 처리
+        record = IdempotencyRecord.objects.filter(user=user, key=key).first()
+        if record is not None:
+            if record.expires_at > now:
+                if cls._is_abandoned(record, now) and (
+                    record.action == action and record.request_hash == request_hash
+                ):
+                    return cls._reclaim(record, lease_expires_at)
+                return record, False
+            # 만료된 같은 키 기록은 새 요청으로 취급
+            record.delete()
+
+        cls.purge_expired(now)
+
+        try:
+            with transaction.atomic():
+                record = IdempotencyRecord.objects.create(
+                    user=user,
+                    key=key,
+                    action=action,
+                    request_hash=request_hash,
+                    expires_at=now + timedelta(seconds=cls.get_ttl()),
+                    lease_expires_at=lease_expires_at,
+                )
+            return record, True
+        except IntegrityError:
+            return IdempotencyRecord.objects.get(user=user, key=key), False
+
+    @classmethod
+    def _is_abandoned(cls, record, now):
+        """점유 시간이 지난 처리 중 기록인지 확인 (점유 시간이 없는 기록은 생성 시각 기준)"""
+        if record.status != "in_progress":
+            return False
+        lease_expires_at = record.lease_expires_at or record.created_at + timedelta(
+            seconds=cls.get_lease()
+        )
+        return lease_expires_at <= now
+
+    @classmethod
+    def _reclaim(cls, record, lease_expires_at):
+        """
+        중단된 처리 중 기록 이어받기
+        조건부 UPDATE라 동시에 들어온 재시도 중 하나만 이어받고 나머지는 처리 중(409) 응답
+        """
+        from .models import IdempotencyRecord
+
+        reclaimed = IdempotencyRecord.objects.filter(
+            id=record.id,
+            status="in_progress",
+            lease_expires_at=record.lease_expires_at,
+        ).update(lease_expires_at=lease_expires_at)
+
+        if not reclaimed:
+            return IdempotencyRecord.objects.get(id=record.id), False
+
+        logger.warning(
+            f"[utils.py] 중단된 Idempotency 요청 재실행: action={record.action}, "
+            f"user_id={record.user_id}"
+        )
+        record.lease_expires_at = lease_expires_at
+        return record, True
+
+    @classmethod
+    def complete(cls, record, response_status, response_body):
+        """처리 결과 저장"""
+        from .models import IdempotencyRecord
+
+        IdempotencyRecord.objects.filter(id=record.id).update(
+            status="completed",
+            response_status=response_status,
+            response_body=response_body,
+        )
+
+    @classmethod
+    def discard(cls, record):
+        """재시도 가능한 결과(5xx, 429 등)는 기록을 지워 다음 요청이 다시 실행되도록 함"""
+        from .models import IdempotencyRecord
+
+        IdempotencyRecord.objects.filter(id=record.id).delete()
+
+    @classmethod
+    def purge_expired(cls, now):
+        """만료 기록 정리 (프로세스당 PURGE_INTERVAL 간격)"""
+        from .models import IdempotencyRecord
+
+        now_ts = time.monotonic()
+        if now_ts - cls._last_purge < cls.PURGE_INTERVAL:
+            return
+        cls._last_purge = now_ts
+        IdempotencyRecord.objects.filter(expires_at__lte=now).delete()
+
+
+def _get_response_body(response):
+    """DRF Response / JsonResponse 본문을 JSON 값으로 추출"""
+    import json
+
+    if hasattr(response, "data"):
+        return response.data
+    try:
+        return json.loads(response.content)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _is_replayable(response):
+    """저장해 두었다가 재전송해도 되는 최종 응답인지 확인"""
+    return response.status_code < 500 and response.status_code != 429
+
+
+def with_idempotency(action):
+    """
+    Idempotency-Key 헤더를 지원하는 데코레이터
+
+    - 헤더가 없으면 그대로 실행
+    - 처음 보는 키: 실행 후 응답을 IDEMPOTENCY_TTL 동안 저장
+    - 완료된 키: 저장된 응답을 그대로 반환 (Idempotent-Replayed: true)
+    - 처리 중인 키: 409 idempotency_in_progress
+    - 같은 키로 다른 요청 본문: 422 idempotency_key_reused
+
+    사용 예:
+    @with_idempotency(action="clinic_reservation")
+    def reserve_clinic(self, request):
         pass
     """
 
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # request에서 사용자 ID 추출
-            request = args[0] if args else None
-            if (
-                not request
-                or not hasattr(request, "user")
-                or not request.user.is_authenticated
-            ):
-                return func(*args, **kwargs)  # 인증되지 않은 경우 제한 없이 실행
+            from rest_framework.response import Response
 
-            user_id = request.user.id
+            request = _find_request(args)
+            key = request.META.get(IdempotencyManager.HEADER) if request else None
+            if not key or not request.user.is_authenticated:
+                return func(*args, **kwargs)
 
-            # Rate limit 확인
-            if RateLimiter.is_rate_limited(user_id, action, limit, window):
-                remaining = RateLimiter.get_remaining_requests(user_id, action, limit)
+            if len(key) > IdempotencyManager.MAX_KEY_LENGTH:
                 return JsonResponse(
                     {
-                        "error": "rate_limited",
-                        "message": f"요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요. (남은 요청: {remaining}회)",
-                        "remaining_requests": remaining,
-                        "window_seconds": window,
+                        "error": "invalid_idempotency_key",
+                        "message": "Idempotency-Key는 255자 이하여야 합니다.",
                     },
-                    status=429,
+                    status=400,
                 )
 
-            return func(*args, **kwargs)
+            request_hash = IdempotencyManager.get_request_hash(action, request)
+            record, created = IdempotencyManager.begin(
+                request.user, key, action, request_hash
+            )
+
+            if not created:
+                if record.request_hash != request_hash or record.action != action:
+                    return JsonResponse(
+                        {
+                            "error": "idempotency_key_reused",
+                            "message": "같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다.",
+                        },
+                        status=422,
+                    )
+
+                if record.status != "completed":
+                    response = JsonResponse(
+                        {
+                            "error": "idempotency_in_progress",
+                            "message": "같은 요청을 처리 중입니다. 잠시 후 다시 시도해주세요.",
+                        },
+                        status=409,
+                    )
+                    response["Retry-After"] = "1"
+                    return response
+
+                logger.info(
+                    f"[utils.py] Idempotency 응답 재전송: action={action}, user_id={request.user.id}"
+                )
+                response = Response(record.response_body, status=record.response_status)
+                response["Idempotent-Replayed"] = "true"
+                return response
+
+            try:
+                response = func(*args, **kwargs)
+            except Exception:
+                IdempotencyManager.discard(record)
+                raise
+
+            if _is_replayable(response):
+                IdempotencyManager.complete(
+                    record, response.status_code, _get_response_body(response)
+                )
+            else:
+                IdempotencyManager.discard(record)
+
+            return response
 
         return wrapper
 
     return decorator
 
 
+class ReservationLotteryManager:
+    """
+    추첨 예약 관리 도구
+
+    선착순 대신 접수 기간 동안 희망 순위만 기록하고, 마감 후 한 번에 배정합니다.
+    배정 순서: 의무 클리닉 대상자(non_pass) 우선 → 같은 그룹 내에서는 무작위
+    배정 라운드: 모든 학생의 1순위를 먼저 처리한 뒤 2순위, 3순위 ... 순서로 처리
+    """
+
+    @classmethod
+    def get_config(cls):
+        """settings.RESERVATION_LOTTERY 조회 (기본값 포함)"""
+        config = {"ENABLED": False, "WINDOW_SECONDS": 300}
+        config.update(getattr(settings, "RESERVATION_LOTTERY", {}))
+        return config
+
+    @classmethod
+    def is_enabled(cls):
+        """추첨 예약 모드 사용 여부"""
+        return bool(cls.get_config()["ENABLED"])
+
+    @classmethod
+    def open_lottery(cls, opens_at=None):
+        """새 추첨 회차 생성 (주간 예약 오픈 시 호출)"""
+        import random
+        from .models import ReservationLottery
+
+        opens_at = opens_at or timezone.now()
+        lottery = ReservationLottery.objects.create(
+            opens_at=opens_at,
+            closes_at=opens_at
+            + timedelta(seconds=cls.get_config()["WINDOW_SECONDS"]),
+            seed=random.SystemRandom().randint(1, 2**62),
+        )
+        logger.info(
+            f"[utils.py] 추첨 예약 회차 생성: lottery_id={lottery.id}, "
+            f"마감={lottery.closes_at}"
+        )
+        return lottery
+
+    RANK_RETRIES = 5  # 동시 신청으로 순위가 겹칠 때 재시도 횟수
+
+    @classmethod
+    def _next_rank(cls, lottery, user):
+        """사용자의 다음 희망 순위 (기존 최대 순위 + 1)"""
+        from django.db.models import Max
+        from .models import ReservationPreference
+
+        last_rank = ReservationPreference.objects.filter(
+            lottery=lottery, user=user
+        ).aggregate(last=Max("rank"))["last"]
+        return (last_rank or 0) + 1
+
+    @classmethod
+    def record_preference(cls, lottery, user, clinic):
+        """
+        희망 순위 기록 (신청 순서대로 1, 2, 3 ... 순위 부여)
+
+        (lottery, user, rank)가 unique이므로 같은 사용자의 동시 신청이 같은 순위를
+        계산하면 한쪽만 저장되고, 나머지는 순위를 다시 계산해 재시도합니다.
+
+        Returns:
+            tuple: (ReservationPreference, created)
+        """
+        from .models import ReservationPreference
+
+        for _ in range(cls.RANK_RETRIES):
+            existing = ReservationPreference.objects.filter(
+                lottery=lottery, user=user, clinic=clinic
+            ).first()
+            if existing is not None:
+                # 동시 요청으로 같은 희망이 먼저 기록된 경우 포함
+                return existing, False
+
+            try:
+                with transaction.atomic():
+                    preference = ReservationPreference.objects.create(
+                        lottery=lottery,
+                        user=user,
+                        clinic=clinic,
+                        rank=cls._next_rank(lottery, user),
+                    )
+                return preference, True
+            except IntegrityError:
+                logger.debug(
+                    f"[utils.py] 희망 순위 충돌 - 재시도: lottery_id={lottery.id}, "
+                    f"user_id={user.id}"
+                )
+
+        raise IntegrityError(
+            f"희망 순위 기록 실패 (재시도 {cls.RANK_RETRIES}회 초과): user_id={user.id}"
+        )
+
+    @classmethod
+    def allocate_due_lotteries(cls):
+        """접수 마감이 지난 회차를 모두 배정 (스케줄러/명령어에서 호출)"""
+        from .models import ReservationLottery
+
+        results = []
+        due_lotteries = ReservationLottery.objects.filter(
+            status="collecting", closes_at__lte=timezone.now()
+        ).order_by("opens_at")
+        for lottery in due_lotteries:
+            result = cls.allocate(lottery)
+            if result is not None:
+                results.append(result)
+        return results
+
+    @classmethod
+    def allocate(cls, lottery):
+        """
+        추첨 회차 일괄 배정
+
+        1. collecting → allocating 조건부 UPDATE로 배정 권한 획득 (중복 실행 방지)
+        2. 클리닉 행 잠금 후 메모리에서 라운드별 배정 계산 (clinic_capacity - reserved_count 만큼)
+        3. clinic_students 중간 테이블 / ClinicAttendance bulk_create
+        4. reserved_count 재계산, non_pass 일괄 해제, 희망 결과 일괄 업데이트
+
+        Returns:
+            dict: 배정 결과 통계 (다른 프로세스가 이미 배정 중이면 None)
+        """
+        import random
+        from .models import (
+            Clinic,
+            DataVersion,
+            ReservationLottery,
+            ReservationPreference,
+            User,
+        )
+
+        claimed = ReservationLottery.objects.filter(
+            id=lottery.id, status="collecting"
+        ).update(status="allocating")
+        if not claimed:
+            logger.info(
+                f"[utils.py] 추첨 배정 건너뜀 (이미 처리 중/완료): lottery_id={lottery.id}"
+            )
+            return None
+
+        try:
+            with transaction.atomic():
+                preferences = list(
+                    ReservationPreference.objects.filter(
+                        lottery=lottery, status="pending"
+                    )
+                    .select_related("user")
+                    .order_by("user_id", "rank", "id")
+                )
+                clinic_ids = {pref.clinic_id for pref in preferences}
+                # 남은 좌석 계산 전에 클리닉 행을 id 순서로 잠금 - 배정 중에 일괄 예약/관리자 수정이
+                # 좌석을 가져가 이미 찬 좌석을 배정하지 않도록 함 (좌석 선점도 같은 행을 잠금)
+                clinics = {
+                    clinic.id: clinic
+                    for clinic in Clinic.objects.select_for_update()
+                    .filter(id__in=clinic_ids)
+                    .order_by("id")
+                }
+                remaining = {
+                    clinic.id: clinic.clinic_capacity - clinic.reserved_count
+                    for clinic in clinics.values()
+                    if clinic.is_active
+                }
+                through_model = Clinic.clinic_students.through
+                already_reserved = set(
+                    through_model.objects.filter(clinic_id__in=clinic_ids).values_list(
+                        "clinic_id", "user_id"
+                    )
+                )
+
+                # 학생별 희망 목록 (순위순) 및 예약 불가 처리
+                won_ids, lost_ids, blocked_ids = [], [], []
+                preferences_by_user = {}
+                users = {}
+                for pref in preferences:
+                    user = pref.user
+                    if (user.is_student and user.no_show >= 2) or (
+                        pref.clinic_id not in remaining
+                    ):
+                        blocked_ids.append(pref.id)
+                        continue
+                    users[user.id] = user
+                    preferences_by_user.setdefault(user.id, []).append(pref)
+
+                # 배정 순서: non_pass 대상자 우선, 그 안에서는 시드 기반 무작위
+                user_order = sorted(users)
+                random.Random(lottery.seed).shuffle(user_order)
+                user_order.sort(key=lambda user_id: not users[user_id].non_pass)
+
+                # 라운드별 배정 (라운드 N = 각 학생의 N번째 희망)
+                winners = []
+                max_rounds = max(
+                    (len(prefs) for prefs in preferences_by_user.values()), default=0
+                )
+                for round_index in range(max_rounds):
+                    for user_id in user_order:
+                        prefs = preferences_by_user[user_id]
+                        if round_index >= len(prefs):
+                            continue
+                        pref = prefs[round_index]
+
+                        if (pref.clinic_id, user_id) in already_reserved:
+                            # 관리자가 이미 배정한 경우 좌석 차감 없이 배정 처리
+                            won_ids.append(pref.id)
+                        elif remaining[pref.clinic_id] > 0:
+                            remaining[pref.clinic_id] -= 1
+                            won_ids.append(pref.id)
+                            winners.append(pref)
+                        else:
+                            lost_ids.append(pref.id)
+
+                # 좌석/출석 데이터 일괄 생성
+                DatabaseOptimizer.bulk_create_reservations(
+                    [(pref.clinic_id, pref.user_id) for pref in winners],
+                    clinics,
+                    users,
+                )
+
+                # 의무 클리닉 대상자는 배정되면 non_pass 해제
+                # (queryset.update()는 시그널이 없으므로 같은 트랜잭션에서 사용자 버전 증가)
+                if User.objects.filter(
+                    id__in={pref.user_id for pref in winners},
+                    is_student=True,
+                    non_pass=True,
+                ).update(non_pass=False):
+                    DataVersion.bump(DataVersion.USERS)
+
+                ReservationPreference.objects.filter(id__in=won_ids).update(
+                    status="won"
+                )
+                ReservationPreference.objects.filter(id__in=lost_ids).update(
+                    status="lost"
+                )
+                ReservationPreference.objects.filter(id__in=blocked_ids).update(
+                    status="blocked"
+                )
+
+                ReservationLottery.objects.filter(id=lottery.id).update(
+                    status="allocated", allocated_at=timezone.now()
+                )
+        except Exception:
+            # 배정 실패 시 다시 시도할 수 있도록 접수 상태로 복구
+            ReservationLottery.objects.filter(
+                id=lottery.id, status="allocating"
+            ).update(status="collecting")
+            raise
+
+        result = {
+            "lottery_id": lottery.id,
+            "won": len(won_ids),
+            "lost": len(lost_ids),
+            "blocked": len(blocked_ids),
+            "students": len(users),
+        }
+        logger.info(f"[utils.py] 추첨 배정 완료: {result}")
+        return result
+
+
 class ClinicReservationOptimizer:
-    """클리닉 예약 최적화 도구"""
+    """
+    클리닉 예약 최적화 도구
+
+    주간 스케줄 캐시는 DB에 저장된 스케줄 버전(DataVersion)을 키에 포함합니다.
+    예약/클리닉 수정/활성화/주간 초기화 트랜잭션 안에서 버전이 증가하므로,
+    커밋 이후에는 어떤 워커/레플리카도 이전 버전 스냅샷을 반환하지 않습니다.
+    캐시 적중 시 비용: 버전 조회 쿼리 1회 + 프로세스 메모리 조회
+    """
 
     CACHE_TIMEOUT = 300  # 5분
     SCHEDULE_CACHE_KEY = "clinic_weekly_schedule"
+    AVAILABILITY_CACHE_KEY = "clinic_availability"  # 학생용 잔여석 목록 (명단 제외)
+
+    # 프로세스 로컬 스냅샷: {캐시 키: (버전, 데이터, 만료 시각)}
+    _local_snapshots = {}
+
+    @classmethod
+    def get_schedule_version(cls):
+        """현재 주간 스케줄 버전 조회"""
+        from .models import DataVersion
+
+        return DataVersion.get_version(DataVersion.CLINIC_SCHEDULE)
 
     @classmethod
-    def get_cached_schedule(cls):
-        """캐시된 주간 스케줄 조회"""
-        return cache.get(cls.SCHEDULE_CACHE_KEY)
+    def get_schedule_cache_key(cls, version, cache_key=None):
+        """버전이 포함된 주간 스케줄 캐시 키 생성"""
+        return f"{cache_key or cls.SCHEDULE_CACHE_KEY}:v{version}"
 
     @classmethod
-    def set_cached_schedule(cls, schedule_data, timeout=None):
-        """주간 스케줄 캐시 저장"""
+    def get_cached_schedule(cls, version=None, cache_key=None):
+        """
+        캐시된 주간 스케줄 조회
+
+        프로세스 메모리 → 공유 캐시(CACHES) 순서로 현재 버전의 스냅샷을 찾습니다.
+
+        Args:
+            version: 스케줄 버전 (None이면 조회)
+            cache_key: 스냅샷 종류 (기본: 전체 스케줄, AVAILABILITY_CACHE_KEY: 잔여석 목록)
+
+        Returns:
+            tuple: (버전, 스케줄 데이터 또는 None)
+                   캐시 미스 시 반환된 버전으로 set_cached_schedule을 호출해야 합니다.
+                   (스케줄 조회 전에 읽은 버전이어야 이전 데이터가 새 버전으로 저장되지 않습니다)
+        """
+        cache_key = cache_key or cls.SCHEDULE_CACHE_KEY
+        if version is None:
+            version = cls.get_schedule_version()
+
+        local = cls._local_snapshots.get(cache_key)
+        if local and local[0] == version and local[2] > time.monotonic():
+            return version, local[1]
+
+        data = cache.get(cls.get_schedule_cache_key(version, cache_key))
+        if data is not None:
+            cls._local_snapshots[cache_key] = (
+                version,
+                data,
+                time.monotonic() + cls.CACHE_TIMEOUT,
+            )
+        return version, data
+
+    @classmethod
+    def set_cached_schedule(cls, version, schedule_data, timeout=None, cache_key=None):
+        """주간 스케줄 캐시 저장 (조회 전에 읽은 버전 기준)"""
+        cache_key = cache_key or cls.SCHEDULE_CACHE_KEY
         if timeout is None:
             timeout = cls.CACHE_TIMEOUT
-        return cache.set(cls.SCHEDULE_CACHE_KEY, schedule_data, timeout)
+        cls._local_snapshots[cache_key] = (
+            version,
+            schedule_data,
+            time.monotonic() + timeout,
+        )
+        return cache.set(
+            cls.get_schedule_cache_key(version, cache_key), schedule_data, timeout
+        )
 
     @classmethod
-    def invalidate_schedule_cache(cls):
-        """주간 스케줄 캐시 무효화"""
-        return cache.delete(cls.SCHEDULE_CACHE_KEY)
+    def invalidate_schedule_cache(cls, clinic_ids=None):
+        """
+        주간 스케줄 캐시 무효화 (스케줄 버전 증가 + 변경 기록)
+
+        호출한 트랜잭션이 커밋되는 시점에 모든 인스턴스의 캐시가 함께 무효화됩니다.
+
+        Args:
+            clinic_ids: 예약 인원만 바뀐 클리닉 ID 목록 (None이면 전체 변경 - since 요청에 전체 스냅샷)
+        """
+        from .models import ScheduleChange
+
+        return ScheduleChange.log(clinic_ids)
 
     @classmethod
     def get_clinic_status_cache_key(cls, clinic_id):
@@ -276,6 +1215,451 @@ class ClinicReservationOptimizer:
         cls.invalidate_schedule_cache()
 
 
+class _Flight:
+    """프로세스 안에서 진행 중인 단일 계산 (리더 결과를 팔로워가 기다림)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+
+
+class SingleFlight:
+    """
+    읽기 요청 병합 (Single-flight)
+
+    예약 오픈 직후 같은 조회 요청이 동시에 수백 건 들어오면 모두 같은 결과를 다시 계산합니다.
+    같은 키의 계산이 진행 중이면 새로 계산하지 않고 그 결과를 함께 사용합니다.
+
+    1. 워커 안: 첫 요청(리더)만 계산하고 나머지 스레드는 Event로 결과를 기다림
+    2. 워커 간: 캐시 add()로 짧은 락을 잡은 워커만 계산하고, 다른 워커는 결과가 캐시에 올라올 때까지 대기
+       (CACHES가 워커 간 공유 캐시일 때만 적용 - 기본 LocMemCache에서는 워커 안 병합만 동작)
+    3. STALE_SECONDS > 0이면 다른 워커가 다시 계산하는 동안 직전 결과를 바로 반환 (stale-while-revalidate)
+
+    리더가 실패하거나 WAIT_SECONDS 안에 결과가 없으면 팔로워가 직접 계산합니다.
+    """
+
+    CACHE_PREFIX = "single_flight"
+    POLL_INTERVAL = 0.05  # 워커 간 결과 대기 폴링 간격 (초)
+
+    _flights = {}
+    _flights_lock = threading.Lock()
+
+    @classmethod
+    def get_config(cls):
+        config = getattr(settings, "SINGLE_FLIGHT", {})
+        return {
+            "ENABLED": config.get("ENABLED", True),
+            "WAIT_SECONDS": config.get("WAIT_SECONDS", 5),
+            "LOCK_SECONDS": config.get("LOCK_SECONDS", 10),
+            "STALE_SECONDS": config.get("STALE_SECONDS", 0),
+        }
+
+    @classmethod
+    def is_enabled(cls):
+        return cls.get_config()["ENABLED"]
+
+    @classmethod
+    def run(cls, key, compute, stale_seconds=None):
+        """
+        key에 대한 계산을 병합하여 실행
+
+        Args:
+            key: 같은 결과를 공유할 요청들의 키
+            compute: 결과를 계산하는 함수 (None을 반환하면 공유하지 않음)
+            stale_seconds: stale-while-revalidate 시간 (None이면 설정값)
+
+        Returns:
+            compute 결과 (다른 요청이 계산한 결과일 수 있음)
+        """
+        config = cls.get_config()
+
+        with cls._flights_lock:
+            flight = cls._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = cls._flights[key] = _Flight()
+
+        if not is_leader:
+            if flight.event.wait(config["WAIT_SECONDS"]) and flight.value is not None:
+                return flight.value
+            return compute()
+
+        try:
+            flight.value = cls._run_shared(key, compute, config, stale_seconds)
+            return flight.value
+        finally:
+            with cls._flights_lock:
+                cls._flights.pop(key, None)
+            flight.event.set()
+
+    @classmethod
+    def _run_shared(cls, key, compute, config, stale_seconds):
+        """워커 간 병합 - 캐시 락을 잡은 워커만 계산하고 결과를 캐시에 공유"""
+        if stale_seconds is None:
+            stale_seconds = config["STALE_SECONDS"]
+
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        lock_key = f"{cls.CACHE_PREFIX}:lock:{digest}"
+        result_key = f"{cls.CACHE_PREFIX}:result:{digest}"
+
+        stale_entry = cache.get(result_key) if stale_seconds > 0 else None
+        token = uuid.uuid4().hex
+
+        if cache.add(lock_key, token, config["LOCK_SECONDS"]):
+            try:
+                value = compute()
+                if value is not None:
+                    # 팔로워가 가져갈 때까지 (stale 사용 시 그 기간까지) 보관
+                    cache.set(
+                        result_key,
+                        {"token": token, "value": value, "computed_at": time.time()},
+                        max(stale_seconds, config["WAIT_SECONDS"]),
+                    )
+                return value
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        # 다른 워커가 계산 중 - stale 결과가 있으면 바로 반환
+        if stale_entry and stale_entry["computed_at"] + stale_seconds > time.time():
+            return stale_entry["value"]
+
+        leader_token = cache.get(lock_key)
+        deadline = time.monotonic() + config["WAIT_SECONDS"]
+        while leader_token and time.monotonic() < deadline:
+            time.sleep(cls.POLL_INTERVAL)
+            entry = cache.get(result_key)
+            if entry and entry["token"] == leader_token:
+                return entry["value"]
+            if cache.get(lock_key) != leader_token:
+                break  # 리더가 결과 없이 종료 (오류/공유 불가 응답)
+
+        logger.debug(f"[utils.py] single-flight 리더 결과 없음, 직접 계산: key={key}")
+        return compute()
+
+
+def with_single_flight(name, key_func=None, stale_seconds=None):
+    """
+    조회 뷰에 single-flight 병합을 적용하는 데코레이터
+
+    같은 경로/쿼리스트링의 GET 요청은 진행 중인 계산 결과(200 응답 데이터)를 공유합니다.
+    사용자별로 다른 응답을 주는 뷰에는 사용하지 마세요.
+
+    Args:
+        name: 뷰 이름 (키 접두사)
+        key_func: request를 받아 키에 추가할 값을 반환하는 함수 (예: 데이터 버전)
+        stale_seconds: stale-while-revalidate 시간 (None이면 SINGLE_FLIGHT 설정값)
+
+    사용 예:
+    @with_single_flight("today_clinic")
+    def get(self, request):
+        pass
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request is None or request.method != "GET" or not SingleFlight.is_enabled():
+                return func(*args, **kwargs)
+
+            key_parts = [name, request.get_full_path()]
+            if key_func is not None:
+                key_parts.append(str(key_func(request)))
+
+            own = {}
+
+            def compute():
+                response = func(*args, **kwargs)
+                own["response"] = response
+                if response.status_code != 200 or not hasattr(response, "data"):
+                    return None  # 오류 응답은 공유하지 않음
+                return response.data
+
+            data = SingleFlight.run(":".join(key_parts), compute, stale_seconds)
+            if "response" in own:
+                return own["response"]
+
+            from rest_framework.response import Response
+
+            return Response(data)
+
+        return wrapper
+
+    return decorator
+
+
+def with_conditional_get(*version_names, key_func=None):
+    """
+    데이터 버전 기반 조건부 GET (ETag / Last-Modified) 데코레이터
+
+    응답 본문을 해시하지 않고 DataVersion 행(버전, 수정 시간)으로 검증값을 만듭니다.
+    If-None-Match / If-Modified-Since가 현재 값과 같으면 뷰(직렬화 포함)를 실행하지 않고 304를 반환합니다.
+    비용: 버전 조회 쿼리 1회 (조회한 버전은 request.data_versions로 뷰에 전달)
+
+    Args:
+        version_names: 응답 데이터가 의존하는 DataVersion 이름들
+        key_func: request를 받아 ETag에 추가할 값을 반환하는 함수 (예: 오늘 날짜)
+                  지정하면 Last-Modified는 보내지 않습니다.
+
+    사용 예:
+    @with_conditional_get(DataVersion.SUBJECTS)
+    def list(self, request):
+        pass
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request is None or request.method not in ("GET", "HEAD"):
+                return func(*args, **kwargs)
+
+            from django.utils.cache import get_conditional_response, patch_cache_control
+            from django.utils.http import http_date, quote_etag
+            from .models import DataVersion
+
+            stamps = DataVersion.get_stamps(version_names)
+            request.data_versions = {
+                name: version for name, (version, _) in stamps.items()
+            }
+
+            # 같은 URL이라도 Accept(응답 형식)가 다르면 다른 표현이므로 검증값에 포함
+            tag_parts = [f"{name}.{stamps[name][0]}" for name in version_names]
+            tag_parts.append(request.META.get("HTTP_ACCEPT", ""))
+            if key_func is not None:
+                tag_parts.append(str(key_func(request)))
+            etag = quote_etag(
+                hashlib.sha256("|".join(tag_parts).encode()).hexdigest()[:24]
+            )
+            # key_func 값은 시간으로 표현할 수 없으므로 이 경우 Last-Modified는 생략 (ETag만 사용)
+            modified_times = [
+                updated_at for _, updated_at in stamps.values() if updated_at
+            ]
+            last_modified = (
+                int(max(modified_times).timestamp())
+                if modified_times and key_func is None
+                else None
+            )
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = func(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            # 브라우저가 캐시를 쓰기 전에 항상 재검증하도록 설정
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class ClinicSeatBroadcaster:
+    """
+    클리닉 좌석 변경 실시간 전송 (SSE fan-out)
+
+    프로세스당 백그라운드 스레드 하나가 좌석 변경을 감지하고,
+    SSE로 연결된 모든 클라이언트의 asyncio.Queue에 변경분(delta)을 넣어줍니다.
+    클라이언트 수와 관계없이 DB 조회는 프로세스당 한 번이며, 대기 중인 연결은 큐 대기만 합니다.
+
+    변경 감지:
+    - PostgreSQL: DataVersion.bump()가 커밋 시 보내는 NOTIFY를 LISTEN (폴링 없음)
+    - 그 외 DB: POLL_INTERVAL마다 주간 스케줄 버전 조회 1회
+    스케줄 버전이 바뀌면 (id, 예약 인원, 정원, 활성화) 전체를 한 번 조회해 이전 스냅샷과 비교합니다.
+    (예약/취소/관리자 수정/활성화는 모두 스케줄 버전을 증가시킵니다)
+    """
+
+    RESYNC = "resync"  # 큐가 넘친 클라이언트에게 전체 스냅샷 재전송 표시
+
+    _lock = threading.Lock()
+    _thread = None
+    _ready = threading.Event()
+    _subscribers = set()  # (event loop, asyncio.Queue)
+    _snapshot = {}  # clinic_id -> (reserved_count, capacity, is_active)
+    _version = None
+
+    @classmethod
+    def get_config(cls):
+        config = getattr(settings, "SEAT_STREAM", {})
+        return {
+            "ENABLED": config.get("ENABLED", False),
+            "POLL_INTERVAL": config.get("POLL_INTERVAL", 1.0),
+            "HEARTBEAT_SECONDS": config.get("HEARTBEAT_SECONDS", 15),
+            "QUEUE_SIZE": config.get("QUEUE_SIZE", 50),
+        }
+
+    @classmethod
+    def is_enabled(cls):
+        return cls.get_config()["ENABLED"]
+
+    @classmethod
+    def ensure_started(cls, timeout=5):
+        """감지 스레드 시작 (첫 스냅샷을 읽을 때까지 대기 - 동기 함수)"""
+        with cls._lock:
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._thread = threading.Thread(
+                    target=cls._run, name="clinic-seat-broadcaster", daemon=True
+                )
+                cls._thread.start()
+                logger.info("[utils.py] 좌석 변경 감지 스레드 시작")
+        return cls._ready.wait(timeout)
+
+    @classmethod
+    def subscribe(cls, loop, queue):
+        """
+        클라이언트 등록
+
+        Returns:
+            tuple: (스케줄 버전, 현재 좌석 목록)
+        """
+        with cls._lock:
+            cls._subscribers.add((loop, queue))
+            return cls._version, cls._compact(cls._snapshot)
+
+    @classmethod
+    def unsubscribe(cls, loop, queue):
+        with cls._lock:
+            cls._subscribers.discard((loop, queue))
+
+    @classmethod
+    def get_snapshot(cls):
+        with cls._lock:
+            return cls._version, cls._compact(cls._snapshot)
+
+    @staticmethod
+    def _compact(seats):
+        return [
+            {
+                "clinic_id": clinic_id,
+                "reserved_count": reserved_count,
+                "capacity": capacity,
+                "is_active": is_active,
+            }
+            for clinic_id, (reserved_count, capacity, is_active) in seats.items()
+        ]
+
+    @staticmethod
+    def format_event(event_type, version, seats):
+        """SSE 메시지 문자열 생성 (id는 스케줄 버전)"""
+        data = json.dumps(seats, separators=(",", ":"))
+        return f"id: {version}\nevent: {event_type}\ndata: {data}\n\n"
+
+    @classmethod
+    def _run(cls):
+        """감지 스레드 본체 - 오류 시 DB 연결을 닫고 다시 시작"""
+        from django.db import connection
+
+        interval = cls.get_config()["POLL_INTERVAL"]
+        while True:
+            try:
+                if connection.vendor == "postgresql":
+                    cls._listen_loop(interval)
+                else:
+                    while True:
+                        cls._refresh()
+                        time.sleep(interval)
+            except Exception as e:
+                logger.error(f"[utils.py] 좌석 변경 감지 오류: {str(e)}")
+                connection.close()
+                time.sleep(interval)
+
+    @classmethod
+    def _listen_loop(cls, interval):
+        """PostgreSQL LISTEN - 알림이 올 때만 스냅샷 갱신 (안전장치로 30초마다 버전 확인)"""
+        import select
+        from django.db import connection
+        from .models import DataVersion
+
+        # ORM 연결과 별도의 LISTEN 전용 연결 (psycopg2)
+        listen_conn = connection.get_new_connection(connection.get_connection_params())
+        try:
+            listen_conn.autocommit = True
+            with listen_conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{DataVersion.NOTIFY_CHANNEL}"')
+
+            cls._refresh()
+            while True:
+                if select.select([listen_conn], [], [], max(interval, 30)) == (
+                    [],
+                    [],
+                    [],
+                ):
+                    cls._refresh()
+                    continue
+
+                listen_conn.poll()
+                names = {notify.payload for notify in listen_conn.notifies}
+                listen_conn.notifies.clear()
+                if DataVersion.CLINIC_SCHEDULE in names:
+                    cls._refresh()
+        finally:
+            listen_conn.close()
+
+    @classmethod
+    def _refresh(cls):
+        """스케줄 버전이 바뀌었으면 좌석 스냅샷을 다시 읽고 변경분을 구독자에게 전송"""
+        from .models import Clinic, DataVersion
+
+        version = DataVersion.get_version(DataVersion.CLINIC_SCHEDULE)
+        if version == cls._version and cls._ready.is_set():
+            return
+
+        seats = {
+            clinic_id: (reserved_count, capacity, is_active)
+            for clinic_id, reserved_count, capacity, is_active in Clinic.objects.values_list(
+                "id", "reserved_count", "clinic_capacity", "is_active"
+            )
+        }
+
+        with cls._lock:
+            previous = cls._snapshot
+            changed = {
+                clinic_id: seat
+                for clinic_id, seat in seats.items()
+                if previous.get(clinic_id) != seat
+            }
+            # 삭제된 클리닉은 비활성화/정원 0으로 전송
+            changed.update(
+                {
+                    clinic_id: (0, 0, False)
+                    for clinic_id in previous.keys() - seats.keys()
+                }
+            )
+            cls._snapshot = seats
+            cls._version = version
+            subscribers = list(cls._subscribers)
+            first_load = not cls._ready.is_set()
+
+        cls._ready.set()
+        if first_load or not changed or not subscribers:
+            return
+
+        event = {"version": version, "seats": cls._compact(changed)}
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(cls._offer, queue, event)
+            except RuntimeError:
+                cls.unsubscribe(loop, queue)  # 이벤트 루프가 종료됨
+
+    @classmethod
+    def _offer(cls, queue, event):
+        """큐에 변경분 추가 (이벤트 루프 스레드에서 실행) - 넘치면 전체 스냅샷 재전송으로 대체"""
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(cls.RESYNC)
+            return
+        queue.put_nowait(event)
+
+
 def log_performance(func_name):
     """성능 측정 데코레이터"""
 
@@ -341,6 +1725,132 @@ class DatabaseOptimizer:
 
         return clinic
 
+    # 좌석 선점 결과
+    SEAT_CLAIMED = "claimed"
+    SEAT_DUPLICATE = "duplicate"
+    SEAT_UNAVAILABLE = "unavailable"
+
+    @classmethod
+    def claim_clinic_seat(cls, clinic_id, user_id):
+        """
+        클리닉 좌석 선점 (select_for_update 없이 조건부 UPDATE 사용)
+
+        1. clinic_students 중간 테이블에 직접 INSERT (unique 제약으로 중복 예약 차단)
+        2. "활성화 상태이고 reserved_count < 정원"인 경우에만 카운터를 +1 하는 UPDATE 한 번
+
+        클리닉 행은 마지막 UPDATE 시점부터 커밋까지만 잠기므로
+        같은 클리닉에 대한 요청들이 서로의 트랜잭션 전체를 기다리지 않습니다.
+        호출하는 쪽의 트랜잭션 안에서 savepoint로 실행되며, 실패 시 INSERT는 롤백됩니다.
+
+        Returns:
+            str: SEAT_CLAIMED / SEAT_DUPLICATE / SEAT_UNAVAILABLE
+        """
+        from django.db.models import F
+        from .models import Clinic
+
+        through_model = Clinic.clinic_students.through
+
+        try:
+            with transaction.atomic():
+                through_model.objects.create(clinic_id=clinic_id, user_id=user_id)
+
+                claimed = Clinic.objects.filter(
+                    id=clinic_id,
+                    is_active=True,
+                    reserved_count__lt=F("clinic_capacity"),
+                ).update(reserved_count=F("reserved_count") + 1)
+
+                if not claimed:
+                    # 정원 초과 또는 비활성화 - savepoint 롤백으로 INSERT 취소
+                    raise _SeatUnavailable()
+
+                # 같은 트랜잭션에서 스케줄 버전 증가 (버전 행 잠금 시간을 줄이도록 마지막에 실행)
+                ClinicReservationOptimizer.invalidate_schedule_cache([clinic_id])
+        except IntegrityError:
+            logger.info(
+                f"[utils.py] 좌석 선점 실패 (중복 예약): clinic_id={clinic_id}, user_id={user_id}"
+            )
+            return cls.SEAT_DUPLICATE
+        except _SeatUnavailable:
+            logger.info(
+                f"[utils.py] 좌석 선점 실패 (정원 초과/비활성화): clinic_id={clinic_id}, user_id={user_id}"
+            )
+            return cls.SEAT_UNAVAILABLE
+
+        return cls.SEAT_CLAIMED
+
+    @classmethod
+    def bulk_create_reservations(cls, pairs, clinics, users, today=None):
+        """
+        여러 (clinic_id, user_id) 예약을 한 번에 기록 (호출하는 쪽의 트랜잭션 안에서 실행)
+
+        1. clinic_students 중간 테이블 bulk_create
+        2. 같은 날짜의 비활성화 출석 데이터 정리 후 학생 출석 데이터 bulk_create
+        3. 영향받은 클리닉의 reserved_count를 서브쿼리 UPDATE 한 번으로 재계산
+
+        정원 확인은 호출하는 쪽에서 끝낸 상태여야 합니다.
+
+        Args:
+            pairs: [(clinic_id, user_id), ...]
+            clinics: {clinic_id: Clinic}
+            users: {user_id: User}
+        """
+        from .models import Clinic, ClinicAttendance
+
+        if not pairs:
+            return
+
+        today = today or timezone.localdate()
+        through_model = Clinic.clinic_students.through
+        through_model.objects.bulk_create(
+            [
+                through_model(clinic_id=clinic_id, user_id=user_id)
+                for clinic_id, user_id in pairs
+            ],
+            ignore_conflicts=True,
+        )
+
+        attendance_rows = [
+            ClinicAttendance(
+                is_active=True,
+                clinic_id=clinic_id,
+                student_id=user_id,
+                attendance_type="none",
+                reservation_date=today,
+                expected_clinic_date=clinics[clinic_id].get_expected_clinic_date(
+                    today
+                ),
+            )
+            for clinic_id, user_id in pairs
+            if users[user_id].is_student
+        ]
+        clinic_ids = {clinic_id for clinic_id, _ in pairs}
+
+        if attendance_rows:
+            # 같은 날짜의 비활성화 출석 데이터 정리 (unique 제약 충돌 방지)
+            attendance_keys = {
+                (row.clinic_id, row.student_id, row.expected_clinic_date)
+                for row in attendance_rows
+            }
+            stale_ids = [
+                attendance_id
+                for attendance_id, *key in ClinicAttendance.objects.filter(
+                    clinic_id__in=clinic_ids,
+                    student_id__in={row.student_id for row in attendance_rows},
+                    is_active=False,
+                ).values_list("id", "clinic_id", "student_id", "expected_clinic_date")
+                if tuple(key) in attendance_keys
+            ]
+            if stale_ids:
+                ClinicAttendance.objects.filter(id__in=stale_ids).delete()
+            ClinicAttendance.objects.bulk_create(attendance_rows, ignore_conflicts=True)
+
+        Clinic.sync_reserved_counts(clinic_ids)
+
+
+class _SeatUnavailable(Exception):
+    """좌석 선점 UPDATE가 적용되지 않았을 때 savepoint 롤백용 내부 예외"""
+
 
 # 클라이언트 정보 추출 유틸리티 (로그인 추적용)
 class ClientInfoExtractor:
@@ -519,35 +2029,33 @@ class LoginSecurityUtils:
     LOCKOUT_DURATION = 900  # 15분
 
     @classmethod
-    def is_suspicious_activity(cls, user, client_info):
-        """의심스러운 로그인 활동 감지"""
-        # 여기서는 기본적인 체크만 구현
-        # 실제로는 더 정교한 분석이 필요
+    def is_suspicious_activity(cls, user, client_info, profile=None):
+        """
+        의심스러운 로그인 활동 감지
+
+        로그인 이력 대신 LoginProfile(기기 목록/최근 IP) 한 행만 확인하므로
+        이력이 아무리 많아도 비용이 일정합니다.
+
+        Args:
+            profile: 이미 조회한 LoginProfile (없으면 조회/생성)
+        """
+        from .models import LoginProfile
+
+        if profile is None:
+            profile, _ = LoginProfile.objects.get_or_create(user=user)
 
         suspicious_indicators = []
 
         # 1. 짧은 시간 내 여러 IP에서 로그인 시도
-        recent_logins = (
-            user.login_history.filter(
-                login_at__gte=timezone.now() - timedelta(minutes=10)
-            )
-            .values_list("ip_address", flat=True)
-            .distinct()
+        recent_ip_count = profile.count_recent_ips(
+            timezone.now() - timedelta(minutes=10)
         )
 
-        if len(recent_logins) > 3:
-            suspicious_indicators.append(
-                f"10분 내 {len(recent_logins)}개 IP에서 로그인"
-            )
+        if recent_ip_count > 3:
+            suspicious_indicators.append(f"10분 내 {recent_ip_count}개 IP에서 로그인")
 
         # 2. 알려지지 않은 기기/브라우저
-        known_devices = user.login_history.filter(
-            login_success=True,
-            device_type=client_info["device_type"],
-            browser_name=client_info["browser_name"],
-        ).exists()
-
-        if not known_devices:
+        if not profile.is_known_device(client_info):
             suspicious_indicators.append("새로운 기기/브라우저")
 
         return suspicious_indicators
@@ -562,3 +2070,184 @@ class LoginSecurityUtils:
             f"기기: {client_info.get('device_type', 'unknown')} | "
             f"상세: {details}"
         )
+
+
+class SessionActivityTracker:
+    """
+    중복 로그인 체크용 세션 조회 캐시 + 마지막 활동 시간 일괄 기록
+
+    - 세션/토큰 키: 짧은 시간 캐시에 보관하고 UserSession 저장/삭제 시그널에서 삭제
+      (force_logout_user, 로그인/로그아웃 모두 UserSession.save()를 거침)
+    - 마지막 활동 시간: 요청마다 메모리에만 기록하고, 프로세스당 기록 스레드가
+      FLUSH_SECONDS마다 UPDATE 한 번에 모아서 반영 (요청이 끊겨도 지연은 최대 FLUSH_SECONDS)
+      프로세스 정상 종료 시 atexit로 남은 기록을 반영
+
+    설정은 settings.SESSION_TRACKING 사용
+    """
+
+    CACHE_KEY_PREFIX = "user_session"
+    MISSING = "missing"  # UserSession 없음 (캐시 값)
+
+    _lock = threading.Lock()
+    _pending = {}  # {user_id: 마지막 활동 시각}
+    _thread = None
+    _atexit_registered = False
+
+    @classmethod
+    def get_config(cls):
+        return getattr(settings, "SESSION_TRACKING", {})
+
+    @classmethod
+    def get_cache_key(cls, user_id):
+        return f"{cls.CACHE_KEY_PREFIX}:{user_id}"
+
+    @classmethod
+    def get_session_keys(cls, user_id, use_cache=True):
+        """
+        저장된 (session_key, token_key) 반환 (UserSession이 없으면 None)
+
+        use_cache=False면 DB에서 다시 읽어 캐시를 갱신합니다.
+        """
+        from .models import UserSession
+
+        key = cls.get_cache_key(user_id)
+        if use_cache:
+            cached = cache.get(key)
+            if cached == cls.MISSING:
+                return None
+            if cached is not None:
+                return tuple(cached)
+
+        keys = (
+            UserSession.objects.filter(user_id=user_id)
+            .values_list("session_key", "token_key")
+            .first()
+        )
+        timeout = cls.get_config().get("CACHE_SECONDS", 30)
+        cache.set(key, list(keys) if keys else cls.MISSING, timeout)
+        return keys
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """세션 조회 캐시 삭제 (UserSession 변경 시)"""
+        cache.delete(cls.get_cache_key(user_id))
+
+    @classmethod
+    def touch(cls, user_id):
+        """마지막 활동 시간 기록 (메모리) - 기록 스레드가 FLUSH_SECONDS마다 DB 반영"""
+        with cls._lock:
+            cls._pending[user_id] = timezone.now()
+        cls._ensure_thread()
+
+    @classmethod
+    def flush(cls):
+        """기록 대기 중인 활동 시간 즉시 반영 (프로세스 종료 시 등)"""
+        with cls._lock:
+            pending, cls._pending = cls._pending, {}
+        cls._write(pending)
+
+    @classmethod
+    def _ensure_thread(cls):
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+        with cls._lock:
+            if cls._thread is not None and cls._thread.is_alive():
+                return
+            if not cls._atexit_registered:
+                atexit.register(cls.flush)
+                cls._atexit_registered = True
+            cls._thread = threading.Thread(
+                target=cls._run, name="session-activity-flusher", daemon=True
+            )
+            cls._thread.start()
+
+    @classmethod
+    def _run(cls):
+        """FLUSH_SECONDS마다 대기 중인 활동 시간 반영"""
+        from django.db import close_old_connections
+
+        while True:
+            time.sleep(cls.get_config().get("FLUSH_SECONDS", 60))
+            if not cls._pending:
+                continue
+            close_old_connections()
+            cls.flush()
+            close_old_connections()
+
+    @classmethod
+    def _write(cls, pending):
+        """사용자별 활동 시각을 UPDATE 한 번으로 반영 (시그널/캐시 무효화 없음)"""
+        if not pending:
+            return
+
+        from django.db.models import Case, F, Value, When
+        from .models import UserSession
+
+        try:
+            updated = UserSession.objects.filter(user_id__in=pending).update(
+                last_activity=Case(
+                    *[
+                        When(user_id=user_id, then=Value(activity))
+                        for user_id, activity in pending.items()
+                    ],
+                    default=F("last_activity"),
+                )
+            )
+            logger.debug(f"[utils.py] 마지막 활동 시간 일괄 기록: {updated}건")
+        except Exception as e:
+            # 활동 시간 기록 실패는 요청 처리에 영향을 주지 않음
+            logger.debug(f"[utils.py] 마지막 활동 시간 기록 실패: {str(e)}")
+
+
+class TokenAuthCache:
+    """
+    토큰 인증 결과 캐시 (api.authentication.CachedTokenAuthentication에서 사용)
+
+    토큰별로 (사용자, 토큰, 저장된 토큰 키)를 짧게 보관하고, 로그인/로그아웃/강제 로그아웃/
+    사용자 변경 시 invalidate()로 바로 삭제합니다.
+    삭제가 모든 워커에 반영되려면 캐시가 공유되어야 하므로(REDIS_URL 등)
+    settings.TOKEN_AUTH["CACHE"]가 "auto"면 공유 캐시일 때만 사용합니다.
+    LocMemCache에서는 워커마다 캐시가 따로라 로그아웃한 토큰이 다른 워커에서 계속 통과할 수 있습니다.
+    """
+
+    CACHE_KEY_PREFIX = "token_auth"
+
+    @classmethod
+    def get_config(cls):
+        config = getattr(settings, "TOKEN_AUTH", {})
+        return {
+            "CACHE": config.get("CACHE", "auto"),
+            "CACHE_SECONDS": config.get("CACHE_SECONDS", 30),
+        }
+
+    @classmethod
+    def is_enabled(cls):
+        """"auto"면 공유 캐시일 때만 사용 ("True"/"False"로 강제 가능)"""
+        enabled = cls.get_config()["CACHE"]
+        if enabled == "auto":
+            return is_shared_cache()
+        return enabled in (True, "True")
+
+    @classmethod
+    def get_cache_key(cls, key):
+        """토큰 원문 대신 해시를 캐시 키로 사용"""
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return f"{cls.CACHE_KEY_PREFIX}:{digest}"
+
+    @classmethod
+    def get(cls, key):
+        if not cls.is_enabled():
+            return None
+        return cache.get(cls.get_cache_key(key))
+
+    @classmethod
+    def set(cls, key, value):
+        if cls.is_enabled():
+            cache.set(cls.get_cache_key(key), value, cls.get_config()["CACHE_SECONDS"])
+
+    @classmethod
+    def invalidate(cls, *keys):
+        """토큰 인증 캐시 삭제 (로그인/로그아웃/강제 로그아웃/사용자 변경 시 호출)"""
+        cache_keys = [cls.get_cache_key(key) for key in keys if key]
+        if cache_keys:
+            cache.delete_many(cache_keys)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+응답 렌더러 벤치마크
+
+학생 배치(student-placement), 오늘의 클리닉(today-clinic), 주간 스케줄(weekly_schedule)
+응답 데이터를 실제 뷰로 만든 뒤 렌더러별 인코딩 시간과 응답 크기를 비교합니다.
+
+- DRF: rest_framework.renderers.JSONRenderer (기존)
+- orjson: api.renderers.FastJSONRenderer
+- msgpack: api.renderers.MessagePackRenderer (msgpack 설치 시)
+
+실행 방법 (개발용 DB에서만 실행 - 벤치마크용 데이터를 만들고 마지막에 삭제):
+    cd backend
+    python scripts/benchmark_renderers.py --students 600 --repeat 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import logging  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from core.models import Clinic, Subject, User  # noqa: E402
+from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack  # noqa: E402
+
+DAYS = ["mon", "tue", "wed", "thu", "fri"]
+TIMES = ["18:00", "19:00", "20:00", "21:00"]
+
+
+def create_fixture(tag, student_count):
+    """요일/시간마다 클리닉을 만들고 학생을 고르게 예약"""
+    subject, _ = Subject.objects.get_or_create(subject="physics1")
+    teacher = User.objects.create(
+        username=f"bench_t_{tag}",
+        name="벤치마크강사",
+        subject=subject,
+        is_teacher=True,
+        is_staff=True,
+        is_superuser=True,
+    )
+    clinics = [
+        Clinic.objects.create(
+            clinic_teacher=teacher,
+            clinic_subject=subject,
+            clinic_day=day,
+            clinic_time=slot,
+            clinic_room=f"BENCH-{tag}",
+            clinic_capacity=student_count,
+            is_active=True,
+        )
+        for day in DAYS
+        for slot in TIMES
+    ]
+    students = User.objects.bulk_create(
+        [
+            User(
+                username=f"bench_s_{tag}_{i}",
+                name=f"벤치마크학생{i}",
+                subject=subject,
+                is_student=True,
+                school="벤치마크고",
+                grade="2학년",
+                student_phone_num="010-0000-0000",
+                student_parent_phone_num="010-1111-1111",
+            )
+            for i in range(student_count)
+        ]
+    )
+    for i, student in enumerate(students):
+        clinics[i % len(clinics)].clinic_students.add(student)
+    return teacher, clinics
+
+
+def collect_payloads(teacher):
+    """실제 뷰 응답 데이터(response.data) 수집"""
+    client = APIClient()
+    client.force_authenticate(user=teacher)
+    payloads = {}
+    for name, url in [
+        ("student-placement", reverse("student_placement")),
+        ("today-clinic", reverse("today_clinic")),
+        ("weekly_schedule", reverse("clinic-weekly-schedule")),
+    ]:
+        response = client.get(url)
+        if response.status_code != 200:
+            print(f"⚠️  {name} 응답 실패: {response.status_code}")
+            continue
+        payloads[name] = response.data
+    return payloads
+
+
+def measure(renderer, data, repeat):
+    """렌더링 시간(ms) 목록과 결과 크기(bytes) 반환"""
+    durations = []
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = renderer.render(data, renderer.media_type, {})
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 렌더러 벤치마크")
+    parser.add_argument("--students", type=int, default=600, help="예약 학생 수")
+    parser.add_argument("--repeat", type=int, default=200, help="렌더링 반복 횟수")
+    args = parser.parse_args()
+
+    # 로그 출력이 측정을 방해하지 않도록 콘솔 로그 최소화
+    logging.disable(logging.WARNING)
+    # 캐시된 응답이 아닌 실제 뷰 결과를 사용하도록 요청 제한/대기열 비활성화
+    settings.RATE_LIMIT["ENABLED"] = False
+    settings.WAITING_ROOM["ENABLED"] = False
+    settings.ALLOWED_HOSTS.append("testserver")  # APIClient 기본 호스트
+    cache.clear()
+
+    renderers = [("DRF", JSONRenderer()), ("orjson", FastJSONRenderer())]
+    if msgpack is not None:
+        renderers.append(("msgpack", MessagePackRenderer()))
+    else:
+        print("ℹ️  msgpack 미설치 - MessagePack 렌더러는 건너뜁니다.")
+
+    tag = uuid.uuid4().hex[:8]
+    teacher, clinics = create_fixture(tag, args.students)
+    print(f"DB: {connection.vendor}, 학생 {args.students}명, 반복 {args.repeat}회")
+
+    try:
+        for name, data in collect_payloads(teacher).items():
+            print(f"\n[{name}]")
+            baseline = None
+            for label, renderer in renderers:
+                durations, size = measure(renderer, data, args.repeat)
+                mean = statistics.mean(durations)
+                baseline = baseline or mean
+                print(
+                    f"  {label:<8} 평균 {mean:8.3f}ms  "
+                    f"중앙값 {statistics.median(durations):8.3f}ms  "
+                    f"크기 {size / 1024:8.1f}KB  "
+                    f"x{baseline / mean:5.1f}"
+                )
+    finally:
+        Clinic.objects.filter(id__in=[c.id for c in clinics]).delete()
+        User.objects.filter(username__startswith=f"bench_s_{tag}").delete()
+        teacher.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+클리닉 예약 잠금 유지 시간 벤치마크
+
+기존 예약 파이프라인(select_for_update 후 출석 데이터/non_pass/로그까지 잠금 안에서 처리)과
+현재 파이프라인(출석 데이터 INSERT → 좌석 선점 UPDATE → 커밋, 나머지는 on_commit)의
+"클리닉 행 잠금 시작 ~ 커밋 완료" 시간을 비교합니다.
+
+- 기존: select_for_update 직전부터 잠금으로 계산
+- 현재: core_clinic UPDATE(좌석 선점) 실행 직전부터 잠금으로 계산
+
+실행 방법 (개발용 DB에서만 실행 - 벤치마크용 데이터를 만들고 마지막에 삭제):
+    cd backend
+    python scripts/benchmark_reservation_lock.py --iterations 200
+
+SQLite는 행 잠금이 없으므로 PostgreSQL(DATABASE_URL)에서 실행해야 의미 있는 수치가 나옵니다.
+
+--workers N (기본 4): 서로 다른 클리닉 N개를 스레드 N개가 동시에 예약해 처리량을 측정합니다.
+클리닉 행은 겹치지 않으므로 공유 자원은 스케줄 버전 행(DataVersion)뿐이며,
+버전 증가를 뺀 경우와 비교해 전역 버전 행 잠금이 처리량에 주는 영향을 확인합니다.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import logging  # noqa: E402
+from datetime import datetime  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from core.models import Clinic, ClinicAttendance, Subject, User  # noqa: E402
+from core.utils import ClinicReservationOptimizer, DatabaseOptimizer  # noqa: E402
+from api.views import ClinicViewSet  # noqa: E402
+
+logger = logging.getLogger("api.auth")
+
+
+class LockTimer:
+    """잠금 시작 시점부터 커밋 완료까지의 시간과 잠금 중 실행된 쿼리 수 측정"""
+
+    def __init__(self):
+        self.lock_started = None
+        self.statements_under_lock = 0
+
+    def mark_lock(self):
+        if self.lock_started is None:
+            self.lock_started = time.perf_counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # 현재 파이프라인: 좌석 선점 UPDATE가 클리닉 행을 잠그는 첫 문장
+        if sql.lstrip().upper().startswith('UPDATE "CORE_CLINIC"'):
+            self.mark_lock()
+        if self.lock_started is not None:
+            self.statements_under_lock += 1
+        return execute(sql, params, many, context)
+
+
+def legacy_reserve(clinic_id, user, timer):
+    """기존 reserve_clinic 트랜잭션 구조 재현 (잠금 안에서 모든 처리)"""
+    with transaction.atomic():
+        timer.mark_lock()
+        clinic = DatabaseOptimizer.get_clinic_with_lock(clinic_id)
+
+        if clinic.clinic_students.filter(id=user.id).exists():
+            return False
+
+        today = datetime.now().date()
+        expected_clinic_date = clinic.get_expected_clinic_date(today)
+
+        existing_inactive_attendances = ClinicAttendance.objects.filter(
+            clinic=clinic,
+            student=user,
+            expected_clinic_date=expected_clinic_date,
+            is_active=False,
+        )
+        if existing_inactive_attendances.exists():
+            deleted_inactive_count = existing_inactive_attendances.count()
+            existing_inactive_attendances.delete()
+            logger.info(f"비활성화 출석 데이터 삭제: count={deleted_inactive_count}")
+
+        if clinic.is_full():
+            return False
+
+        clinic.clinic_students.add(user)
+        ClinicAttendance.objects.create(
+            is_active=True,
+            clinic=clinic,
+            student=user,
+            attendance_type="none",
+            reservation_date=today,
+            expected_clinic_date=expected_clinic_date,
+        )
+        logger.info(f"학생용 ClinicAttendance 생성 완료: user_id={user.id}")
+
+        if user.non_pass:
+            user.non_pass = False
+            user.save(update_fields=["non_pass"])
+
+        logger.info(f"클리닉 예약 성공: user_id={user.id}, clinic_id={clinic.id}")
+        _ = (clinic.clinic_subject.subject, clinic.clinic_teacher.name)
+    return True
+
+
+def current_reserve(clinic_id, user, timer):
+    """현재 reserve_clinic 트랜잭션 구조 (좌석 선점만 잠금, 나머지는 커밋 이후)"""
+    view = ClinicViewSet()
+    clinic = Clinic.objects.select_related("clinic_teacher", "clinic_subject").get(
+        id=clinic_id
+    )
+    today = datetime.now().date()
+    expected_clinic_date = clinic.get_expected_clinic_date(today)
+
+    with transaction.atomic():
+        seat_result = view._claim_reservation(
+            clinic, user, today, expected_clinic_date
+        )
+        if seat_result != DatabaseOptimizer.SEAT_CLAIMED:
+            transaction.set_rollback(True)
+            return False
+        transaction.on_commit(lambda: view._after_reservation_commit(clinic, user))
+    return True
+
+
+def run(pipeline, clinic, students):
+    """파이프라인별로 학생 전원 예약 후 잠금 유지 시간(ms) 목록 반환"""
+    durations, statement_counts = [], []
+
+    for student in students:
+        timer = LockTimer()
+        with connection.execute_wrapper(timer):
+            reserved = pipeline(clinic.id, student, timer)
+            committed = time.perf_counter()
+
+        if reserved and timer.lock_started is not None:
+            durations.append((committed - timer.lock_started) * 1000)
+            statement_counts.append(timer.statements_under_lock)
+
+    # 다음 파이프라인을 위해 예약 초기화
+    clinic.clinic_students.clear()
+    ClinicAttendance.objects.filter(clinic=clinic).delete()
+    User.objects.filter(id__in=[s.id for s in students]).update(non_pass=True)
+    return durations, statement_counts
+
+
+def summarize(name, durations, statement_counts):
+    if not durations:
+        print(f"{name}: 측정된 예약 없음")
+        return
+
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{name:<8} n={len(durations):<5} "
+        f"평균 {statistics.mean(durations):7.3f}ms  "
+        f"중앙값 {statistics.median(durations):7.3f}ms  "
+        f"p95 {p95:7.3f}ms  "
+        f"잠금 중 쿼리 {statistics.mean(statement_counts):.1f}개"
+    )
+
+
+def run_concurrent(clinics, students, bump_version=True):
+    """
+    클리닉별 스레드로 동시에 예약 후 (초당 예약 수, 예약 1건 평균 ms) 반환
+    bump_version=False면 스케줄 버전 증가/변경 기록을 생략한 기준선
+    """
+    per_clinic = len(students) // len(clinics)
+    barrier = threading.Barrier(len(clinics))
+    latencies = []
+
+    def worker(clinic, assigned):
+        barrier.wait()
+        try:
+            for student in assigned:
+                started = time.perf_counter()
+                if current_reserve(clinic.id, student, LockTimer()):
+                    latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+
+    patcher = (
+        nullcontext()
+        if bump_version
+        else mock.patch.object(
+            ClinicReservationOptimizer, "invalidate_schedule_cache", lambda *a, **k: None
+        )
+    )
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(clinic, students[i * per_clinic : (i + 1) * per_clinic]),
+        )
+        for i, clinic in enumerate(clinics)
+    ]
+
+    with patcher:
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    for clinic in clinics:
+        clinic.clinic_students.clear()
+    ClinicAttendance.objects.filter(clinic__in=clinics).delete()
+    User.objects.filter(id__in=[s.id for s in students]).update(non_pass=True)
+    return len(latencies) / elapsed, statistics.mean(latencies) if latencies else 0
+
+
+def find_free_slots(count):
+    """(요일, 시간, 강의실)이 unique이므로 아직 사용되지 않은 선택지 조합을 count개 찾음"""
+    used = set(Clinic.objects.values_list("clinic_day", "clinic_time", "clinic_room"))
+    slots = [
+        (day, clinic_time, room)
+        for day, _ in Clinic.DAY_CHOICES
+        for clinic_time, _ in Clinic.TIME_CHOICES
+        for room, _ in Clinic.ROOM_CHOICES
+        if (day, clinic_time, room) not in used
+    ]
+    if len(slots) < count:
+        raise SystemExit("벤치마크용 클리닉을 만들 빈 요일/시간/강의실 조합이 부족합니다.")
+    return slots[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="클리닉 예약 잠금 유지 시간 벤치마크")
+    parser.add_argument("--iterations", type=int, default=100, help="예약 횟수")
+    parser.add_argument(
+        "--workers", type=int, default=4, help="동시 예약 스레드(클리닉) 수 (0이면 생략)"
+    )
+    args = parser.parse_args()
+
+    # 로그 출력이 측정을 방해하지 않도록 콘솔 로그 최소화
+    logging.disable(logging.WARNING)
+
+    tag = uuid.uuid4().hex[:8]
+    subject, _ = Subject.objects.get_or_create(subject="physics1")
+    teacher = User.objects.create_user(
+        username=f"bench_t_{tag}", password=tag, name="벤치마크강사", subject=subject
+    )
+    clinics = [
+        Clinic.objects.create(
+            clinic_teacher=teacher,
+            clinic_subject=subject,
+            clinic_day=clinic_day,
+            clinic_time=clinic_time,
+            clinic_room=clinic_room,
+            clinic_capacity=args.iterations,
+            is_active=True,
+        )
+        for clinic_day, clinic_time, clinic_room in find_free_slots(max(1, args.workers))
+    ]
+    students = [
+        User.objects.create_user(
+            username=f"bench_s_{tag}_{i}",
+            password=tag,
+            name=f"벤치마크학생{i}",
+            subject=subject,
+            is_student=True,
+            non_pass=True,
+        )
+        for i in range(args.iterations)
+    ]
+
+    print(f"DB: {connection.vendor}, 예약 {args.iterations}회")
+    if connection.vendor == "sqlite":
+        print("⚠️  SQLite는 행 잠금이 없어 참고용 수치입니다. PostgreSQL에서 실행하세요.")
+
+    try:
+        summarize("기존", *run(legacy_reserve, clinics[0], students))
+        summarize("현재", *run(current_reserve, clinics[0], students))
+
+        if args.workers > 0 and connection.vendor != "sqlite":
+            connection.close()  # 스레드가 각자 연결을 쓰도록 메인 연결 정리
+            for label, bump_version in [("버전 증가", True), ("버전 생략", False)]:
+                throughput, latency = run_concurrent(clinics, students, bump_version)
+                print(
+                    f"동시 {args.workers}개 클리닉 ({label}): "
+                    f"{throughput:7.1f}건/초  예약 1건 평균 {latency:7.3f}ms"
+                )
+    finally:
+        for clinic in clinics:
+            clinic.delete()
+        User.objects.filter(username__startswith=f"bench_s_{tag}").delete()
+        teacher.delete()
+
+
+if __name__ == "__main__":
+    main()
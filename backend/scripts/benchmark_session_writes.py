@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+세션 저장(django_session 쓰기) 횟수 벤치마크
+
+SESSION_SAVE_EVERY_REQUEST = True 상태에서 세션 로그인 사용자가 API를 N번 호출할 때
+세션 엔진별로 django_session에 실행되는 INSERT/UPDATE 수와 평균 응답 시간을 비교합니다.
+
+- 기존: django.contrib.sessions.backends.db
+- 현재: core.session_backend (변경이 없고 만료까지 여유가 있으면 저장 생략)
+
+실행 방법 (개발용 DB에서만 실행 - 벤치마크용 사용자를 만들고 마지막에 삭제):
+    cd backend
+    python scripts/benchmark_session_writes.py --requests 1000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import logging  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from core.models import Subject, User  # noqa: E402
+
+ENGINES = [
+    ("기존", "django.contrib.sessions.backends.db"),
+    ("현재", "core.session_backend"),
+]
+
+
+class SessionWriteCounter:
+    """django_session INSERT/UPDATE 문장 수 측정"""
+
+    def __init__(self):
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        statement = sql.lstrip().upper()
+        if '"DJANGO_SESSION"' in statement and statement.startswith(
+            ("UPDATE", "INSERT")
+        ):
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+def run(engine, user, url, requests):
+    """세션 엔진을 바꿔 같은 사용자로 requests번 호출 → (쓰기 수, 응답 시간 목록)"""
+    with override_settings(SESSION_ENGINE=engine):
+        client = Client()  # 새 핸들러가 바뀐 SESSION_ENGINE으로 미들웨어를 로드
+        client.force_login(user)
+
+        counter = SessionWriteCounter()
+        durations = []
+        with connection.execute_wrapper(counter):
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = client.get(url)
+                durations.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f"요청 실패: {response.status_code}")
+        client.logout()
+    return counter.writes, durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="세션 저장 횟수 벤치마크")
+    parser.add_argument("--requests", type=int, default=1000, help="요청 횟수")
+    args = parser.parse_args()
+
+    # 로그 출력이 측정을 방해하지 않도록 콘솔 로그 최소화
+    logging.disable(logging.WARNING)
+    settings.RATE_LIMIT["ENABLED"] = False
+    settings.ALLOWED_HOSTS.append("testserver")  # Client 기본 호스트
+
+    tag = uuid.uuid4().hex[:8]
+    subject, _ = Subject.objects.get_or_create(subject="physics1")
+    # superuser는 중복 로그인 체크를 건너뛰므로 세션 엔진 비용만 측정됨
+    user = User.objects.create(
+        username=f"bench_session_{tag}",
+        name="세션벤치마크",
+        subject=subject,
+        is_staff=True,
+        is_superuser=True,
+    )
+    url = reverse("subject-list")
+
+    print(f"DB: {connection.vendor}, 요청 {args.requests}회 (세션 로그인)")
+    try:
+        for label, engine in ENGINES:
+            writes, durations = run(engine, user, url, args.requests)
+            print(
+                f"{label:<4} {engine:<38} 세션 쓰기 {writes:5d}회  "
+                f"평균 {statistics.mean(durations):7.3f}ms  "
+                f"중앙값 {statistics.median(durations):7.3f}ms"
+            )
+    finally:
+        user.delete()
+
+
+if __name__ == "__main__":
+    main()
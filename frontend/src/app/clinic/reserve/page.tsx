@@ -83,12 +83,6 @@ const MandatoryText: React.FC<{ delay: number }> = ({ delay }) => {
 };
 
 // 타입 정의
-interface Student {
-  id: number;
-  name: string;
-  username: string;
-}
-
 interface ClinicSlot {
   clinic_id: number | null;
   teacher_name: string | null;
@@ -98,7 +92,7 @@ interface ClinicSlot {
   current_count: number;
   remaining_spots: number;
   is_full: boolean;
-  students: Student[];
+  reserved_by_me: boolean;
 }
 
 interface WeeklySchedule {
@@ -107,13 +101,70 @@ interface WeeklySchedule {
   };
 }
 
-interface ScheduleResponse {
-  schedule: WeeklySchedule;
+// 잔여석 목록 API 응답 (컬럼형 - rows의 각 행은 fields 순서)
+interface AvailabilityResponse {
+  version: number;
   days: string[];
   times: string[];
-  total_clinics: number;
+  fields: string[];
+  rows: (string | number | boolean | null)[][];
+}
+
+// 좌석 변경 스트림(SSE) 메시지의 클리닉별 좌석 정보
+interface SeatUpdate {
+  clinic_id: number;
+  reserved_count: number;
+  capacity: number;
+  is_active: boolean;
 }
 
+const EMPTY_SLOT: ClinicSlot = {
+  clinic_id: null,
+  teacher_name: null,
+  subject: null,
+  room: null,
+  capacity: 0,
+  current_count: 0,
+  remaining_spots: 0,
+  is_full: false,
+  reserved_by_me: false,
+};
+
+// 컬럼형 잔여석 목록을 요일/시간 그리드로 변환 (같은 칸은 id가 가장 작은 클리닉)
+const buildScheduleGrid = (data: AvailabilityResponse): WeeklySchedule => {
+  const grid: WeeklySchedule = {};
+  data.days.forEach((day) => {
+    grid[day] = {};
+    data.times.forEach((time) => {
+      grid[day][time] = EMPTY_SLOT;
+    });
+  });
+
+  data.rows.forEach((values) => {
+    const row: Record<string, any> = {};
+    data.fields.forEach((field, index) => {
+      row[field] = values[index];
+    });
+
+    const cell = grid[row.day]?.[row.time];
+    if (!cell || cell.clinic_id !== null) return;
+
+    grid[row.day][row.time] = {
+      clinic_id: row.clinic_id,
+      teacher_name: row.teacher_name,
+      subject: row.subject,
+      room: row.room,
+      capacity: row.capacity,
+      current_count: row.capacity - row.remaining_spots,
+      remaining_spots: row.remaining_spots,
+      is_full: row.remaining_spots <= 0,
+      reserved_by_me: row.reserved_by_me,
+    };
+  });
+
+  return grid;
+};
+
 const ClinicReservePage: React.FC = () => {
   // 상태 관리
   const [schedule, setSchedule] = useState<WeeklySchedule>({});
@@ -130,6 +181,7 @@ const ClinicReservePage: React.FC = () => {
   const [timeLeft, setTimeLeft] = useState<string>(''); // 타이머 상태
   const [essentialClinic, setEssentialClinic] = useState<boolean>(true); // 의무 클리닉 신청 상태 (초기값은 user 데이터 로드 후 업데이트)
   const [updatingEssential, setUpdatingEssential] = useState<boolean>(false); // 의무 클리닉 업데이트 로딩
+  const [waitingPosition, setWaitingPosition] = useState<number | null>(null); // 예약 오픈 대기열 순번
   
   // 모달 및 유틸리티
   const { isOpen, onOpen, onClose } = useDisclosure();
@@ -263,6 +315,81 @@ const ClinicReservePage: React.FC = () => {
     }
   }, [token, isLoading, user]);
 
+  // 좌석 변경 스트림 구독 - 서버에서 꺼져 있으면(503/501) 기존처럼 조회 시점 좌석만 표시
+  useEffect(() => {
+    if (isLoading || !token) return;
+
+    const controller = new AbortController();
+    const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api';
+
+    const applySeats = (seats: SeatUpdate[]) => {
+      const byClinic = new Map(seats.map((seat) => [seat.clinic_id, seat]));
+      setSchedule((prev) => {
+        const next: WeeklySchedule = {};
+        Object.entries(prev).forEach(([day, slots]) => {
+          next[day] = {};
+          Object.entries(slots).forEach(([time, slot]) => {
+            const seat = slot.clinic_id !== null ? byClinic.get(slot.clinic_id) : undefined;
+            if (!seat) {
+              next[day][time] = slot;
+              return;
+            }
+            const remaining = Math.max(seat.capacity - seat.reserved_count, 0);
+            next[day][time] = {
+              ...slot,
+              capacity: seat.capacity,
+              current_count: seat.reserved_count,
+              remaining_spots: remaining,
+              is_full: !seat.is_active || remaining === 0,
+            };
+          });
+        });
+        return next;
+      });
+    };
+
+    // EventSource는 Authorization 헤더를 보낼 수 없어 fetch 스트림으로 읽음
+    const subscribe = async () => {
+      try {
+        const response = await fetch(`${apiUrl}/clinics/stream/`, {
+          headers: { 'Authorization': `Token ${token}` },
+          signal: controller.signal,
+        });
+        if (!response.ok || !response.body) return;
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) return;
+          buffer += value;
+
+          let boundary = buffer.indexOf('\n\n');
+          while (boundary !== -1) {
+            const message = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf('\n\n');
+
+            const lines = message.split('\n');
+            const event = lines.find((line) => line.startsWith('event: '))?.slice(7);
+            const data = lines.find((line) => line.startsWith('data: '))?.slice(6);
+            if (event === 'session_expired') return;
+            if ((event === 'snapshot' || event === 'seats') && data) {
+              applySeats(JSON.parse(data));
+            }
+          }
+        }
+      } catch (error) {
+        if (!controller.signal.aborted) {
+          console.log('⚠️ [clinic/reserve] 좌석 스트림 연결 종료:', error);
+        }
+      }
+    };
+
+    subscribe();
+    return () => controller.abort();
+  }, [token, isLoading]);
+
   // 타이머 업데이트 (1초마다)
   useEffect(() => {
     const updateTimer = () => {
@@ -278,11 +405,34 @@ const ClinicReservePage: React.FC = () => {
     return () => clearInterval(interval);
   }, []);
 
+  // 예약 오픈 대기열 - 429(waiting_room) 응답이면 입장할 때까지 티켓 상태를 폴링한 뒤 다시 요청
+  const fetchWithWaitingRoom = async (url: string, init: RequestInit): Promise<Response> => {
+    const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api';
+    let response = await fetch(url, init);
+
+    while (response.status === 429) {
+      let ticket = await response.clone().json().catch(() => null);
+      if (ticket?.error !== 'waiting_room') break;
+
+      while (ticket?.status === 'waiting') {
+        setWaitingPosition(ticket.position);
+        await new Promise((resolve) => setTimeout(resolve, (ticket.retry_after || 3) * 1000));
+        const poll = await fetch(`${apiUrl}/clinics/waiting-room/`, { headers: init.headers });
+        ticket = poll.ok ? await poll.json() : null;
+      }
+      setWaitingPosition(null);
+      response = await fetch(url, init);
+    }
+
+    return response;
+  };
+
   // 주간 스케줄 로드
   const loadWeeklySchedule = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'}/clinics/weekly_schedule/`, {
+      // 학생용 잔여석 목록 (예약 명단 제외) - 전체 명단은 weekly_schedule
+      const response = await fetchWithWaitingRoom(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'}/clinics/availability/`, {
         headers: {
           'Authorization': `Token ${token}`,
           'Content-Type': 'application/json',
@@ -293,8 +443,8 @@ const ClinicReservePage: React.FC = () => {
         throw new Error('스케줄을 불러오는데 실패했습니다.');
       }
 
-      const data: ScheduleResponse = await response.json();
-      setSchedule(data.schedule);
+      const data: AvailabilityResponse = await response.json();
+      setSchedule(buildScheduleGrid(data));
       setDays(data.days);
       setTimes(data.times);
     } catch (error) {
@@ -360,9 +510,7 @@ const ClinicReservePage: React.FC = () => {
     }
 
     // 이미 예약되어 있는지 확인
-    const isAlreadyReserved = clinic.students.some(
-      student => student.id === user.id
-    );
+    const isAlreadyReserved = clinic.reserved_by_me;
 
     if (isAlreadyReserved) {
       toast({
@@ -388,7 +536,7 @@ const ClinicReservePage: React.FC = () => {
 
     try {
       setReserving(true);
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'}/clinics/reserve_clinic/`, {
+      const response = await fetchWithWaitingRoom(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'}/clinics/reserve_clinic/`, {
         method: 'POST',
         headers: {
           'Authorization': `Token ${token}`,
@@ -593,7 +741,7 @@ const ClinicReservePage: React.FC = () => {
     const clinic = schedule[day]?.[time];
     if (!clinic) return null;
 
-    const isReserved = user && clinic.students.some(student => student.id === user.id);
+    const isReserved = user && clinic.reserved_by_me;
     const hasClinic = clinic.clinic_id !== null;
     const isPastDay = !isDayReservable(day); // 이전 요일인지 확인
 
@@ -750,7 +898,11 @@ const ClinicReservePage: React.FC = () => {
         <Center>
           <VStack spacing={4}>
             <Spinner size="xl" />
-            <Text>스케줄을 불러오는 중...</Text>
+            <Text>
+              {waitingPosition !== null
+                ? `접속자가 많아 대기 중입니다 (대기 순번 ${waitingPosition}번)`
+                : '스케줄을 불러오는 중...'}
+            </Text>
           </VStack>
         </Center>
       </Container>
@@ -921,6 +1073,11 @@ const ClinicReservePage: React.FC = () => {
                 >
                   {selectedSlot.day === getCurrentDay() ? "당일 보충 예약 취소는 불가능합니다. 예약 하시겠습니까?" : `${dayNames[selectedSlot.day]} ${selectedSlot.time} 예약 하시겠습니까?`}
                 </Text>
+                {waitingPosition !== null && (
+                  <Text textAlign="center" fontSize="sm" color={secondaryTextColor}>
+                    접속자가 많아 대기 중입니다 (대기 순번 {waitingPosition}번). 순서가 되면 자동으로 예약됩니다.
+                  </Text>
+                )}
               </ModalBody>
               <ModalFooter px={{ base: 4, md: 6 }}>
                 <Button 